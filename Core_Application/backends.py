@@ -0,0 +1,277 @@
+"""
+Parser backends and the router that picks between them.
+
+Each backend turns posting text into the four job fields. The router orders
+the enabled backends by configured priority (or by observed latency in
+"fastest" mode), pushes unhealthy ones to the back, and falls through to the
+next backend for any posting the current one fails on.
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from database_context import DEFAULT_SETTINGS, db, http_client
+from parser import (MODEL_NAME, PROMPT_VERSION, REQUIRED_FIELDS, build_prompt, parse_with_gemini,
+                    parse_with_gemini_batch, tag_version)
+from parse_cache import parse_cache
+from extraction import reduce_text
+from heuristic_parser import extract_fields
+from rate_limit import ClientGovernor
+from telemetry import span
+from utils import LazyObject, extract_json, save_error
+
+
+class ParserBackend:
+    """Base class: parse one posting, or several at once when the backend can batch"""
+    kind = ""
+
+    def __init__(self, name: str, priority: int = 1):
+        self.name = name
+        self.priority = priority
+
+    def available(self) -> bool:
+        return True
+
+    @property
+    def model_id(self) -> str:
+        """Saved with each row this backend parses (parser_model)"""
+        return self.kind
+
+    def parse(self, text: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def parse_batch(self, texts: List[str]) -> List[Optional[Dict]]:
+        results, error = [], None
+        for text in texts:
+            try:
+                results.append(self.parse(text))
+            except Exception as e:
+                save_error(f"{self.name} parse failed: {e}")
+                results.append(None)
+                error = e
+        if error is not None and not any(results):
+            raise error         # nothing parsed: report an outage so the router can bench the backend
+        return results
+
+
+class GeminiBackend(ParserBackend):
+    """Google Gemini, with the parse cache, batching and the shared rate limiter"""
+    kind = "gemini"
+
+    def available(self) -> bool:
+        return bool(db.get_gemini_api_key())
+
+    @property
+    def model_id(self) -> str:
+        return f"gemini:{MODEL_NAME}"
+
+    def parse(self, text: str) -> Optional[Dict]:
+        return parse_with_gemini(text, db.get_gemini_api_key())
+
+    def parse_batch(self, texts: List[str]) -> List[Optional[Dict]]:
+        if len(texts) == 1:
+            return [self.parse(texts[0])]
+        results = parse_with_gemini_batch(texts, db.get_gemini_api_key())
+        if not any(results):
+            # count a batch where nothing came back as an outage, not as misses
+            raise RuntimeError(f"Gemini returned no results for {len(texts)} postings")
+        return results
+
+
+class HeuristicBackend(ParserBackend):
+    """Offline regex extractor; returns None when it cannot find enough fields"""
+    kind = "heuristic"
+
+    def parse(self, text: str) -> Optional[Dict]:
+        result = extract_fields(text)
+        return dict(result, posting_text=text) if result else None
+
+    def parse_batch(self, texts: List[str]) -> List[Optional[Dict]]:
+        return [self.parse(text) for text in texts]
+
+
+class OpenAICompatibleBackend(ParserBackend):
+    """Any /v1/chat/completions endpoint (llama.cpp, Ollama, vLLM, LM Studio, a stub server...)"""
+    kind = "openai"
+
+    def __init__(self, name: str, priority: int = 1, base_url: str = "http://localhost:8080/v1",
+                 model: str = "", api_key: str = "", timeout: float = 60,
+                 requests_per_minute: float = 600, max_concurrent: int = 4, json_mode: bool = True):
+        super().__init__(name, priority)
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.json_mode = json_mode
+        self.governor = ClientGovernor(requests_per_minute=requests_per_minute,
+                                       max_concurrent=max_concurrent, max_retries=2)
+
+    @property
+    def model_id(self) -> str:
+        return f"openai:{self.model}"
+
+    def _request(self, prompt: str) -> str:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0,
+        }
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        resp = http_client.session.post(self.url, json=payload, headers=headers, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"]
+
+    def parse(self, text: str) -> Optional[Dict]:
+        cache_key = parse_cache.make_key(text, f"{self.name}:{self.model}", PROMPT_VERSION)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, parse_source="cache", posting_text=text)
+
+        prompt = build_prompt(reduce_text(text, db.get_setting("prompt_token_budget")))
+        raw_output = self.governor.call(lambda: self._request(prompt))
+        parsed_data = json.loads(extract_json(raw_output))
+        for field in REQUIRED_FIELDS:
+            parsed_data.setdefault(field, "")
+        parsed_data["parse_source"] = self.name
+        parse_cache.put(cache_key, parsed_data, f"{self.name}:{self.model}", PROMPT_VERSION)
+        return dict(parsed_data, posting_text=text)
+
+
+BACKEND_TYPES = {
+    GeminiBackend.kind: GeminiBackend,
+    HeuristicBackend.kind: HeuristicBackend,
+    OpenAICompatibleBackend.kind: OpenAICompatibleBackend,
+}
+
+
+class BackendHealth:
+    """Moving averages of latency and error rate for one backend"""
+    ALPHA = 0.3                  # EWMA weight of the newest sample
+    COOLDOWN_AFTER = 3           # consecutive errors before a backend is benched
+    COOLDOWN_SECONDS = 60
+
+    def __init__(self):
+        self.latency: Optional[float] = None     # seconds per posting
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.misses = 0                          # postings the backend could not parse
+        self.consecutive_errors = 0
+        self.benched_until = 0.0
+
+    def record(self, seconds: float, ok: bool, misses: int = 0):
+        self.calls += 1
+        self.misses += misses
+        self.error_rate = (1 - self.ALPHA) * self.error_rate + self.ALPHA * (0.0 if ok else 1.0)
+        if ok:
+            self.consecutive_errors = 0
+            self.latency = seconds if self.latency is None else (1 - self.ALPHA) * self.latency + self.ALPHA * seconds
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+            if self.consecutive_errors >= self.COOLDOWN_AFTER:
+                self.benched_until = time.monotonic() + self.COOLDOWN_SECONDS
+
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.benched_until and self.error_rate < 0.5
+
+
+class BackendRouter:
+    """Orders backends per request and falls back until every posting is parsed or all were tried"""
+    def __init__(self, backends: List[ParserBackend], routing: str = "priority"):
+        self.backends = backends
+        self.routing = routing
+        self.health = {backend.name: BackendHealth() for backend in backends}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, configs: Optional[List[Dict]], routing: str = "priority") -> "BackendRouter":
+        backends = []
+        for config in configs or DEFAULT_SETTINGS["parser_backends"]:
+            config = dict(config)
+            kind = config.pop("type", "")
+            if not config.pop("enabled", True):
+                continue
+            if kind not in BACKEND_TYPES:
+                print(f"Unknown parser backend type: {kind}")
+                continue
+            config.setdefault("name", kind)
+            try:
+                backends.append(BACKEND_TYPES[kind](**config))
+            except TypeError as e:
+                print(f"Invalid settings for parser backend {config['name']}: {e}")
+        return cls(backends, routing)
+
+    def available(self) -> bool:
+        return any(backend.available() for backend in self.backends)
+
+    def ordered(self) -> List[ParserBackend]:
+        """Available backends, best first for this request"""
+        with self._lock:
+            def rank(backend):
+                health = self.health[backend.name]
+                latency = health.latency or 0.0          # untried backends get a chance
+                preference = (latency, backend.priority) if self.routing == "fastest" else (backend.priority, latency)
+                return (not health.healthy(),) + preference
+            return sorted((b for b in self.backends if b.available()), key=rank)
+
+    def _record(self, backend: ParserBackend, seconds: float, ok: bool, misses: int = 0):
+        with self._lock:
+            self.health[backend.name].record(seconds, ok, misses)
+
+    def parse_batch(self, texts: List[str]) -> List[Optional[Dict]]:
+        """Parse every text, trying the next backend for the ones that failed; None where all failed"""
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending = list(range(len(texts)))
+        for backend in self.ordered():
+            if not pending:
+                break
+            started = time.perf_counter()
+            try:
+                with span("parse", backend=backend.name, items=len(pending)):
+                    parsed = backend.parse_batch([texts[i] for i in pending])
+            except Exception as e:
+                save_error(f"Parser backend {backend.name} failed: {e}")
+                self._record(backend, time.perf_counter() - started, ok=False)
+                continue
+            missing = []
+            for index, parsed_data in zip(pending, parsed):
+                # a posting without a title or company cannot be saved, so it counts as a miss
+                if parsed_data and parsed_data.get("job_title") and parsed_data.get("company"):
+                    results[index] = tag_version(parsed_data, backend.model_id)
+                else:
+                    missing.append(index)
+            self._record(backend, (time.perf_counter() - started) / len(pending), ok=True, misses=len(missing))
+            pending = missing
+        return results
+
+    def parse(self, text: str) -> Optional[Dict]:
+        return self.parse_batch([text])[0]
+
+    def stats(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    "name": backend.name,
+                    "type": backend.kind,
+                    "priority": backend.priority,
+                    "available": backend.available(),
+                    "healthy": self.health[backend.name].healthy(),
+                    "latency_ms": (self.health[backend.name].latency or 0.0) * 1000,
+                    "error_rate": self.health[backend.name].error_rate,
+                    "calls": self.health[backend.name].calls,
+                    "errors": self.health[backend.name].errors,
+                    "misses": self.health[backend.name].misses,
+                }
+                for backend in self.backends
+            ]
+
+
+# Global router instance
+parser_router = LazyObject(
+    lambda: BackendRouter.from_settings(db.get_setting("parser_backends"), db.get_setting("parser_routing"))
+)
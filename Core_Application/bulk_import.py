@@ -0,0 +1,301 @@
+"""
+Headless bulk import: reads URLs / text file paths and runs them through an
+asyncio fetch -> parse -> save pipeline without the GUI.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from database_context import db, fetch_posting
+from backends import parser_router
+from parser import tag_version
+from utils import save_error
+
+_DONE = object()     # queue sentinel
+
+
+class ImportStats:
+    """Counters shared by the pipeline stages"""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0
+        self.skipped = 0
+        self.fetched = 0
+        self.parsed = 0
+        self.structured = 0      # parsed from JobPosting markup without Gemini
+        self.duplicates = 0      # near-duplicates of saved postings, linked instead of parsed
+        self.saved = 0
+        self.failed = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def progress_line(self) -> str:
+        done = self.saved + self.failed + self.duplicates
+        rate = done / self.elapsed() if self.elapsed() > 0 else 0.0
+        return (f"[{self.elapsed():7.1f}s] fetched {self.fetched}/{self.total}  parsed {self.parsed}  "
+                f"saved {self.saved}  failed {self.failed}  ({rate:.1f} items/s)")
+
+    def summary(self) -> str:
+        elapsed = self.elapsed()
+        processed = self.saved + self.failed + self.duplicates
+        return (
+            "=== Bulk Import Summary ===\n"
+            f"Inputs: {self.total} (+{self.skipped} already done in checkpoint)\n"
+            f"Fetched: {self.fetched}\n"
+            f"Parsed: {self.parsed} ({self.structured} from structured data)\n"
+            f"Saved: {self.saved}\n"
+            f"Duplicates linked: {self.duplicates}\n"
+            f"Failed: {self.failed}\n"
+            f"Elapsed: {elapsed:.1f}s\n"
+            f"Throughput: {processed / elapsed if elapsed > 0 else 0.0:.2f} items/s"
+        )
+
+
+class Checkpoint:
+    """Append-only record of finished inputs so an interrupted import can resume"""
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        self.done.add(json.loads(line)["input"])
+                    except (ValueError, KeyError):
+                        continue
+        self._file = open(path, 'a', encoding='utf-8') if path else None
+
+    def mark(self, items: List[str], status: str):
+        if not self._file:
+            return
+        for item in items:
+            self._file.write(json.dumps({"input": item, "status": status}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def read_inputs(source: Optional[str]) -> List[str]:
+    """Read one URL or text-file path per line from a file, or stdin when source is None/'-'"""
+    if source in (None, "-"):
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def load_input(item: str) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
+    """
+    Blocking fetch of one input: a URL is downloaded, a file path is read.
+    Returns (text, structured data, downloaded page) - structured data is set
+    when the page's JobPosting markup already holds every field.
+    """
+    if item.lower().startswith("http"):
+        content, report, structured = fetch_posting(item)
+        return content, structured, report.get("html")
+    if os.path.isfile(item):
+        with open(item, 'r', encoding='utf-8', errors='replace') as file:
+            return file.read(), None, None
+    return None, None, None
+
+
+def link_if_duplicate(item: str, content: str) -> bool:
+    """Link the input to an already saved near-duplicate instead of parsing it again"""
+    duplicate = db.find_duplicate(content)
+    if not duplicate:
+        return False
+    db.link_duplicate(duplicate["id"], item, duplicate["similarity"])
+    return True
+
+
+async def run_pipeline(inputs: Iterable[str], fetch_concurrency: int = 16,
+                       parse_concurrency: int = 4, batch_size: int = 8, commit_size: int = 100,
+                       checkpoint_path: Optional[str] = None, progress_interval: float = 2.0) -> ImportStats:
+    """Fetch, parse and save every input with bounded concurrency at each stage"""
+    stats = ImportStats()
+    checkpoint = Checkpoint(checkpoint_path)
+    todo = []
+    for item in inputs:
+        if item in checkpoint.done:
+            stats.skipped += 1
+        else:
+            todo.append(item)
+    stats.total = len(todo)
+
+    loop = asyncio.get_event_loop()
+    executor = ThreadPoolExecutor(max_workers=fetch_concurrency + parse_concurrency + 1)
+    fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=fetch_concurrency * 2)
+    parse_queue: asyncio.Queue = asyncio.Queue(maxsize=parse_concurrency * batch_size * 2)
+    save_queue: asyncio.Queue = asyncio.Queue(maxsize=commit_size * 2)
+
+    async def produce():
+        for item in todo:
+            await fetch_queue.put(item)
+        for _ in range(fetch_concurrency):
+            await fetch_queue.put(_DONE)
+
+    async def fetch_worker():
+        while True:
+            item = await fetch_queue.get()
+            if item is _DONE:
+                return
+            try:
+                content, structured, page = await loop.run_in_executor(executor, load_input, item)
+            except Exception as e:
+                save_error(f"Bulk import fetch failed for {item}: {e}")
+                content, structured, page = None, None, None
+            if content:
+                duplicate = await loop.run_in_executor(executor, link_if_duplicate, item, content)
+                if duplicate:
+                    stats.fetched += 1
+                    stats.duplicates += 1
+                    checkpoint.mark([item], "duplicate")
+                    continue
+            if structured:
+                stats.fetched += 1
+                stats.parsed += 1
+                stats.structured += 1
+                structured.setdefault("source", item)
+                structured.setdefault("raw_source", page)
+                await save_queue.put((item, tag_version(structured, structured["parse_source"])))
+            elif content:
+                stats.fetched += 1
+                await parse_queue.put((item, content, page))
+            else:
+                stats.failed += 1
+
+    async def parse_worker():
+        finished = False
+        while not finished:
+            first = await parse_queue.get()
+            if first is _DONE:
+                return
+            batch = [first]
+            while len(batch) < batch_size:
+                try:
+                    entry = parse_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if entry is _DONE:
+                    finished = True
+                    break
+                batch.append(entry)
+
+            items = [item for item, _, _ in batch]
+            contents = [content for _, content, _ in batch]
+            pages = [page for _, _, page in batch]
+            try:
+                results = await loop.run_in_executor(executor, parser_router.parse_batch, contents)
+            except Exception as e:
+                save_error(f"Bulk import parse failed for {len(items)} postings: {e}")
+                results = [None] * len(items)
+
+            for item, page, parsed_data in zip(items, pages, results):
+                if parsed_data:
+                    stats.parsed += 1
+                    parsed_data.setdefault("source", item)
+                    parsed_data.setdefault("raw_source", page)
+                    await save_queue.put((item, parsed_data))
+                else:
+                    stats.failed += 1
+
+    async def save_worker():
+        pending: List[Dict] = []
+        pending_items: List[str] = []
+
+        async def flush():
+            if not pending:
+                return
+            result = await loop.run_in_executor(executor, db.save_job_postings, list(pending))
+            stats.saved += result["inserted"]
+            stats.duplicates += result["linked"]
+            stats.failed += result["skipped"] + result["failed"]
+            for item, outcome in zip(pending_items, result["outcomes"]):
+                if outcome != "failed":
+                    checkpoint.mark([item], "saved" if outcome == "inserted" else
+                                    "duplicate" if outcome == "linked" else outcome)
+            pending.clear()
+            pending_items.clear()
+
+        while True:
+            entry = await save_queue.get()
+            if entry is _DONE:
+                await flush()
+                return
+            item, parsed_data = entry
+            pending.append(parsed_data)
+            pending_items.append(item)
+            if len(pending) >= commit_size:
+                await flush()
+
+    async def report():
+        while True:
+            await asyncio.sleep(progress_interval)
+            print(stats.progress_line(), flush=True)
+
+    reporter = asyncio.ensure_future(report())
+    saver = asyncio.ensure_future(save_worker())
+    try:
+        fetchers = [asyncio.ensure_future(fetch_worker()) for _ in range(fetch_concurrency)]
+        parsers = [asyncio.ensure_future(parse_worker()) for _ in range(parse_concurrency)]
+        await produce()
+        await asyncio.gather(*fetchers)
+        for _ in range(parse_concurrency):
+            await parse_queue.put(_DONE)
+        await asyncio.gather(*parsers)
+        await save_queue.put(_DONE)
+        await saver
+    finally:
+        reporter.cancel()
+        executor.shutdown(wait=False)
+        checkpoint.close()
+
+    print(stats.progress_line(), flush=True)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Bulk import job postings into Parsio without the GUI.")
+    arg_parser.add_argument("source", nargs="?", default="-",
+                            help="file with one URL or text-file path per line ('-' or omitted for stdin)")
+    arg_parser.add_argument("--checkpoint", default=None,
+                            help="checkpoint file; finished inputs are recorded here and skipped on the next run")
+    arg_parser.add_argument("--fetch-concurrency", type=int, default=16)
+    arg_parser.add_argument("--parse-concurrency", type=int, default=4)
+    arg_parser.add_argument("--batch-size", type=int, default=8, help="postings per parser request")
+    arg_parser.add_argument("--commit-size", type=int, default=100, help="rows per database insert")
+    args = arg_parser.parse_args(argv)
+
+    if not parser_router.available():
+        print("Error: No parser backend available. Set your Gemini API key or enable the local parser in the settings.")
+        return 1
+
+    inputs = read_inputs(args.source)
+    if not inputs:
+        print("No inputs to import.")
+        return 0
+
+    stats = asyncio.run(run_pipeline(
+        inputs,
+        fetch_concurrency=max(1, args.fetch_concurrency),
+        parse_concurrency=max(1, args.parse_concurrency),
+        batch_size=max(1, args.batch_size),
+        commit_size=max(1, args.commit_size),
+        checkpoint_path=args.checkpoint,
+    ))
+    print(stats.summary())
+    return 0 if stats.failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Clipboard watch mode: every copy is debounced, checked by a cheap local
+classifier and, if it looks like a job posting (or links to one), queued for
+fetch/parse without clicking Paste. A bounded backlog keeps the number of jobs
+in flight capped, so copying dozens of links does not flood the worker pool.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict, deque
+from typing import Callable, List, Tuple
+from urllib.parse import urlparse
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+from heuristic_parser import SALARY_PATTERN, TITLE_WORDS
+
+URL_PATTERN = re.compile(r"^https?://\S+$", re.IGNORECASE)
+JOB_URL_HINTS = re.compile(
+    r"job|career|posting|position|vacanc|opening|recruit|hiring|greenhouse\.io|lever\.co|workday|ashbyhq|"
+    r"smartrecruiters|bamboohr|workable|indeed\.|glassdoor\.|wellfound|ziprecruiter|monster\.",
+    re.IGNORECASE,
+)
+JOB_TEXT_HINTS = re.compile(
+    r"\b(responsibilities|requirements|qualifications|experience|job description|about the role|"
+    r"about you|what you.ll do|we.re looking for|we are looking for|benefits|apply|full[- ]time|"
+    r"part[- ]time|contract|remote|hybrid|salary|compensation)\b",
+    re.IGNORECASE,
+)
+CODE_PATTERN = re.compile(r"[{};<>]|^\s*(def|class|import|function|const|var)\b", re.MULTILINE)
+
+MIN_TEXT_CHARS = 200             # shorter plain text is not a full posting
+MAX_TEXT_CHARS = 200_000         # bigger copies are documents, not postings
+SCAN_CHARS = 20_000              # only this much of a long copy is classified
+MIN_TEXT_HINTS = 3
+
+
+def classify(text: str) -> Tuple[List[str], str]:
+    """
+    Split a clipboard copy into items worth queueing: job-looking URLs (one per
+    line) or a single job posting text. Returns (items, reason), where reason
+    explains why nothing was accepted.
+    """
+    text = (text or "").strip()
+    if not text:
+        return [], "empty"
+    if len(text) > MAX_TEXT_CHARS:
+        return [], "too large"
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if all(URL_PATTERN.match(line) for line in lines):
+        urls = [line for line in lines if JOB_URL_HINTS.search(urlparse(line).netloc + urlparse(line).path)]
+        return urls, "" if urls else "not a job link"
+
+    if len(text) < MIN_TEXT_CHARS:
+        return [], "too short"
+    sample = text[:SCAN_CHARS]
+    if len(CODE_PATTERN.findall(sample)) > len(sample) / 40:
+        return [], "looks like code"
+    hints = {match.lower() for match in JOB_TEXT_HINTS.findall(sample)}
+    score = len(hints) + (1 if TITLE_WORDS.search(sample) else 0) + (1 if SALARY_PATTERN.search(sample) else 0)
+    if score < MIN_TEXT_HINTS:
+        return [], "not a job posting"
+    return [text], ""
+
+
+class ClipboardWatcher(QObject):
+    """Feeds classified clipboard copies to submit(), keeping at most max_in_flight jobs running"""
+    queued = pyqtSignal(str, int)        # item held back, backlog size
+    rejected = pyqtSignal(str, str)      # preview, reason
+    dropped = pyqtSignal(str)            # item dropped because the backlog is full
+
+    DEBOUNCE_MS = 300                    # copies closer together than this count once
+    MAX_SEEN = 1000                      # remembered copies for repeat detection
+
+    def __init__(self, submit: Callable[[str], None], in_flight: Callable[[], int],
+                 max_in_flight: int = 8, max_backlog: int = 200, parent=None):
+        super().__init__(parent)
+        self.submit = submit
+        self.in_flight = in_flight
+        self.set_limits(max_in_flight, max_backlog)
+        self.backlog = deque()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._active = False
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.timeout.connect(self._read_clipboard)
+
+    def set_limits(self, max_in_flight: int, max_backlog: int):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_backlog = max_backlog
+
+    def is_active(self) -> bool:
+        return self._active
+
+    def start(self):
+        if self._active:
+            return
+        self._active = True
+        # whatever is on the clipboard already was not copied in watch mode
+        self._remember(QGuiApplication.clipboard().text().strip())
+        QGuiApplication.clipboard().dataChanged.connect(self._on_clipboard_changed)
+
+    def stop(self):
+        if not self._active:
+            return
+        self._active = False
+        self._debounce.stop()
+        QGuiApplication.clipboard().dataChanged.disconnect(self._on_clipboard_changed)
+
+    def _on_clipboard_changed(self):
+        self._debounce.start(self.DEBOUNCE_MS)
+
+    def _remember(self, item: str) -> bool:
+        """Record item; False if it was seen recently"""
+        digest = hashlib.sha1(item.encode("utf-8", "replace")).hexdigest()
+        if digest in self._seen:
+            self._seen.move_to_end(digest)
+            return False
+        self._seen[digest] = None
+        while len(self._seen) > self.MAX_SEEN:
+            self._seen.popitem(last=False)
+        return True
+
+    def _read_clipboard(self):
+        if not self._active:
+            return
+        text = QGuiApplication.clipboard().text().strip()
+        if not self._remember(text):
+            return                       # same copy again
+        items, reason = classify(text)
+        if not items:
+            if text:
+                self.rejected.emit(_preview(text), reason)
+            return
+        for item in items:
+            if item != text and not self._remember(item):
+                continue                 # a link from a list that was already captured
+            self.offer(item)
+
+    def offer(self, item: str):
+        """Submit now if there is room, otherwise hold it in the backlog"""
+        if not self.backlog and self.in_flight() < self.max_in_flight:
+            self.submit(item)
+            return
+        if len(self.backlog) >= self.max_backlog:
+            self.dropped.emit(_preview(item))
+            return
+        self.backlog.append(item)
+        self.queued.emit(_preview(item), len(self.backlog))
+
+    def drain(self, *_):
+        """Move backlog items to submit() while below max_in_flight (connected to job completion)"""
+        while self.backlog and self.in_flight() < self.max_in_flight:
+            self.submit(self.backlog.popleft())
+
+
+def _preview(text: str, length: int = 60) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= length else text[:length - 3] + "..."
@@ -1,53 +1,486 @@
 import os
+import re
 import sqlite3
-import requests
-from bs4 import BeautifulSoup
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import json
 
+from http_client import HttpClient
+from extraction import extract_posting_text, PostingRegionWatch
+from structured_data import extract_structured_posting
+import dedupe
+import source_store
+from normalize import normalize_fields, normalize_country, normalize_region, normalize_period, normalize_currency
+from utils import LazyObject, data_directory
+from telemetry import span
+
+
+# defaults written to parsio_settings.json on first launch
+DEFAULT_SETTINGS = {
+    "table_name": "job_postings",
+    "gemini_api_key": "",
+    "max_workers": 4,
+    "parse_cache_ttl_hours": 720,
+    "parse_cache_max_entries": 5000,
+    "http_cache_max_mb": 100,
+    "http_pool_size": 16,
+    "http_max_page_kb": 2048,
+    "http_fetch_timeout_seconds": 20,
+    "prompt_token_budget": 3000,
+    "duplicate_min_similarity": 0.8,
+    "gemini_requests_per_minute": 15,
+    "gemini_tokens_per_minute": 1000000,
+    "gemini_max_concurrent": 4,
+    "gemini_max_retries": 4,
+    "gemini_breaker_threshold": 5,
+    "gemini_breaker_reset_seconds": 30,
+    "autocommit_max_pending": 25,
+    "autocommit_interval_seconds": 120,
+    "clipboard_max_in_flight": 8,
+    "clipboard_max_backlog": 200,
+    "reparse_batch_size": 20,
+    "reparse_pause_seconds": 1.0,
+    "ingest_port": 8765,
+    "ingest_max_queue": 500,
+    "ingest_commit_size": 50,
+    "ingest_token": "",
+    "ingest_allowed_origins": [],
+    "parser_routing": "priority",
+    "parser_backends": [
+        {"name": "gemini", "type": "gemini", "priority": 1},
+        {"name": "local", "type": "heuristic", "priority": 2}
+    ]
+}
+
+# columns shown by the postings table view, and the ones it may edit
+BROWSE_COLUMNS = ("id", "job_title", "company", "location", "salary", "created_at")
+EDITABLE_COLUMNS = ("job_title", "company", "location", "salary")
+REQUIRED_COLUMNS = ("job_title", "company")
+
+# parsed from the salary and location text on every write; see normalize.py
+NORMALIZED_COLUMNS = (("salary_min", "REAL"), ("salary_max", "REAL"), ("salary_currency", "TEXT"),
+                      ("salary_period", "TEXT"), ("city", "TEXT"), ("region", "TEXT"), ("country", "TEXT"),
+                      ("remote", "INTEGER"))
+
+# applied to every connection; journal_mode=WAL is persistent and set once in init_database
+CONNECTION_PRAGMAS = [
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-16000',         # ~16 MB page cache
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA foreign_keys=ON',
+]
+
+
+# updated_at stamp for inserts and edits alike: UTC, so it never runs backwards at a DST change
+UTC_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+
+# SCHEMA MIGRATIONS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+# each migration gets (connection, table name) and runs inside one transaction
+
+def _migration_base_table(conn: sqlite3.Connection, table: str):
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_title TEXT NOT NULL,
+            company TEXT NOT NULL,
+            location TEXT,
+            salary TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _migration_search_index(conn: sqlite3.Connection, table: str):
+    """Posting text column, B-tree indexes and an FTS5 index kept in sync by triggers"""
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN posting_text TEXT')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_company ON {table} (company COLLATE NOCASE)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table} (created_at)')
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+            job_title, company, location, posting_text,
+            content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {table}_fts (rowid, job_title, company, location, posting_text)
+            VALUES (new.id, new.job_title, new.company, new.location, new.posting_text);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, job_title, company, location, posting_text)
+            VALUES ('delete', old.id, old.job_title, old.company, old.location, old.posting_text);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, job_title, company, location, posting_text)
+            VALUES ('delete', old.id, old.job_title, old.company, old.location, old.posting_text);
+            INSERT INTO {table}_fts (rowid, job_title, company, location, posting_text)
+            VALUES (new.id, new.job_title, new.company, new.location, new.posting_text);
+        END
+    ''')
+    # index rows saved before this migration
+    conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+RECENT_KEEP = 50    # rows mirrored in the {table}_recent summary table
+
+
+def _summary_change_sql(table: str, row: str, delta: int) -> str:
+    """Trigger body that adds (delta=1) or removes (delta=-1) one row ('new'/'old') from the summaries"""
+    day = f"substr({row}.created_at, 1, 10)"
+    week = f"strftime('%Y-W%W', substr({row}.created_at, 1, 10))"
+    if delta > 0:
+        return f'''
+            UPDATE {table}_stats SET value = value + 1 WHERE key = 'total_jobs';
+            UPDATE {table}_stats SET value = value + 1 WHERE key = 'companies'
+                AND NOT EXISTS (SELECT 1 FROM {table}_company_counts WHERE company = {row}.company);
+            INSERT INTO {table}_company_counts (company, job_count) VALUES ({row}.company, 1)
+                ON CONFLICT(company) DO UPDATE SET job_count = job_count + 1;
+            INSERT INTO {table}_daily_counts (day, job_count) VALUES ({day}, 1)
+                ON CONFLICT(day) DO UPDATE SET job_count = job_count + 1;
+            INSERT INTO {table}_weekly_counts (week, job_count) VALUES ({week}, 1)
+                ON CONFLICT(week) DO UPDATE SET job_count = job_count + 1;
+            INSERT OR REPLACE INTO {table}_recent (id, created_at) VALUES ({row}.id, {row}.created_at);
+            DELETE FROM {table}_recent WHERE id IN (
+                SELECT id FROM {table}_recent ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET {RECENT_KEEP}
+            );
+        '''
+    return f'''
+        UPDATE {table}_stats SET value = value - 1 WHERE key = 'total_jobs';
+        UPDATE {table}_stats SET value = value - 1 WHERE key = 'companies'
+            AND (SELECT job_count FROM {table}_company_counts WHERE company = {row}.company) = 1;
+        UPDATE {table}_company_counts SET job_count = job_count - 1 WHERE company = {row}.company;
+        DELETE FROM {table}_company_counts WHERE company = {row}.company AND job_count <= 0;
+        UPDATE {table}_daily_counts SET job_count = job_count - 1 WHERE day = {day};
+        DELETE FROM {table}_daily_counts WHERE day = {day} AND job_count <= 0;
+        UPDATE {table}_weekly_counts SET job_count = job_count - 1 WHERE week = {week};
+        DELETE FROM {table}_weekly_counts WHERE week = {week} AND job_count <= 0;
+        DELETE FROM {table}_recent WHERE id = {row}.id;
+    '''
+
+
+def _summary_refill_recent_sql(table: str) -> str:
+    """Top the recent list back up from the created_at index after a delete"""
+    return f'''
+        INSERT OR IGNORE INTO {table}_recent (id, created_at)
+            SELECT id, created_at FROM {table}
+            WHERE id NOT IN (SELECT id FROM {table}_recent)
+            ORDER BY created_at DESC, id DESC
+            LIMIT ({RECENT_KEEP} - (SELECT COUNT(*) FROM {table}_recent));
+    '''
+
+
+def _rebuild_summaries(conn: sqlite3.Connection, table: str):
+    """Recompute every summary table from scratch with full scans"""
+    for suffix in ("stats", "company_counts", "daily_counts", "weekly_counts", "recent"):
+        conn.execute(f'DELETE FROM {table}_{suffix}')
+    conn.execute(f'''
+        INSERT INTO {table}_stats (key, value)
+        SELECT 'total_jobs', COUNT(*) FROM {table}
+        UNION ALL SELECT 'companies', COUNT(DISTINCT company) FROM {table}
+    ''')
+    conn.execute(f'''
+        INSERT INTO {table}_company_counts (company, job_count)
+        SELECT company, COUNT(*) FROM {table} GROUP BY company
+    ''')
+    conn.execute(f'''
+        INSERT INTO {table}_daily_counts (day, job_count)
+        SELECT substr(created_at, 1, 10), COUNT(*) FROM {table} GROUP BY 1
+    ''')
+    conn.execute(f'''
+        INSERT INTO {table}_weekly_counts (week, job_count)
+        SELECT strftime('%Y-W%W', substr(created_at, 1, 10)), COUNT(*) FROM {table} GROUP BY 1
+    ''')
+    conn.execute(f'''
+        INSERT INTO {table}_recent (id, created_at)
+        SELECT id, created_at FROM {table} ORDER BY created_at DESC, id DESC LIMIT {RECENT_KEEP}
+    ''')
+
+
+def _migration_summary_tables(conn: sqlite3.Connection, table: str):
+    """Totals, per-company, per-day/week counts and a recent list maintained by triggers"""
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {table}_stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_company_counts (
+            company TEXT PRIMARY KEY, job_count INTEGER NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_daily_counts (
+            day TEXT PRIMARY KEY, job_count INTEGER NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_weekly_counts (
+            week TEXT PRIMARY KEY, job_count INTEGER NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_recent (
+            id INTEGER PRIMARY KEY, created_at TEXT
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_recent_created_at ON {table}_recent (created_at)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_company_counts_count ON {table}_company_counts (job_count)')
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_insert AFTER INSERT ON {table} BEGIN
+            {_summary_change_sql(table, 'new', 1)}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_delete AFTER DELETE ON {table} BEGIN
+            {_summary_change_sql(table, 'old', -1)}
+            {_summary_refill_recent_sql(table)}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_summary_update AFTER UPDATE OF company, created_at ON {table} BEGIN
+            {_summary_change_sql(table, 'old', -1)}
+            {_summary_refill_recent_sql(table)}
+            {_summary_change_sql(table, 'new', 1)}
+        END
+    ''')
+    _rebuild_summaries(conn, table)
+
+
+def _migration_duplicate_index(conn: sqlite3.Connection, table: str):
+    """MinHash signatures with LSH band buckets, plus links from re-seen postings to the saved row"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_fingerprints (
+            posting_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL
+        )
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_lsh_buckets (
+            bucket INTEGER NOT NULL,
+            posting_id INTEGER NOT NULL,
+            PRIMARY KEY (bucket, posting_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_lsh_buckets_posting ON {table}_lsh_buckets (posting_id)')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_duplicate_links (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            posting_id INTEGER NOT NULL,
+            source TEXT,
+            similarity REAL,
+            seen_at TEXT NOT NULL
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_duplicate_links_posting ON {table}_duplicate_links (posting_id)')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fingerprints_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM {table}_fingerprints WHERE posting_id = old.id;
+            DELETE FROM {table}_lsh_buckets WHERE posting_id = old.id;
+            DELETE FROM {table}_duplicate_links WHERE posting_id = old.id;
+        END
+    ''')
+
+    # fingerprint rows saved before this migration
+    rows = conn.execute(f'SELECT id, posting_text FROM {table} WHERE posting_text IS NOT NULL').fetchall()
+    for posting_id, posting_text in rows:
+        signature = dedupe.minhash(posting_text)
+        if signature is not None:
+            conn.execute(f'INSERT OR REPLACE INTO {table}_fingerprints VALUES (?, ?)',
+                         (posting_id, dedupe.pack(signature)))
+            conn.executemany(f'INSERT OR IGNORE INTO {table}_lsh_buckets VALUES (?, ?)',
+                             [(bucket, posting_id) for bucket in dedupe.band_buckets(signature)])
+
+
+def _migration_change_tracking(conn: sqlite3.Connection, table: str):
+    """updated_at column (set on insert and on edits) and per-export watermarks"""
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN updated_at TEXT')
+    conn.execute(f'UPDATE {table} SET updated_at = created_at')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_updated_at ON {table} (updated_at)')
+    # re-index FTS only when indexed columns change, not when updated_at is stamped
+    conn.execute(f'DROP TRIGGER IF EXISTS {table}_fts_update')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_update
+        AFTER UPDATE OF job_title, company, location, posting_text ON {table} BEGIN
+            INSERT INTO {table}_fts ({table}_fts, rowid, job_title, company, location, posting_text)
+            VALUES ('delete', old.id, old.job_title, old.company, old.location, old.posting_text);
+            INSERT INTO {table}_fts (rowid, job_title, company, location, posting_text)
+            VALUES (new.id, new.job_title, new.company, new.location, new.posting_text);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_touch_updated_at
+        AFTER UPDATE OF job_title, company, location, salary, posting_text ON {table}
+        WHEN new.updated_at IS old.updated_at BEGIN
+            UPDATE {table} SET updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+            WHERE id = new.id;
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_export_watermarks (
+            name TEXT PRIMARY KEY,
+            updated_at TEXT NOT NULL,
+            last_id INTEGER NOT NULL,
+            exported_at TEXT NOT NULL,
+            rows INTEGER NOT NULL
+        )
+    ''')
+
+
+def _migration_pending_journal(conn: sqlite3.Connection, table: str):
+    """Parsed postings waiting to be committed, kept on disk so a crash or close does not lose them"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_pending (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payload TEXT NOT NULL,
+            added_at TEXT NOT NULL
+        )
+    ''')
+
+
+def _migration_browse_indexes(conn: sqlite3.Connection, table: str):
+    """Indexes so the postings table view can page through any sort order without scanning"""
+    for column in ("job_title", "location", "salary"):
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column} COLLATE NOCASE)')
+
+
+def _migration_raw_sources(conn: sqlite3.Connection, table: str):
+    """Compressed page source per posting, and which prompt version / parser model produced each row"""
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN prompt_version TEXT')
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN parser_model TEXT')
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table}_sources (
+            posting_id INTEGER PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            codec TEXT NOT NULL,
+            raw_bytes INTEGER NOT NULL,
+            data BLOB NOT NULL
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_sources_hash ON {table}_sources (content_hash)')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_sources_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM {table}_sources WHERE posting_id = old.id;
+        END
+    ''')
+
+
+def _migration_normalized_fields(conn: sqlite3.Connection, table: str):
+    """Numeric salary range and structured location columns with indexes for range filters, backfilled"""
+    for column, kind in NORMALIZED_COLUMNS:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {kind}')
+    # "pays at least X a year" is an equality on period then a range on salary_max
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_salary_range ON {table} (salary_period, salary_max)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_remote_salary ON {table} (remote, salary_period, salary_max)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_place ON {table} (country, region, city COLLATE NOCASE)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_city ON {table} (city COLLATE NOCASE)')
+    _backfill_normalized(conn, table)
+
+
+def _backfill_normalized(conn: sqlite3.Connection, table: str):
+    """Recompute every row's normalized columns from its salary and location text"""
+    # only the normalized columns change, so the FTS, summary and updated_at triggers stay quiet
+    rows = conn.execute(f'SELECT id, salary, location FROM {table}').fetchall()
+    assignments = ", ".join(f"{column} = :{column}" for column, _ in NORMALIZED_COLUMNS)
+    conn.executemany(f'UPDATE {table} SET {assignments} WHERE id = :id',
+                     [dict(normalize_fields(salary, location), id=posting_id)
+                      for posting_id, salary, location in rows])
+
+
+def _migration_reparse_failed(conn: sqlite3.Connection, table: str):
+    """Which prompt version / model last failed to re-parse a row, so it is not retried every run"""
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN reparse_failed TEXT')
+
+
+def _migration_utc_updated_at(conn: sqlite3.Connection, table: str):
+    """updated_at and export watermarks in UTC with millisecond precision, instead of local time"""
+    conn.execute(f'DROP TRIGGER IF EXISTS {table}_touch_updated_at')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_touch_updated_at
+        AFTER UPDATE OF job_title, company, location, salary, posting_text ON {table}
+        WHEN new.updated_at IS old.updated_at BEGIN
+            UPDATE {table} SET updated_at = {UTC_NOW_SQL} WHERE id = new.id;
+        END
+    ''')
+    # only updated_at changes, so the FTS, summary and touch triggers stay quiet
+    conn.execute(f"UPDATE {table} SET updated_at = strftime('%Y-%m-%dT%H:%M:%f', updated_at, 'utc')")
+    conn.execute(f"UPDATE {table}_export_watermarks SET updated_at = strftime('%Y-%m-%dT%H:%M:%f', updated_at, 'utc')")
+
+
+# append only - the position in this list is the schema version
+SCHEMA_MIGRATIONS = [
+    _migration_base_table,          # 1
+    _migration_search_index,        # 2
+    _migration_summary_tables,      # 3
+    _migration_duplicate_index,     # 4
+    _migration_change_tracking,     # 5
+    _migration_pending_journal,     # 6
+    _migration_browse_indexes,      # 7
+    _migration_raw_sources,         # 8
+    _migration_normalized_fields,   # 9
+    _backfill_normalized,           # 10: cents in grouped amounts, country-specific "$", "Remote in Canada"
+    _migration_reparse_failed,      # 11
+    _migration_utc_updated_at,      # 12
+]
+
 
 class database_context:
     """handles database interactions"""
     def __init__(self):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        
-        self.DB_FILE = os.path.join(project_root, "Data", "job_postings.db")            # local database file
-        self.TABLE_NAME = "job_postings"                                                # user defined table / profile
-        self.HELPER_FILE = os.path.join(project_root, "Data", "parsio_settings.json")   # parsio_settings.json
-        self.ERROR_FILE = os.path.join(project_root, "Data", "error.txt")               # error file
-        self.data_dir = os.path.join(project_root, "Data")                              # project data root
+        data_dir = data_directory()
+
+        self.DB_FILE = os.path.join(data_dir, "job_postings.db")            # local database file
+        self.TABLE_NAME = "job_postings"                                    # user defined table / profile
+        self.HELPER_FILE = os.path.join(data_dir, "parsio_settings.json")   # parsio_settings.json
+        self.ERROR_FILE = os.path.join(data_dir, "error.txt")               # error file
+        self.data_dir = data_dir                                            # project data root
 
 
         # read default table name and API key - create helper if first launch
+        self.settings = dict(DEFAULT_SETTINGS)
         try: 
             os.makedirs(os.path.dirname(self.HELPER_FILE), exist_ok=True)
             if os.path.exists(self.HELPER_FILE):
                 with open(self.HELPER_FILE, 'r') as file:
-                    settings = json.load(file)
-                    self.TABLE_NAME = settings.get("table_name", "job_postings")
-                    self.GEMINI_API_KEY = settings.get("gemini_api_key", "")
+                    self.settings.update(json.load(file))
             else:
                 with open(self.HELPER_FILE, 'w') as file:
-                    settings = {
-                        "table_name": "job_postings",
-                        "gemini_api_key": ""
-                    }
-                    json.dump(settings, file, indent=4)
-                    self.TABLE_NAME = "job_postings"
-                    self.GEMINI_API_KEY = ""
+                    json.dump(self.settings, file, indent=4)
         except Exception as e:
             print(f"Settings file error: {e}")
-            self.TABLE_NAME = "job_postings"
-            self.GEMINI_API_KEY = ""
+
+        self.TABLE_NAME = self.settings.get("table_name", "job_postings")
+        self.GEMINI_API_KEY = self.settings.get("gemini_api_key", "")
+        self.MAX_WORKERS = self.settings.get("max_workers", 4)
+
+        # one connection per thread, schema set up once per process
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._schema_ready = False
+        self._build_sql()
+
+    def get_setting(self, key: str, default=None):
+        """Get a value from parsio_settings.json, falling back to the built-in default"""
+        return self.settings.get(key, DEFAULT_SETTINGS.get(key, default))
 
     def get_gemini_api_key(self) -> str:
         """Get the Gemini API key from settings"""
         return self.GEMINI_API_KEY
 
-    def set_gemini_api_key(self, api_key: str) -> bool:
-        """Set the Gemini API key in settings"""
+    def get_max_workers(self) -> int:
+        """Get the number of background fetch/parse workers from settings"""
+        try:
+            return max(1, int(self.MAX_WORKERS))
+        except (TypeError, ValueError):
+            return 4
+
+    def set_setting(self, key: str, value) -> bool:
+        """Set a value in parsio_settings.json"""
         try:
             if os.path.exists(self.HELPER_FILE):
                 with open(self.HELPER_FILE, 'r') as file:
@@ -55,135 +488,704 @@ class database_context:
             else:
                 settings = {"table_name": self.TABLE_NAME}
             
-            settings["gemini_api_key"] = api_key
+            settings[key] = value
             
             with open(self.HELPER_FILE, 'w') as file:
                 json.dump(settings, file, indent=4)
             
-            self.GEMINI_API_KEY = api_key
+            self.settings[key] = value
             return True
         except Exception as e:
-            print(f"Failed to save API key: {e}")
+            print(f"Failed to save setting {key}: {e}")
             return False
 
-    def init_database(self):
-        """Inits the database and table on App startup"""
-        try: 
-            os.makedirs(os.path.dirname(self.DB_FILE), exist_ok=True)
-            print(f"Database directory created at {self.DB_FILE}")
-        except Exception as e:
-            print(f"Database directory creation error: {e}")
+    def set_gemini_api_key(self, api_key: str) -> bool:
+        """Set the Gemini API key in settings"""
+        if not self.set_setting("gemini_api_key", api_key):
             return False
+        self.GEMINI_API_KEY = api_key
+        return True
 
-        # connect to user defined table
-        try:
-            conn = sqlite3.connect(self.DB_FILE)
-            cursor = conn.cursor()
-            
-            # TODO: user defined table names
-            cursor.execute(f'''
-                CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    job_title TEXT NOT NULL,
-                    company TEXT NOT NULL,
-                    location TEXT,
-                    salary TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
-            print(f"Database ready at {self.DB_FILE}")
-            return True
-            
-        except Exception as e:
-            print(f"Database initialization error: {e}")
-            return False
+    # CONNECTIONS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's long-lived connection, opening it (and migrating the schema once) on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self.init_database():
+                raise sqlite3.OperationalError(f"Database unavailable at {self.DB_FILE}")
+            conn = self._open_connection()
+            self._local.conn = conn
+        return conn
 
-    def save_job_postings(self, job_list: List[Dict]) -> bool:
-        if not job_list:
-            return False
-        
-        try:
-            self.init_database()  # Ensure database exists
-            conn = sqlite3.connect(self.DB_FILE)
-            cursor = conn.cursor()
-            # DONE: 
-            insert_sql = f'''
-                INSERT INTO {self.TABLE_NAME} (job_title, company, location, salary, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            '''
-            
-            current_time = datetime.now().isoformat()
-            data_to_insert = []
-            
-            # Validate and prepare data
-            for job in job_list:
-                job_title = job.get('job_title', '').strip()
-                company = job.get('company', '').strip()
-                location = job.get('location', '').strip()
-                salary = job.get('salary', '').strip()
-                
-                if job_title and company:  # Only insert if required fields exist
-                    data_to_insert.append((
-                        job_title, company, location, salary, current_time
-                    ))
-            
-            if data_to_insert:
-                cursor.executemany(insert_sql, data_to_insert)
+    @contextmanager
+    def transaction(self):
+        """Run a block in one transaction on this thread's connection"""
+        conn = self.connection()
+        with self._write_lock:
+            try:
+                yield conn
                 conn.commit()
-                print(f"Saved {len(data_to_insert)} job postings to database")
+            except Exception:
+                conn.rollback()
+                raise
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # cached_statements keeps the prepared statements for the SQL strings in self._sql
+        conn = sqlite3.connect(self.DB_FILE, timeout=30, cached_statements=256)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def init_database(self):
+        """Creates the database and applies pending schema migrations, once per process"""
+        if self._schema_ready:
+            return True
+
+        with self._init_lock:
+            if self._schema_ready:
                 return True
-            else:
-                print("No valid data to save")
+            try: 
+                os.makedirs(os.path.dirname(self.DB_FILE), exist_ok=True)
+            except Exception as e:
+                print(f"Database directory creation error: {e}")
                 return False
+
+            # connect to user defined table
+            try:
+                conn = self._open_connection()
+                try:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    self._migrate(conn)
+                finally:
+                    conn.close()
+                self._schema_ready = True
+                return True
                 
+            except Exception as e:
+                print(f"Database initialization error: {e}")
+                return False
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Apply the SCHEMA_MIGRATIONS this table has not seen yet"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        ''')
+        row = conn.execute(
+            'SELECT version FROM schema_version WHERE table_name = ?', (self.TABLE_NAME,)
+        ).fetchone()
+        current = row[0] if row else 0
+
+        for version, migration in enumerate(SCHEMA_MIGRATIONS, start=1):
+            if version <= current:
+                continue
+            with conn:
+                migration(conn, self.TABLE_NAME)
+                conn.execute(
+                    'INSERT OR REPLACE INTO schema_version (table_name, version) VALUES (?, ?)',
+                    (self.TABLE_NAME, version)
+                )
+
+    def _build_sql(self):
+        """SQL strings are built once so sqlite3 can reuse their prepared statements"""
+        table = self.TABLE_NAME
+        normalized = ", ".join(column for column, _ in NORMALIZED_COLUMNS)
+        normalized_params = ", ".join(f"?{9 + i}" for i in range(len(NORMALIZED_COLUMNS)))
+        self._sql = {
+            "insert_job": f'''
+                INSERT INTO {table} (job_title, company, location, salary, created_at, posting_text, updated_at,
+                                     prompt_version, parser_model, {normalized})
+                VALUES (?1, ?2, ?3, ?4, ?5, ?6, {UTC_NOW_SQL}, ?7, ?8, {normalized_params})
+            ''',
+            "insert_source": f'INSERT OR REPLACE INTO {table}_sources VALUES (?, ?, ?, ?, ?)',
+            "insert_fingerprint": f'INSERT OR REPLACE INTO {table}_fingerprints VALUES (?, ?)',
+            "insert_bucket": f'INSERT OR IGNORE INTO {table}_lsh_buckets VALUES (?, ?)',
+            "fingerprint_candidates": f'''
+                SELECT f.posting_id, f.signature FROM {table}_fingerprints f
+                WHERE f.posting_id IN (
+                    SELECT posting_id FROM {table}_lsh_buckets
+                    WHERE bucket IN ({", ".join("?" * dedupe.BAND_COUNT)})
+                )
+            ''',
+            "insert_duplicate_link": f'''
+                INSERT INTO {table}_duplicate_links (posting_id, source, similarity, seen_at)
+                VALUES (?, ?, ?, ?)
+            ''',
+            "insert_pending": f'INSERT INTO {table}_pending (payload, added_at) VALUES (?, ?)',
+            "select_pending": f'SELECT id, payload FROM {table}_pending ORDER BY id LIMIT ?',
+            "delete_pending": f'DELETE FROM {table}_pending WHERE id <= ?',
+            "pending_summary": f'SELECT COUNT(*), MIN(added_at) FROM {table}_pending',
+            "delete_fingerprint": f'DELETE FROM {table}_fingerprints WHERE posting_id = ?',
+            "delete_buckets": f'DELETE FROM {table}_lsh_buckets WHERE posting_id = ?',
+            "reparse_update": f'''
+                UPDATE {table} SET job_title = ?, company = ?, location = ?, salary = ?, posting_text = ?,
+                    prompt_version = ?, parser_model = ?, {", ".join(f"{column} = ?" for column, _ in NORMALIZED_COLUMNS)}
+                WHERE id = ?
+            ''',
+        }
+
+
+    def _prepare_rows(self, job_list: List[Dict], current_time: str) -> List[Optional[Tuple]]:
+        """
+        (row, MinHash signature, source, compressed page source) for each posting,
+        None for postings without the required fields
+        """
+        data_to_insert = []
+        for job in job_list:
+            job_title = job.get('job_title', '').strip()
+            company = job.get('company', '').strip()
+            location = job.get('location', '').strip()
+            salary = job.get('salary', '').strip()
+            posting_text = job.get('posting_text') or None
+            prompt_version = job.get('prompt_version')
+            parser_model = job.get('parser_model') or job.get('parse_source') or None
+
+            # the fetched page; pasted text is its own source and is already in posting_text
+            raw_source = job.get('raw_source') or None
+            compressed = None
+            if raw_source and raw_source != posting_text:
+                codec, blob = source_store.compress(raw_source)
+                compressed = (source_store.content_hash(raw_source), codec, len(raw_source.encode("utf-8")), blob)
+
+            if job_title and company:  # Only insert if required fields exist
+                normalized = normalize_fields(salary, location)
+                data_to_insert.append((
+                    (job_title, company, location, salary, current_time, posting_text,
+                     str(prompt_version) if prompt_version is not None else None, parser_model)
+                    + tuple(normalized[column] for column, _ in NORMALIZED_COLUMNS),
+                    dedupe.minhash(posting_text) if posting_text else None,
+                    job.get('source', ''),
+                    compressed,
+                ))
+            else:
+                data_to_insert.append(None)
+        return data_to_insert
+
+    def _insert_rows(self, conn: sqlite3.Connection, data_to_insert: List[Optional[Tuple]],
+                     current_time: str) -> List[str]:
+        """
+        Insert prepared rows inside the caller's transaction; near-duplicates become links.
+        Returns "inserted", "linked" or "skipped" (no title or company) for each row.
+        """
+        outcomes = []
+        for prepared in data_to_insert:
+            if prepared is None:
+                outcomes.append("skipped")
+                continue
+            row, signature, source, compressed = prepared
+            if signature is not None:
+                buckets = dedupe.band_buckets(signature)
+                match = self._match_signature(signature, buckets)
+                if match:
+                    conn.execute(self._sql["insert_duplicate_link"],
+                                 (match[0], source, match[1], current_time))
+                    outcomes.append("linked")
+                    continue
+            posting_id = conn.execute(self._sql["insert_job"], row).lastrowid
+            if compressed is not None:
+                conn.execute(self._sql["insert_source"], (posting_id,) + compressed)
+            if signature is not None:
+                conn.execute(self._sql["insert_fingerprint"], (posting_id, dedupe.pack(signature)))
+                conn.executemany(self._sql["insert_bucket"],
+                                 [(bucket, posting_id) for bucket in buckets])
+            outcomes.append("inserted")
+        return outcomes
+
+    @staticmethod
+    def _save_result(outcomes: List[str]) -> Dict:
+        result = {outcome: outcomes.count(outcome) for outcome in ("inserted", "linked", "skipped", "failed")}
+        result["outcomes"] = outcomes
+        return result
+
+    def save_job_postings(self, job_list: List[Dict]) -> Dict:
+        """
+        Insert parsed postings; near-duplicates of saved rows are linked to them instead.
+        Returns counts of inserted, linked, skipped (no title or company) and failed
+        postings, and under "outcomes" the outcome of each posting in order.
+        """
+        try:
+            current_time = datetime.now().isoformat()
+            data_to_insert = self._prepare_rows(job_list, current_time)
+            if not any(data_to_insert):
+                return self._save_result(["skipped"] * len(job_list))
+            with span("save", rows=len(data_to_insert)), self.transaction() as conn:
+                return self._save_result(self._insert_rows(conn, data_to_insert, current_time))
         except Exception as e:
             print(f"Database save error: {e}")
+            return self._save_result(["failed"] * len(job_list))
+
+    # PENDING JOURNAL %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def journal_pending(self, job: Dict) -> int:
+        """Append a parsed posting to the pending journal and return its journal id"""
+        payload = json.dumps(job, ensure_ascii=False, default=str)
+        with self.transaction() as conn:
+            return conn.execute(self._sql["insert_pending"], (payload, datetime.now().isoformat())).lastrowid
+
+    def pending_summary(self) -> Tuple[int, Optional[str]]:
+        """(number of journaled postings, added_at of the oldest one)"""
+        count, oldest = self.connection().execute(self._sql["pending_summary"]).fetchone()
+        return count, oldest
+
+    def get_pending(self, limit: int = -1) -> List[Dict]:
+        """Journaled postings, oldest first"""
+        rows = self.connection().execute(self._sql["select_pending"], (limit,)).fetchall()
+        return [json.loads(payload) for _, payload in rows]
+
+    def commit_pending(self, limit: int = -1) -> Dict:
+        """
+        Move journaled postings into the jobs table in one transaction (group
+        commit). Returns the save_job_postings() counts plus "taken", the
+        postings taken from the journal. The journal rows are deleted in the
+        same transaction, so a crash either keeps them pending or commits them, never both.
+        """
+        with self.transaction() as conn:
+            rows = conn.execute(self._sql["select_pending"], (limit,)).fetchall()
+            if not rows:
+                return dict(self._save_result([]), taken=0)
+            current_time = datetime.now().isoformat()
+            data_to_insert = self._prepare_rows([json.loads(payload) for _, payload in rows], current_time)
+            with span("save", rows=len(data_to_insert), journal=len(rows)):
+                outcomes = self._insert_rows(conn, data_to_insert, current_time)
+                conn.execute(self._sql["delete_pending"], (rows[-1][0],))
+        return dict(self._save_result(outcomes), taken=len(rows))
+
+    # DUPLICATES %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def _match_signature(self, signature: List[int], buckets: List[int]) -> Optional[Tuple[int, float]]:
+        """(posting id, similarity) of the most similar saved posting above the threshold, via LSH buckets"""
+        min_similarity = float(self.get_setting("duplicate_min_similarity"))
+        best = None
+        for posting_id, blob in self.connection().execute(self._sql["fingerprint_candidates"], buckets):
+            score = dedupe.similarity(signature, dedupe.unpack(blob))
+            if score >= min_similarity and (best is None or score > best[1]):
+                best = (posting_id, score)
+        return best
+
+    def find_duplicate(self, text: str) -> Optional[Dict]:
+        """Saved posting whose text is a near-duplicate of text, or None"""
+        signature = dedupe.minhash(text)
+        if signature is None:
+            return None
+        try:
+            match = self._match_signature(signature, dedupe.band_buckets(signature))
+            if not match:
+                return None
+            row = self.connection().execute(
+                f'SELECT job_title, company, location, salary FROM {self.TABLE_NAME} WHERE id = ?', (match[0],)
+            ).fetchone()
+            if row is None:
+                return None
+            job_title, company, location, salary = row
+            return {"id": match[0], "similarity": match[1], "job_title": job_title,
+                    "company": company, "location": location, "salary": salary}
+        except Exception as e:
+            print(f"Duplicate lookup error: {e}")
+            return None
+
+    def link_duplicate(self, posting_id: int, source: str = "", similarity: float = 1.0) -> bool:
+        """Record that a posting was seen again (reposted / mirrored) instead of saving it twice"""
+        try:
+            with self.transaction() as conn:
+                conn.execute(self._sql["insert_duplicate_link"],
+                             (posting_id, source, similarity, datetime.now().isoformat()))
+            return True
+        except Exception as e:
+            print(f"Duplicate link error: {e}")
             return False
-        finally:
-            if 'conn' in locals():
-                conn.close()
 
+    # SEARCH %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into a safe FTS5 query: every word must match, as a prefix"""
+        words = re.findall(r"\w+", query or "")
+        return " ".join(f'"{word}"*' for word in words)
 
+    @staticmethod
+    def _filter_clauses(filters: Dict, where: List[str], params: List):
+        """Append the WHERE clauses shared by search() and browse_page() for the jobs table aliased j"""
+        if filters.get("company"):
+            where.append('j.company = ? COLLATE NOCASE')
+            params.append(filters["company"])
+        if filters.get("location"):
+            where.append('j.location LIKE ?')
+            params.append(f"%{filters['location']}%")
+        if filters.get("created_after"):
+            where.append('j.created_at >= ?')
+            params.append(filters["created_after"])
+        if filters.get("created_before"):
+            where.append('j.created_at < ?')
+            params.append(filters["created_before"])
+        # normalized columns: an open-ended range "at least X" overlaps postings whose top is >= X
+        if filters.get("salary_at_least") is not None:
+            where.append('j.salary_max >= ?')
+            params.append(float(filters["salary_at_least"]))
+        if filters.get("salary_at_most") is not None:
+            where.append('j.salary_min <= ?')
+            params.append(float(filters["salary_at_most"]))
+        if filters.get("salary_period"):
+            where.append('j.salary_period = ?')
+            params.append(normalize_period(filters["salary_period"]) or filters["salary_period"])
+        if filters.get("salary_currency"):
+            where.append('j.salary_currency = ?')
+            params.append(normalize_currency(filters["salary_currency"]) or filters["salary_currency"])
+        place_where, place_params = database_context._place_clauses(filters)
+        where += place_where
+        params += place_params
+        # any of several places: [{"remote": True}, {"city": "Toronto"}]
+        if filters.get("places"):
+            alternatives = [database_context._place_clauses(place) for place in filters["places"]]
+            alternatives = [alternative for alternative in alternatives if alternative[0]]
+            if alternatives:
+                where.append("(" + " OR ".join("(" + " AND ".join(clauses) + ")" for clauses, _ in alternatives) + ")")
+                params += [param for _, place_params in alternatives for param in place_params]
+
+    @staticmethod
+    def _place_clauses(place: Dict) -> Tuple[List[str], List]:
+        """Clauses for the city / region / country / remote keys of a filter dict"""
+        where, params = [], []
+        if place.get("country"):
+            where.append('j.country = ?')
+            params.append(normalize_country(place["country"]) or place["country"])
+        if place.get("region"):
+            where.append('j.region = ?')
+            params.append(normalize_region(place["region"]))
+        if place.get("city"):
+            where.append('j.city = ? COLLATE NOCASE')
+            params.append(place["city"].strip())
+        if place.get("remote") is not None:
+            where.append('j.remote = ?')
+            params.append(1 if place["remote"] else 0)
+        return where, params
+
+    def search(self, query: str = "", filters: Optional[Dict] = None,
+               limit: int = 50, offset: int = 0) -> List[Dict]:
+        """
+        Full-text search over saved postings, best matches first.
+        filters: company (exact, case-insensitive), location (substring),
+        created_after / created_before (ISO date strings), and the normalized
+        column filters described in find_postings().
+        An empty query lists matching rows newest first.
+        """
+        filters = filters or {}
+        table = self.TABLE_NAME
+        where, params = [], []
+
+        match = self._fts_query(query)
+        if match:
+            sql = f'''
+                SELECT j.id, j.job_title, j.company, j.location, j.salary, j.created_at,
+                       bm25({table}_fts, 10.0, 5.0, 3.0, 1.0) AS rank,
+                       snippet({table}_fts, 3, '[', ']', '...', 12) AS snippet
+                FROM {table}_fts
+                JOIN {table} j ON j.id = {table}_fts.rowid
+            '''
+            where.append(f'{table}_fts MATCH ?')
+            params.append(match)
+            order = 'rank'
+        else:
+            sql = f'''
+                SELECT j.id, j.job_title, j.company, j.location, j.salary, j.created_at,
+                       NULL AS rank, NULL AS snippet
+                FROM {table} j
+            '''
+            order = 'j.created_at DESC'
+
+        self._filter_clauses(filters, where, params)
+
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {order} LIMIT ? OFFSET ?'
+        params += [int(limit), int(offset)]
+
+        try:
+            cursor = self.connection().execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Database search error: {e}")
+            return []
+
+    def find_postings(self, filters: Dict, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Postings matching filters on the normalized columns, best paid first
+        when a salary filter is given, newest first otherwise.
+        filters: salary_at_least / salary_at_most (numbers, compared with the
+        posting's range), salary_period (hour, day, week, month, year),
+        salary_currency (code or symbol), city, region, country (names or
+        codes), remote (bool), places (a list of {city, region, country,
+        remote} dicts, any of which may match) and the search() filters.
+        """
+        where, params = [], []
+        self._filter_clauses(filters, where, params)
+        salary_filter = any(filters.get(key) is not None for key in ("salary_at_least", "salary_at_most"))
+        order = 'j.salary_max DESC, j.id DESC' if salary_filter else 'j.created_at DESC'
+        columns = ("id", "job_title", "company", "location", "salary", "created_at") + tuple(
+            column for column, _ in NORMALIZED_COLUMNS)
+        sql = f'SELECT {", ".join("j." + c for c in columns)} FROM {self.TABLE_NAME} j'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {order} LIMIT ? OFFSET ?'
+        with span("query", filters=len(where)):
+            rows = self.connection().execute(sql, params + [int(limit), int(offset)]).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    # BROWSE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def _browse_where(self, query: str, filters: Optional[Dict]) -> Tuple[List[str], List]:
+        where, params = [], []
+        match = self._fts_query(query)
+        if match:
+            table = self.TABLE_NAME
+            where.append(f'j.id IN (SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ?)')
+            params.append(match)
+        self._filter_clauses(filters or {}, where, params)
+        return where, params
+
+    def browse_page(self, query: str = "", filters: Optional[Dict] = None, sort: str = "created_at",
+                    descending: bool = True, after: Optional[Tuple] = None, limit: int = 200) -> List[Tuple]:
+        """
+        One page of BROWSE_COLUMNS rows for the table view, filtered and sorted in SQL.
+        Keyset pagination: after is the (sort value, id) of the last row of the
+        previous page, so every page costs one index seek however deep the scroll.
+        Text columns sort case-insensitively; NULLs come first ascending, last descending.
+        """
+        if sort not in BROWSE_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        base_where, base_params = self._browse_where(query, filters)
+        column = f'j.{sort}'
+        key = column if sort in ("id", "created_at") else f'{column} COLLATE NOCASE'
+        op, direction = ('<', 'DESC') if descending else ('>', 'ASC')
+        select = f'SELECT {", ".join("j." + c for c in BROWSE_COLUMNS)} FROM {self.TABLE_NAME} j'
+
+        # rows come in segments: [NULL keys by id] then [keys by (key, id)], reversed when
+        # descending. Resuming inside the keys reads the rest of the tied key first; every
+        # segment is a plain range on one index, so each page is a seek, never a scan
+        null_segment = ([f'{column} IS NULL'], [], f'j.id {direction}')
+        value_segment = ([] if sort in REQUIRED_COLUMNS or sort == "id" else [f'{column} IS NOT NULL'], [],
+                         f'j.id {direction}' if sort == "id" else f'{key} {direction}, j.id {direction}')
+        if sort == "id" or sort in REQUIRED_COLUMNS:
+            segments = [value_segment]
+        else:
+            segments = [value_segment, null_segment] if descending else [null_segment, value_segment]
+
+        if after is not None:
+            value, last_id = after
+            if sort == "id" or value is None:
+                start = segments[0] if sort == "id" else null_segment
+                segments = [(start[0] + [f'j.id {op} ?'], [last_id], start[2])] + segments[segments.index(start) + 1:]
+            else:
+                ties = ([f'{key} = ?', f'j.id {op} ?'], [value, last_id], f'j.id {direction}')
+                rest = (value_segment[0] + [f'{key} {op} ?'], [value], value_segment[2])
+                segments = [ties, rest] + segments[segments.index(value_segment) + 1:]
+
+        rows = []
+        for where, params, order in segments:
+            clauses = base_where + where
+            sql = select + (' WHERE ' + ' AND '.join(clauses) if clauses else '') + f' ORDER BY {order} LIMIT ?'
+            rows += self.connection().execute(sql, base_params + params + [int(limit) - len(rows)]).fetchall()
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def count_postings(self, query: str = "", filters: Optional[Dict] = None) -> int:
+        """Number of postings browse_page() can return for this query and filters"""
+        where, params = self._browse_where(query, filters)
+        if not where:
+            row = self.connection().execute(
+                f"SELECT value FROM {self.TABLE_NAME}_stats WHERE key = 'total_jobs'"
+            ).fetchone()
+            return row[0] if row else 0
+        sql = f'SELECT COUNT(*) FROM {self.TABLE_NAME} j WHERE ' + ' AND '.join(where)
+        return self.connection().execute(sql, params).fetchone()[0]
+
+    def update_postings(self, edits: Dict[int, Dict[str, str]]) -> int:
+        """Apply {posting id: {column: value}} edits from the table view in one transaction"""
+        updated = 0
+        with span("edit", rows=len(edits)), self.transaction() as conn:
+            for posting_id, fields in edits.items():
+                values = {column: fields[column] for column in fields if column in EDITABLE_COLUMNS}
+                if not values:
+                    continue
+                # an edited salary or location re-derives the normalized columns of both,
+                # since a bare "$" takes its currency from the location's country
+                if "salary" in values or "location" in values:
+                    row = conn.execute(f'SELECT salary, location FROM {self.TABLE_NAME} WHERE id = ?',
+                                       (posting_id,)).fetchone()
+                    salary, location = row if row else (None, None)
+                    values.update(normalize_fields(values.get("salary", salary), values.get("location", location)))
+                assignments = ", ".join(f"{column} = ?" for column in values)
+                conn.execute(f'UPDATE {self.TABLE_NAME} SET {assignments} WHERE id = ?',
+                             list(values.values()) + [posting_id])
+                updated += 1
+        return updated
+
+    # RE-PARSE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    @staticmethod
+    def _reparse_key(prompt_version, model: Optional[str]) -> str:
+        return f"{prompt_version}|{model or ''}"
+
+    def _stale_where(self, prompt_version, model: Optional[str]) -> Tuple[str, List]:
+        """
+        Rows parsed with another prompt version, or (when model is given) by another
+        model, that have text or a page to re-parse and have not already failed this way
+        """
+        where = "(j.prompt_version IS NOT ?"
+        params = [str(prompt_version)]
+        if model:
+            # structured data is read straight from the page, no model involved
+            where += " OR (j.parser_model IS NOT ? AND COALESCE(j.parser_model, '') NOT LIKE 'json-ld%')"
+            params.append(model)
+        where += f''') AND j.reparse_failed IS NOT ?
+            AND (COALESCE(j.posting_text, '') != ''
+                 OR EXISTS (SELECT 1 FROM {self.TABLE_NAME}_sources src WHERE src.posting_id = j.id))'''
+        params.append(self._reparse_key(prompt_version, model))
+        return where, params
+
+    def parser_versions(self) -> List[Tuple]:
+        """(prompt version, parser model, rows) for every combination in the table"""
+        return self.connection().execute(f'''
+            SELECT prompt_version, parser_model, COUNT(*) FROM {self.TABLE_NAME}
+            GROUP BY prompt_version, parser_model ORDER BY 3 DESC
+        ''').fetchall()
+
+    def count_stale(self, prompt_version, model: Optional[str] = None) -> int:
+        where, params = self._stale_where(prompt_version, model)
+        return self.connection().execute(
+            f'SELECT COUNT(*) FROM {self.TABLE_NAME} j WHERE {where}', params
+        ).fetchone()[0]
+
+    def stale_postings(self, prompt_version, model: Optional[str] = None,
+                       after_id: int = 0, limit: int = 20) -> List[Dict]:
+        """
+        Next stale rows after after_id, in id order, with their page source
+        decompressed (None for rows saved from pasted text or before sources were kept).
+        """
+        where, params = self._stale_where(prompt_version, model)
+        rows = self.connection().execute(f'''
+            SELECT j.id, j.posting_text, s.codec, s.data
+            FROM {self.TABLE_NAME} j LEFT JOIN {self.TABLE_NAME}_sources s ON s.posting_id = j.id
+            WHERE j.id > ? AND {where}
+            ORDER BY j.id LIMIT ?
+        ''', [after_id] + params + [limit]).fetchall()
+        return [
+            {
+                "id": posting_id,
+                "posting_text": posting_text,
+                "raw_source": source_store.decompress(codec, blob) if blob is not None else None,
+            }
+            for posting_id, posting_text, codec, blob in rows
+        ]
+
+    def mark_reparse_failed(self, posting_ids: List[int], prompt_version, model: Optional[str] = None):
+        """Leave rows out of later re-parses with this prompt version / model"""
+        key = self._reparse_key(prompt_version, model)
+        with self.transaction() as conn:
+            conn.executemany(f'UPDATE {self.TABLE_NAME} SET reparse_failed = ? WHERE id = ?',
+                             [(key, posting_id) for posting_id in posting_ids])
+
+    def apply_reparse(self, results: List[Dict]) -> int:
+        """Overwrite re-parsed rows (fields, posting text, version tags) in one transaction"""
+        updated = 0
+        with span("save", rows=len(results), reparse=True), self.transaction() as conn:
+            for job in results:
+                job_title = job.get('job_title', '').strip()
+                company = job.get('company', '').strip()
+                if not (job_title and company):
+                    continue
+                posting_text = job.get('posting_text') or None
+                location, salary = job.get('location', '').strip(), job.get('salary', '').strip()
+                normalized = normalize_fields(salary, location)
+                conn.execute(self._sql["reparse_update"], (
+                    job_title, company, location, salary,
+                    posting_text, str(job.get('prompt_version')), job.get('parser_model') or job.get('parse_source'),
+                    *(normalized[column] for column, _ in NORMALIZED_COLUMNS),
+                    job['id'],
+                ))
+                # new posting text means a new fingerprint
+                conn.execute(self._sql["delete_fingerprint"], (job['id'],))
+                conn.execute(self._sql["delete_buckets"], (job['id'],))
+                signature = dedupe.minhash(posting_text) if posting_text else None
+                if signature is not None:
+                    conn.execute(self._sql["insert_fingerprint"], (job['id'], dedupe.pack(signature)))
+                    conn.executemany(self._sql["insert_bucket"],
+                                     [(bucket, job['id']) for bucket in dedupe.band_buckets(signature)])
+                updated += 1
+        return updated
 
 
 #  %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 
 
     
+    def get_summary_stats(self, recent_limit: int = 5, days: int = 7, weeks: int = 4) -> Dict:
+        """Dashboard numbers read from the trigger-maintained summary tables (no scans of the jobs table)"""
+        table = self.TABLE_NAME
+        conn = self.connection()
+        totals = dict(conn.execute(f'SELECT key, value FROM {table}_stats').fetchall())
+        recent = conn.execute(f'''
+            SELECT j.job_title, j.company, j.location, j.salary, j.created_at
+            FROM {table}_recent r JOIN {table} j ON j.id = r.id
+            ORDER BY r.created_at DESC, r.id DESC
+            LIMIT ?
+        ''', (recent_limit,)).fetchall()
+        return {
+            "total_jobs": totals.get("total_jobs", 0),
+            "companies": totals.get("companies", 0),
+            "top_companies": conn.execute(f'''
+                SELECT company, job_count FROM {table}_company_counts ORDER BY job_count DESC, company LIMIT 5
+            ''').fetchall(),
+            "per_day": conn.execute(
+                f'SELECT day, job_count FROM {table}_daily_counts ORDER BY day DESC LIMIT ?', (days,)
+            ).fetchall(),
+            "per_week": conn.execute(
+                f'SELECT week, job_count FROM {table}_weekly_counts ORDER BY week DESC LIMIT ?', (weeks,)
+            ).fetchall(),
+            "recent": recent,
+        }
+
+    def rebuild_summary_tables(self) -> Dict:
+        """Recompute the summary tables from the jobs table; reports whether they had drifted"""
+        # compare every row of every summary, not just the dashboard slice
+        full = dict(recent_limit=RECENT_KEEP, days=-1, weeks=-1)
+        before = self.get_summary_stats(**full)
+        with self.transaction() as conn:
+            _rebuild_summaries(conn, self.TABLE_NAME)
+        after = self.get_summary_stats(**full)
+        return {
+            "before": {key: before[key] for key in ("total_jobs", "companies")},
+            "after": {key: after[key] for key in ("total_jobs", "companies")},
+            "consistent": before == after,
+        }
+
     def get_database_stats(self, recent_limit: int = 5) -> str:
         """Get comprehensive database statistics as a formatted string"""
         try:
-            self.init_database()
-            conn = sqlite3.connect(self.DB_FILE)
-            cursor = conn.cursor()
-            
-            # Get total job count
-            cursor.execute(f'SELECT COUNT(*) FROM {self.TABLE_NAME}')
-            total_jobs = cursor.fetchone()[0]
-            
-            # Get unique company count
-            cursor.execute(f'SELECT COUNT(DISTINCT company) FROM {self.TABLE_NAME}')
-            unique_companies = cursor.fetchone()[0]
-            
-            # Get recent jobs
-            cursor.execute(f'''
-                SELECT job_title, company, location, salary, created_at
-                FROM {self.TABLE_NAME} 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            ''', (recent_limit,))
-            
-            recent_jobs = cursor.fetchall()
-            conn.close()
+            summary = self.get_summary_stats(recent_limit)
+            recent_jobs = summary["recent"]
             
             # Format the output
             stats = f"=== Database Status ===\n"
-            stats += f"Total Jobs: {total_jobs}\n"
-            stats += f"Companies: {unique_companies}\n"
+            stats += f"Total Jobs: {summary['total_jobs']}\n"
+            stats += f"Companies: {summary['companies']}\n"
+            if summary["per_day"]:
+                day, count = summary["per_day"][0]
+                stats += f"Latest Day ({day}): {count}\n"
+            if summary["per_week"]:
+                week, count = summary["per_week"][0]
+                stats += f"Latest Week ({week}): {count}\n"
             
             if recent_jobs:
                 stats += f"\nRecent Jobs:\n"
@@ -209,18 +1211,48 @@ class database_context:
 
 
 
-def fetch_url_content(url: str) -> Optional[str]:
-    """Fetch webpage content and return visible text"""
+def fetch_posting(url: str) -> Tuple[Optional[str], Dict, Optional[Dict]]:
+    """
+    Fetch a webpage and return the job description text, an input/reduced size
+    report (with the page itself under "html") and the JobPosting structured data
+    when the page carries enough of it to skip the LLM.
+    """
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        return soup.get_text(separator=" ", strip=True)
+        # stop downloading shortly after the posting element has closed; carousels and footers follow it
+        html = http_client.get_text(url, stop_when=PostingRegionWatch())
+        return read_posting_page(html)
     except Exception as e:
         print(f"URL fetch failed: {e}")
-        return None
+        return None, {}, None
+
+
+def read_posting_page(html: str) -> Tuple[str, Dict, Optional[Dict]]:
+    """fetch_posting() for a page that is already downloaded"""
+    with span("extract", bytes=len(html)) as extract_span:
+        structured = extract_structured_posting(html)
+        content, report = extract_posting_text(html, db.get_setting("prompt_token_budget"))
+        extract_span.set(tokens=report["output_tokens"])
+    if structured:
+        structured["posting_text"] = content
+    report["html"] = html
+    return content, report, structured
+
+
+def fetch_url_content(url: str) -> Optional[str]:
+    """Fetch webpage content and return visible text"""
+    content, _, _ = fetch_posting(url)
+    return content
+
 
+# Global database context instance (settings are read on first use, not at import)
+db = LazyObject(database_context)
 
-# Global database context instance
-db = database_context()
+# Shared HTTP session and page cache
+http_client = LazyObject(lambda: HttpClient(
+    os.path.join(db.data_dir, "http_cache"),
+    max_cache_bytes=int(db.get_setting("http_cache_max_mb")) * 1024 * 1024,
+    pool_size=db.get_setting("http_pool_size"),
+    max_page_bytes=int(db.get_setting("http_max_page_kb")) * 1024,
+    max_fetch_seconds=float(db.get_setting("http_fetch_timeout_seconds")),
+))
 
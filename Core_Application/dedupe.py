@@ -0,0 +1,77 @@
+"""
+Near-duplicate fingerprints: MinHash signatures over word shingles, bucketed
+with LSH bands so a lookup only touches postings that share a band.
+
+One-permutation hashing is used (each shingle is hashed once and dropped into
+one of SIGNATURE_SIZE bins) so fingerprinting is a single pass over the text.
+"""
+
+import hashlib
+import re
+from array import array
+from typing import List, Optional
+
+SIGNATURE_SIZE = 64
+BAND_COUNT = 16             # 16 bands x 4 rows: ~0.9 similar texts almost always share a band
+ROWS_PER_BAND = SIGNATURE_SIZE // BAND_COUNT
+SHINGLE_SIZE = 3
+MIN_WORDS = 20              # shorter texts do not fingerprint reliably
+EMPTY = (1 << 64) - 1
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercased word tokens with punctuation and extra whitespace removed"""
+    return re.findall(r"[a-z0-9]+", (text or "").casefold())
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    """MinHash signature of the text's word shingles, or None when the text is too short"""
+    words = normalize(text)
+    if len(words) < MIN_WORDS:
+        return None
+
+    signature = [EMPTY] * SIGNATURE_SIZE
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    for shingle in shingles:
+        value = _hash64(shingle.encode("utf-8"))
+        slot = value % SIGNATURE_SIZE
+        value //= SIGNATURE_SIZE
+        if value < signature[slot]:
+            signature[slot] = value
+
+    # densify: an empty bin borrows from the next filled bin (rotation)
+    for slot in range(SIGNATURE_SIZE):
+        if signature[slot] == EMPTY:
+            for step in range(1, SIGNATURE_SIZE):
+                donor = signature[(slot + step) % SIGNATURE_SIZE]
+                if donor != EMPTY:
+                    signature[slot] = donor + step * (1 << 58)
+                    break
+    return signature
+
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """One LSH bucket key per band (signed, so SQLite can store it as INTEGER)"""
+    buckets = []
+    for band in range(BAND_COUNT):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        key = _hash64(array("Q", [band] + [r & EMPTY for r in rows]).tobytes())
+        buckets.append(key - (1 << 64) if key >= 1 << 63 else key)
+    return buckets
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / SIGNATURE_SIZE
+
+
+def pack(signature: List[int]) -> bytes:
+    return array("Q", [value & EMPTY for value in signature]).tobytes()
+
+
+def unpack(blob: bytes) -> List[int]:
+    return list(array("Q", blob))
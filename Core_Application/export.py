@@ -0,0 +1,184 @@
+"""
+Streaming export of saved postings to CSV, Excel (.xlsx) and Parquet.
+
+Rows are read from SQLite in keyset-paginated chunks ordered by
+(updated_at, id) and handed straight to a streaming writer, so memory use does
+not grow with the table. Incremental exports store the last (updated_at, id)
+written under an export name and only pick up rows added or edited after it.
+"""
+
+import csv
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from database_context import db
+
+EXPORT_COLUMNS = ["id", "job_title", "company", "location", "salary", "created_at", "updated_at"]
+TEXT_COLUMN = "posting_text"
+FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".parquet": "parquet"}
+EXCEL_CELL_LIMIT = 32767
+
+
+# WRITERS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+class CsvExportWriter:
+    def __init__(self, path: str, columns: List[str]):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows: List[Tuple]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ExcelExportWriter:
+    """openpyxl write-only workbook: rows are serialized as they are appended"""
+    def __init__(self, path: str, columns: List[str]):
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        self.path = path
+        # control characters pasted with a posting (e.g. \x07) make openpyxl refuse the row
+        self.illegal_characters = ILLEGAL_CHARACTERS_RE
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Job Postings")
+        self.sheet.append(columns)
+
+    def write_rows(self, rows: List[Tuple]):
+        for row in rows:
+            self.sheet.append([
+                self.illegal_characters.sub("", value)[:EXCEL_CELL_LIMIT] if isinstance(value, str) else value
+                for value in row
+            ])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class ParquetExportWriter:
+    """One Parquet row group per chunk (needs the optional pyarrow package)"""
+    def __init__(self, path: str, columns: List[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(name, pa.int64() if name == "id" else pa.string()) for name in columns])
+        self.writer = pq.ParquetWriter(path, self.schema, compression="snappy")
+
+    def write_rows(self, rows: List[Tuple]):
+        arrays = {name: [row[i] for row in rows] for i, name in enumerate(self.columns)}
+        self.writer.write_table(self.pa.Table.from_pydict(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvExportWriter, "xlsx": ExcelExportWriter, "parquet": ParquetExportWriter}
+
+
+# ROWS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def iter_chunks(columns: List[str], since: Optional[Tuple[str, int]] = None,
+                chunk_size: int = 1000) -> Iterator[List[Tuple]]:
+    """Yield rows in (updated_at, id) order, chunk_size at a time, starting after since"""
+    table = db.TABLE_NAME
+    conn = db.connection()
+    select = f'SELECT {", ".join(columns)} FROM {table}'
+    updated_index = columns.index("updated_at")
+    id_index = columns.index("id")
+    position = since
+    while True:
+        if position is None:
+            rows = conn.execute(
+                f'{select} ORDER BY updated_at, id LIMIT ?', (chunk_size,)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f'{select} WHERE (updated_at, id) > (?, ?) ORDER BY updated_at, id LIMIT ?',
+                (position[0], position[1], chunk_size)
+            ).fetchall()
+        if not rows:
+            return
+        yield rows
+        position = (rows[-1][updated_index], rows[-1][id_index])
+
+
+def get_watermark(name: str) -> Optional[Dict]:
+    row = db.connection().execute(
+        f'SELECT updated_at, last_id, exported_at, rows FROM {db.TABLE_NAME}_export_watermarks WHERE name = ?',
+        (name,)
+    ).fetchone()
+    if not row:
+        return None
+    return {"updated_at": row[0], "last_id": row[1], "exported_at": row[2], "rows": row[3]}
+
+
+def reset_watermark(name: str):
+    with db.transaction() as conn:
+        conn.execute(f'DELETE FROM {db.TABLE_NAME}_export_watermarks WHERE name = ?', (name,))
+
+
+def _save_watermark(name: str, position: Tuple[str, int], rows: int):
+    with db.transaction() as conn:
+        conn.execute(
+            f'INSERT OR REPLACE INTO {db.TABLE_NAME}_export_watermarks VALUES (?, ?, ?, ?, ?)',
+            (name, position[0], position[1], datetime.now().isoformat(), rows)
+        )
+
+
+# EXPORT %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def export_format(path: str, fmt: Optional[str] = None) -> str:
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format for {path} (use .csv, .xlsx or .parquet)")
+    return fmt
+
+
+def export_postings(path: str, fmt: Optional[str] = None, incremental: bool = False,
+                    name: Optional[str] = None, include_text: bool = False,
+                    chunk_size: int = 1000) -> Dict:
+    """
+    Stream saved postings to path. With incremental=True only rows added or edited
+    since the last incremental export under the same name (default: the format) are
+    written, and the watermark moves forward only once the file is complete.
+    """
+    db.init_database()
+    fmt = export_format(path, fmt)
+    name = name or fmt
+    columns = EXPORT_COLUMNS + ([TEXT_COLUMN] if include_text else [])
+
+    since = None
+    if incremental:
+        watermark = get_watermark(name)
+        if watermark:
+            since = (watermark["updated_at"], watermark["last_id"])
+
+    # write next to the target and rename, so a failed export never leaves a partial file
+    temp_path = f"{path}.partial"
+    writer = WRITERS[fmt](temp_path, columns)
+    count, position = 0, since
+    try:
+        for rows in iter_chunks(columns, since, chunk_size):
+            writer.write_rows(rows)
+            count += len(rows)
+            position = (rows[-1][columns.index("updated_at")], rows[-1][0])
+        writer.close()
+    except BaseException:
+        try:
+            writer.close()
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+    if incremental and position is not None and position != since:
+        _save_watermark(name, position, count)
+    return {"path": path, "format": fmt, "rows": count, "incremental": incremental, "since": since}
@@ -0,0 +1,286 @@
+import re
+from html import unescape
+from typing import Dict, List, Optional, Tuple
+
+from structured_data import is_job_posting_ld_json
+from utils import estimate_tokens
+
+# tags that never hold the posting itself
+NOISE_TAGS = ["script", "style", "noscript", "svg", "iframe", "template", "nav", "footer", "aside", "button"]
+
+# id/class fragments for cookie banners, menus, share bars and related-job carousels
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|consent|gdpr|banner|newsletter|subscribe|related|similar|recommend|carousel|share|social|"
+    r"breadcrumb|sidebar|menu|navbar|navigation|footer|signup|sign-in|login|modal|popup|advert|promo",
+    re.IGNORECASE,
+)
+# never strip something that looks like the posting
+POSTING_PATTERN = re.compile(r"job-?desc|job-?detail|job-?body|posting|vacanc|description", re.IGNORECASE)
+
+# where the main posting usually lives, most specific first
+MAIN_SELECTORS = [
+    "[itemtype*=JobPosting]",
+    "[class*=job-description]", "[id*=job-description]",
+    "[class*=jobDescription]", "[id*=jobDescription]",
+    "[class*=job-details]", "[id*=job-details]",
+    "main", "[role=main]", "article",
+]
+
+# lines worth keeping first when trimming: title, company, location and salary regions
+KEY_LINE_PATTERN = re.compile(
+    r"salary|compensation|pay range|per hour|per year|/hr|/yr|annual|\$|€|£|"
+    r"location|remote|hybrid|on-?site|office|"
+    r"company|employer|about us|who we are|"
+    r"title|position|role",
+    re.IGNORECASE,
+)
+
+MIN_MAIN_CHARS = 200
+
+# opening tag of an element explicitly marked as the posting, for the cheap pre-parse region scan
+REGION_OPEN_PATTERN = re.compile(
+    r"<(div|section|article|main)\b([^>]*?(?:itemtype\s*=\s*[\"'][^\"']*JobPosting"
+    r"|(?:class|id)\s*=\s*[\"'][^\"']*(?:job-?desc|jobDescription|job-?detail|job-?body|posting|vacanc))[^>]*)>",
+    re.IGNORECASE,
+)
+SCRIPT_STYLE_PATTERN = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+TITLE_PATTERN = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+BODY_CLOSE_PATTERN = re.compile(r"</body\s*>", re.IGNORECASE)
+LD_JSON_OPEN_PATTERN = re.compile(r"<script[^>]+type\s*=\s*[\"']application/ld\+json[\"'][^>]*>", re.IGNORECASE)
+SCRIPT_CLOSE_PATTERN = re.compile(r"</script\s*>", re.IGNORECASE)
+
+# early stop: how much more of the page is read after the posting element closes, for
+# JSON-LD placed after it, and how far back each chunk's scan reaches for a tag split across chunks
+STOP_LOOKAHEAD_CHARS = 64 * 1024
+SCAN_OVERLAP_CHARS = 2048
+
+
+def _attr_text(tag) -> str:
+    classes = tag.get("class") or []
+    if isinstance(classes, str):
+        classes = [classes]
+    return " ".join(classes) + " " + (tag.get("id") or "")
+
+
+def _strip_boilerplate(region):
+    """Remove banner/menu/carousel blocks, but never a wrapper holding most of the region"""
+    region_chars = len(region.get_text(" ", strip=True)) or 1
+    for tag in region.find_all(True):
+        if tag.decomposed or not tag.attrs:
+            continue
+        attrs = _attr_text(tag)
+        if not BOILERPLATE_PATTERN.search(attrs) or POSTING_PATTERN.search(attrs):
+            continue
+        if len(tag.get_text(" ", strip=True)) > region_chars / 2 or tag.find("h1"):
+            continue
+        tag.decompose()
+
+
+def _main_region(soup):
+    for selector in MAIN_SELECTORS:
+        for node in soup.select(selector):
+            if len(node.get_text(" ", strip=True)) >= MIN_MAIN_CHARS:
+                return node
+    return soup.body or soup
+
+
+def _dedupe_lines(lines: List[str]) -> List[str]:
+    seen = set()
+    kept = []
+    for line in lines:
+        line = re.sub(r"\s+", " ", line).strip()
+        key = line.casefold()
+        if not line or key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return kept
+
+
+def trim_to_budget(lines: List[str], token_budget: int) -> List[str]:
+    """Keep lines in original order, key lines first, until the token budget is used"""
+    if estimate_tokens("\n".join(lines)) <= token_budget:
+        return lines
+    keep = set()
+    used = 0
+    # title / company / location / salary lines first, then the rest in reading order
+    key_lines = [i for i, line in enumerate(lines) if KEY_LINE_PATTERN.search(line) and len(line) < 300]
+    first = set(key_lines)
+    ordered = key_lines + [i for i in range(len(lines)) if i not in first]
+    for index in ordered:
+        cost = estimate_tokens(lines[index])
+        if used + cost > token_budget:
+            continue
+        keep.add(index)
+        used += cost
+    return [line for i, line in enumerate(lines) if i in keep]
+
+
+def reduce_text(text: str, token_budget: int) -> str:
+    """Drop duplicate lines and trim plain text to the token budget"""
+    lines = _dedupe_lines((text or "").splitlines())
+    return "\n".join(trim_to_budget(lines, token_budget))
+
+
+def _visible_text(html: str) -> str:
+    text = TAG_PATTERN.sub(" ", SCRIPT_STYLE_PATTERN.sub(" ", html))
+    return " ".join(unescape(text).split())
+
+
+def find_posting_region(html: str) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) offsets of the first complete element marked as the job posting
+    (JobPosting itemtype, job-description / posting class or id), found with
+    regexes only so it is cheap enough to run on a page while it downloads.
+    """
+    for match in REGION_OPEN_PATTERN.finditer(html):
+        attrs = match.group(2)
+        if BOILERPLATE_PATTERN.search(attrs) and "JobPosting" not in attrs:
+            continue                   # e.g. class="related-postings"
+        name = match.group(1).lower()
+        depth = 1
+        for tag in re.finditer(rf"<(/?){name}\b[^>]*>", html[match.end():], re.IGNORECASE):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                end = match.end() + tag.end()
+                if len(_visible_text(html[match.start():end])) >= MIN_MAIN_CHARS:
+                    return match.start(), end
+                break
+    return None
+
+
+class PostingRegionWatch:
+    """
+    Early-stop test for streaming downloads, called with each decoded chunk in turn.
+    True once the posting element has closed and then a JobPosting JSON-LD block
+    has been read, the body has closed, or STOP_LOOKAHEAD_CHARS more have arrived
+    without a JSON-LD script left open. Each chunk is scanned with only a short
+    overlap into the previous one, so the work stays linear in the page size.
+    """
+    def __init__(self):
+        self.parts: List[str] = []
+        self.length = 0
+        # posting element: candidate (start, tag name), its nesting depth, where scans resume
+        self.candidate: Optional[Tuple[int, str]] = None
+        self.depth = 0
+        self.open_from = 0
+        self.tag_from = 0
+        self.region_end: Optional[int] = None
+        # ld+json scripts anywhere on the page
+        self.script_from = 0
+        self.script_start: Optional[int] = None    # content offset of a script not closed yet
+        self.job_posting_seen = False
+        self.body_closed = False
+
+    def __call__(self, chunk: str) -> bool:
+        new_start = self.length
+        self.parts.append(chunk)
+        self.length += len(chunk)
+        self._scan_scripts(new_start)
+        if self.region_end is None:
+            self._scan_region(new_start)
+        if not self.body_closed:
+            self.body_closed = BODY_CLOSE_PATTERN.search(self.text_from(new_start - 16)) is not None
+        if self.region_end is None or self.script_start is not None:
+            return False
+        return self.job_posting_seen or self.body_closed or self.length - self.region_end >= STOP_LOOKAHEAD_CHARS
+
+    def text_from(self, start: int) -> str:
+        """The page from offset start on, joining only the chunks that hold it"""
+        start = max(0, start)
+        pieces, offset = [], self.length
+        for part in reversed(self.parts):
+            if offset <= start:
+                break
+            offset -= len(part)
+            pieces.append(part)
+        return "".join(reversed(pieces))[start - offset:]
+
+    def _scan_scripts(self, new_start: int):
+        while True:
+            if self.script_start is None:
+                window = max(self.script_from, new_start - SCAN_OVERLAP_CHARS)
+                opening = LD_JSON_OPEN_PATTERN.search(self.text_from(window))
+                if not opening:
+                    return
+                self.script_start = window + opening.end()
+            window = max(self.script_start, new_start - SCAN_OVERLAP_CHARS)
+            closing = SCRIPT_CLOSE_PATTERN.search(self.text_from(window))
+            if not closing:
+                return
+            if not self.job_posting_seen:
+                raw = self.text_from(self.script_start)[:window + closing.start() - self.script_start]
+                self.job_posting_seen = is_job_posting_ld_json(raw)
+            self.script_from = window + closing.end()
+            self.script_start = None
+
+    def _scan_region(self, new_start: int):
+        """find_posting_region() over the new text only"""
+        while self.region_end is None:
+            if self.candidate is None:
+                window = max(self.open_from, new_start - SCAN_OVERLAP_CHARS)
+                for match in REGION_OPEN_PATTERN.finditer(self.text_from(window)):
+                    attrs = match.group(2)
+                    if not BOILERPLATE_PATTERN.search(attrs) or "JobPosting" in attrs:
+                        self.candidate = (window + match.start(), match.group(1).lower())
+                        self.depth = 1
+                        self.tag_from = window + match.end()
+                        break
+                else:
+                    return
+            start, name = self.candidate
+            window = max(self.tag_from, new_start - SCAN_OVERLAP_CHARS)
+            for tag in re.finditer(rf"<(/?){name}\b[^>]*>", self.text_from(window), re.IGNORECASE):
+                self.depth += -1 if tag.group(1) else 1
+                self.tag_from = window + tag.end()
+                if self.depth == 0:
+                    break
+            if self.depth:
+                return
+            self.candidate = None
+            if len(_visible_text(self.text_from(start)[:self.tag_from - start])) >= MIN_MAIN_CHARS:
+                self.region_end = self.tag_from
+            else:
+                # too short to be the posting: look again from inside it
+                self.open_from = new_start = start + 1
+
+
+def extract_posting_text(html: str, token_budget: int) -> Tuple[str, Dict]:
+    """Isolate the job description region of a page and trim it to the token budget"""
+    from bs4 import BeautifulSoup      # imported on first use to keep startup fast
+    heading = []
+    title = TITLE_PATTERN.search(html)
+    if title and title.group(1).strip():
+        heading.append(_visible_text(title.group(1)))
+
+    full_text = _visible_text(html)
+    # only the marked posting element is parsed when the page has one; otherwise
+    # the whole page, minus scripts and styles, which are never part of it
+    region_span = find_posting_region(html)
+    if region_span:
+        h1 = re.search(r"<h1\b[^>]*>(.*?)</h1\s*>", html[:region_span[1]], re.IGNORECASE | re.DOTALL)
+        if h1:
+            heading.append(_visible_text(h1.group(1)))
+        soup = BeautifulSoup(html[region_span[0]:region_span[1]], "html.parser")
+    else:
+        soup = BeautifulSoup(SCRIPT_STYLE_PATTERN.sub(" ", html), "html.parser")
+        h1 = soup.find("h1")
+        if h1:
+            heading.append(h1.get_text(" ", strip=True))
+
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+    region = _main_region(soup)
+    _strip_boilerplate(region)
+
+    lines = _dedupe_lines(heading + region.get_text(separator="\n").splitlines())
+    reduced = "\n".join(trim_to_budget(lines, token_budget))
+
+    report = {
+        "input_chars": len(full_text),
+        "output_chars": len(reduced),
+        "input_tokens": estimate_tokens(full_text),
+        "output_tokens": estimate_tokens(reduced),
+    }
+    return reduced, report
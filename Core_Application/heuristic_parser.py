@@ -0,0 +1,123 @@
+"""
+Offline field extraction with regular expressions: labelled lines first
+("Location: ..."), then common layouts ("Senior Developer at Acme", a short
+title line, "City, ST"). Much less accurate than an LLM but instant and free.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+LABELS = {
+    "job_title": r"job title|position title|position|title|role",
+    "company": r"company name|company|employer|organi[sz]ation|hiring company",
+    "location": r"job location|work location|location|based in|office",
+    "salary": r"salary range|salary|compensation|pay range|base pay|pay|wage",
+}
+LABEL_PATTERNS = {
+    field: re.compile(rf"^\s*(?:{labels})\s*[:\-–|]\s*(.{{2,120}}?)\s*$", re.IGNORECASE)
+    for field, labels in LABELS.items()
+}
+
+TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|programmer|architect|manager|analyst|designer|scientist|specialist|"
+    r"consultant|administrator|coordinator|assistant|associate|intern|director|lead|technician|"
+    r"officer|representative|accountant|nurse|teacher|writer|editor|recruiter|sales|support)\b",
+    re.IGNORECASE,
+)
+AT_PATTERN = re.compile(r"^(.{3,80}?)\s+(?:at|@)\s+([A-Z][\w&.,' -]{1,60})$")
+HIRING_PATTERN = re.compile(r"^([A-Z][\w&.' -]{1,60}?)\s+is\s+(?:hiring|looking for|seeking)\s+(?:an?\s+)?(.{3,80}?)[.!]?$")
+ABOUT_PATTERN = re.compile(r"^About\s+([A-Z][\w&.' -]{1,60})$")
+NOT_A_COMPANY = re.compile(r"^(the|this|us|you|our|role|job|position|team|company)\b", re.IGNORECASE)
+
+REMOTE_PATTERN = re.compile(r"\b(fully remote|remote|hybrid|on-?site)\b", re.IGNORECASE)
+CITY_PATTERN = re.compile(r"\b([A-Z][a-zA-Z.'-]+(?:\s[A-Z][a-zA-Z.'-]+){0,2},\s*(?:[A-Z]{2}\b|[A-Z][a-z]+(?:\s[A-Z][a-z]+)?))")
+
+CURRENCY = r"(?:[$€£]|USD|CAD|EUR|GBP|AUD)"
+AMOUNT = r"\d[\d,]*(?:\.\d+)?\s?[kK]?"
+SALARY_PATTERN = re.compile(
+    rf"{CURRENCY}\s?{AMOUNT}(?:\s?(?:-|–|to)\s?{CURRENCY}?\s?{AMOUNT})?"
+    r"(?:\s*(?:per|/|an|a)\s*(?:hour|hr|year|yr|annum|month|week))?",
+    re.IGNORECASE,
+)
+
+MAX_LINES = 120
+
+
+def _lines(text: str) -> List[str]:
+    lines = [re.sub(r"\s+", " ", line).strip() for line in (text or "").splitlines()]
+    return [line for line in lines if line][:MAX_LINES]
+
+
+def _labelled(lines: List[str], field: str) -> str:
+    for line in lines:
+        match = LABEL_PATTERNS[field].match(line)
+        if match:
+            return match.group(1).strip(" .,;")
+    return ""
+
+
+def _title_and_company(lines: List[str]) -> Dict[str, str]:
+    for line in lines[:15]:
+        match = AT_PATTERN.match(line)
+        if match and TITLE_WORDS.search(match.group(1)):
+            return {"job_title": match.group(1).strip(), "company": match.group(2).strip(" .,")}
+        match = HIRING_PATTERN.match(line)
+        if match:
+            return {"job_title": match.group(2).strip(), "company": match.group(1).strip()}
+    return {}
+
+
+def _title(lines: List[str]) -> str:
+    short = [line for line in lines[:15] if len(line) <= 80 and len(line.split()) <= 10 and ":" not in line]
+    return next((line for line in short if TITLE_WORDS.search(line)), "")
+
+
+def _company(lines: List[str]) -> str:
+    for line in lines:
+        match = ABOUT_PATTERN.match(line)
+        if match and not NOT_A_COMPANY.match(match.group(1)):
+            return match.group(1).strip(" .,")
+    return ""
+
+
+def _location(lines: List[str]) -> str:
+    for line in lines[:40]:
+        city = CITY_PATTERN.search(line)
+        remote = REMOTE_PATTERN.search(line)
+        if city and remote:
+            return f"{city.group(1)} ({remote.group(1).title()})"
+        if city and len(line) <= 80:
+            return city.group(1)
+    remote = next((REMOTE_PATTERN.search(line) for line in lines[:40] if REMOTE_PATTERN.search(line)), None)
+    return remote.group(1).title() if remote else ""
+
+
+def _salary(lines: List[str]) -> str:
+    for line in lines:
+        match = SALARY_PATTERN.search(line)
+        if match and re.search(r"\d{2}", match.group(0)):
+            return match.group(0).strip()
+    return ""
+
+
+def extract_fields(text: str) -> Optional[Dict]:
+    """
+    Best-effort job_title / company / location / salary from plain posting text.
+    Returns None unless both a title and a company were found: rows without
+    either are never saved, so the router should try the next backend instead.
+    """
+    lines = _lines(text)
+    result = {field: _labelled(lines, field) for field in LABELS}
+
+    layout = _title_and_company(lines)
+    result["job_title"] = result["job_title"] or layout.get("job_title") or _title(lines)
+    result["company"] = result["company"] or layout.get("company") or _company(lines)
+    result["location"] = result["location"] or _location(lines)
+    if result["salary"] and not re.search(r"\d", result["salary"]):
+        result["salary"] = ""
+    result["salary"] = result["salary"] or _salary(lines)
+
+    if result["job_title"] and result["company"]:
+        result["parse_source"] = "heuristic"
+        return result
+    return None
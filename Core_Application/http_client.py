@@ -0,0 +1,289 @@
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from telemetry import span
+
+# anything else (PDFs, images, archives, JSON APIs) is refused before the body is read
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain", "text/xml", "application/xml")
+META_CHARSET_PATTERN = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+
+
+class PageRejected(Exception):
+    """A response that is not worth downloading (wrong content type or too large)"""
+
+
+class HttpClient:
+    """Shared keep-alive HTTP session with an on-disk, revalidating page cache
+
+    Bodies are streamed in CHUNK_BYTES pieces and decoded as they arrive, so a
+    fetch never holds more than max_page_bytes of a page (plus one chunk) and
+    never runs past max_fetch_seconds; a stop_when callback can end the download
+    as soon as the part of the page that matters has arrived.
+    """
+    USER_AGENT = "Mozilla/5.0 (compatible; Parsio job tracker)"
+    CHUNK_BYTES = 64 * 1024
+
+    def __init__(self, cache_dir: str, max_cache_bytes: int = 100 * 1024 * 1024,
+                 pool_size: int = 16, timeout: float = 10,
+                 max_page_bytes: int = 2 * 1024 * 1024, max_fetch_seconds: float = 20):
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = int(max_cache_bytes)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_page_bytes = int(max_page_bytes)
+        self.max_fetch_seconds = max_fetch_seconds
+        self._session = None
+
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict]] = None    # cache key -> metadata, loaded on first use
+        self.counters = {
+            "requests": 0,
+            "cache_hits": 0,             # 304 Not Modified, served from disk
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "rejected": 0,               # refused on Content-Type / Content-Length
+            "truncated": 0,              # cut off at max_page_bytes or max_fetch_seconds
+            "stopped_early": 0,          # stop_when ended the download
+        }
+
+    @property
+    def session(self):
+        """One pool per host, reused across threads and calls; requests is imported on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers["User-Agent"] = self.USER_AGENT
+                    self._session = session
+        return self._session
+
+    # CACHE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, key + ".json"), os.path.join(self.cache_dir, key + ".body")
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if self._index is None:
+            self._index = {}
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".json"):
+                        with open(os.path.join(self.cache_dir, name), 'r', encoding='utf-8') as file:
+                            self._index[name[:-5]] = json.load(file)
+            except Exception as e:
+                print(f"HTTP cache index error: {e}")
+        return self._index
+
+    def _read_cached(self, key: str) -> Optional[str]:
+        _, body_path = self._paths(key)
+        try:
+            with open(body_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _store(self, key: str, url: str, body: str, etag: Optional[str], last_modified: Optional[str]):
+        meta_path, body_path = self._paths(key)
+        data = body.encode("utf-8")
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(data),
+            "last_access": time.time(),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(body_path, 'wb') as file:
+                file.write(data)
+            with open(meta_path, 'w', encoding='utf-8') as file:
+                json.dump(meta, file)
+            with self._lock:
+                self._load_index()[key] = meta
+            self._evict()
+        except Exception as e:
+            print(f"HTTP cache write error: {e}")
+
+    def _forget(self, key: str):
+        """Drop a page from the index and the disk"""
+        with self._lock:
+            self._load_index().pop(key, None)
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _touch(self, key: str):
+        with self._lock:
+            meta = self._load_index().get(key)
+            if meta is not None:
+                meta["last_access"] = time.time()
+
+    def _evict(self):
+        """Drop least recently used pages until the cache fits in max_cache_bytes"""
+        with self._lock:
+            index = self._load_index()
+            total = sum(meta.get("size", 0) for meta in index.values())
+            if total <= self.max_cache_bytes:
+                return
+            for key, meta in sorted(index.items(), key=lambda kv: kv[1].get("last_access", 0)):
+                if total <= self.max_cache_bytes:
+                    break
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= meta.get("size", 0)
+                del index[key]
+
+    # FETCH %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def get_text(self, url: str, stop_when: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        GET a page, revalidating any cached copy with ETag / Last-Modified.
+        stop_when(text) is called with each newly decoded chunk; once it returns
+        True the rest of the page is not downloaded. Raises PageRejected for non-text
+        responses and for pages whose declared size is over max_page_bytes.
+        """
+        key = self._key(url)
+        with self._lock:
+            meta = dict(self._load_index().get(key) or {})
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        with span("fetch") as fetch_span:
+            while True:
+                with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as resp:
+                    self._count("requests", 1)
+
+                    if resp.status_code == 304:
+                        cached = self._read_cached(key) if meta else None
+                        if cached is not None:
+                            self._touch(key)
+                            self._count("cache_hits", 1)
+                            self._count("bytes_saved", meta.get("size", 0))
+                            fetch_span.set(cache_hit=True)
+                            return cached
+                        # the cached body is gone: never take the empty 304 body for the page
+                        self._forget(key)
+                        if not headers:
+                            raise PageRejected("304 Not Modified for a page that is not cached")
+                        headers, meta = {}, {}
+                        continue
+
+                    resp.raise_for_status()
+                    self._check_headers(resp)
+                    body, size, cut = self._read_body(resp, stop_when)
+                    self._count("bytes_downloaded", size)
+                    fetch_span.set(bytes=size)
+                    if cut:
+                        fetch_span.set(cut=cut)
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    break
+
+        # only complete bodies: a cut-off page would be served as if whole on the next 304,
+        # and what one stop_when needed is not necessarily everything another caller needs
+        if (etag or last_modified) and not cut:
+            self._store(key, url, body, etag, last_modified)
+        return body
+
+    def _check_headers(self, resp):
+        content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in TEXT_CONTENT_TYPES:
+            self._count("rejected", 1)
+            raise PageRejected(f"Not a web page ({content_type})")
+        length = resp.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > self.max_page_bytes:
+            self._count("rejected", 1)
+            raise PageRejected(f"Page too large ({int(length) // 1024:,} KB, limit {self.max_page_bytes // 1024:,} KB)")
+
+    def _read_body(self, resp, stop_when: Optional[Callable[[str], bool]]):
+        """Stream and decode the body; returns (text, bytes read, "" or why it was cut short)"""
+        deadline = time.monotonic() + self.max_fetch_seconds
+        decoder = None
+        parts = []
+        size = 0
+        cut = ""
+        for chunk in resp.iter_content(chunk_size=self.CHUNK_BYTES):
+            if decoder is None:
+                decoder = _decoder(resp.headers.get("Content-Type", ""), chunk)
+            if size + len(chunk) > self.max_page_bytes:
+                chunk = chunk[:self.max_page_bytes - size]
+                cut = "size"
+            size += len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if not cut and time.monotonic() > deadline:
+                cut = "time"
+            if not cut and stop_when is not None and stop_when(text):
+                cut = "stop"
+            if cut:
+                break
+        if decoder is not None:
+            parts.append(decoder.decode(b"", final=True))
+        length = resp.headers.get("Content-Length", "")
+        if cut == "stop" and length.isdigit() and size >= int(length):
+            cut = ""                     # the last chunk was the end of the page anyway
+        if cut:
+            self._count("stopped_early" if cut == "stop" else "truncated", 1)
+        return "".join(parts), size, cut
+
+    def _count(self, name: str, amount: int):
+        with self._lock:
+            self.counters[name] += amount
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+            index = self._index or {}
+            stats["cached_pages"] = len(index)
+            stats["cache_bytes"] = sum(meta.get("size", 0) for meta in index.values())
+        return stats
+
+    def clear_cache(self):
+        with self._lock:
+            for key in list(self._load_index()):
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            self._index = {}
+
+
+def _decoder(content_type: str, first_chunk: bytes):
+    """Incremental decoder for the header charset, else a <meta charset>, else UTF-8"""
+    charset = ""
+    if "charset=" in content_type.lower():
+        charset = content_type.lower().split("charset=")[-1].split(";")[0].strip(" \"'")
+    else:
+        match = META_CHARSET_PATTERN.search(first_chunk[:4096])
+        if match:
+            charset = match.group(1).decode("ascii", "ignore")
+    try:
+        return codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
@@ -0,0 +1,462 @@
+"""
+Local HTTP ingestion server, so bookmarklets, scripts and other tools can
+submit postings without the window.
+
+Submitted links and texts go through a fetch / parse worker pool like the GUI
+queue. Every database write goes through one writer thread that groups rows
+into one transaction per batch, so any number of concurrent producers never
+contend for the SQLite write lock. While the server runs, the parse cache
+hands its writes to the same writer.
+
+Every request needs the ingest_token setting, generated on first start. Only
+origins listed in ingest_allowed_origins may read the responses from a page.
+
+    POST /postings       {"url": ...}, {"text": ...}, {"url": ..., "html": ...} (a page the
+                         browser already has), a parsed posting with job_title and company,
+                         or a list of these (bare or as {"postings": [...]}). A plain text
+                         body is one posting, or one URL per line.
+    GET  /postings/<id>  status of one submitted item
+    GET  /status         queue depths and counters
+"""
+
+import hmac
+import itertools
+import json
+import queue
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from database_context import db, fetch_posting, read_posting_page
+from backends import parser_router
+from parse_cache import parse_cache
+from parser import tag_version
+from utils import save_error
+
+_DONE = object()            # queue sentinel
+
+URL_PATTERN = re.compile(r"^https?://\S+$", re.IGNORECASE)
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_TRACKED = 5000          # finished items whose status can still be looked up
+PARSE_BATCH_SIZE = 8        # postings per parser request
+WRITE_WAIT_SECONDS = 0.2    # how long the writer waits to fill a batch before committing it
+FINISHED = ("saved", "duplicate", "failed")
+SAVE_STATUS = {"inserted": "saved", "linked": "duplicate", "skipped": "failed", "failed": "failed"}
+SAVE_ERRORS = {"skipped": "no job title or company", "failed": "database write failed"}
+
+
+def _item(entry) -> Dict:
+    if isinstance(entry, str):
+        entry = {"url": entry.strip()} if URL_PATTERN.match(entry.strip()) else {"text": entry}
+    if not isinstance(entry, dict):
+        raise ValueError("each posting must be a string or an object")
+    if entry.get("job_title") and entry.get("company"):
+        return {"posting": entry}
+    item = {key: entry[key] for key in ("url", "text", "html")
+            if isinstance(entry.get(key), str) and entry[key].strip()}
+    if not item:
+        raise ValueError("each posting needs a url, text or html (or job_title and company)")
+    return item
+
+
+def parse_submission(body: bytes, content_type: str = "") -> List[Dict]:
+    """Items of a POST body as {url, text, html} or {posting} dicts; raises ValueError for a bad body"""
+    text = body.decode("utf-8", errors="replace").strip()
+    if not text:
+        raise ValueError("empty body")
+    # bookmarklets post JSON as text/plain to avoid a CORS preflight
+    if "json" in content_type or text[0] in "[{":
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON: {e}")
+        if isinstance(payload, dict) and "postings" in payload:
+            payload = payload["postings"]
+        entries = payload if isinstance(payload, list) else [payload]
+        if not entries:
+            raise ValueError("no postings")
+        return [_item(entry) for entry in entries]
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if all(URL_PATTERN.match(line) for line in lines):
+        return [{"url": line} for line in lines]
+    return [{"text": text}]
+
+
+def _preview(item: Dict, length: int = 80) -> str:
+    if "posting" in item:
+        return f"{item['posting'].get('job_title')} at {item['posting'].get('company')}"
+    text = item.get("url") or " ".join(item.get("text", "").split()) or "page html"
+    return text if len(text) <= length else text[:length - 3] + "..."
+
+
+def ingest_token() -> str:
+    """The ingest_token setting, generated and saved the first time"""
+    token = db.get_setting("ingest_token")
+    if not token:
+        token = secrets.token_urlsafe(24)
+        db.set_setting("ingest_token", token)
+    return token
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128        # listen backlog; the default of 5 resets bursts of concurrent producers
+
+
+class IngestServer:
+    """Fetch / parse worker pool and a single database writer behind a ThreadingHTTPServer"""
+    def __init__(self, host: str = "127.0.0.1", port: Optional[int] = None, workers: Optional[int] = None,
+                 max_queue: Optional[int] = None, commit_size: Optional[int] = None,
+                 token: Optional[str] = None, allowed_origins: Optional[List[str]] = None):
+        self.host = host
+        self.port = int(db.get_setting("ingest_port") if port is None else port)
+        self.workers = max(1, int(workers or db.get_max_workers()))
+        self.max_queue = max(1, int(max_queue or db.get_setting("ingest_max_queue")))
+        self.commit_size = max(1, int(commit_size or db.get_setting("ingest_commit_size")))
+        self.token = token or ingest_token()
+        self.allowed_origins = set(db.get_setting("ingest_allowed_origins") if allowed_origins is None
+                                   else allowed_origins)
+
+        self.fetch_queue: queue.Queue = queue.Queue()
+        self.parse_queue: queue.Queue = queue.Queue()
+        self.write_queue: queue.Queue = queue.Queue()
+        self.items: "OrderedDict[int, Dict]" = OrderedDict()
+        self.counts = {"received": 0, "rejected": 0, "fetched": 0, "parsed": 0, "structured": 0,
+                       "duplicates": 0, "saved": 0, "failed": 0, "batches": 0, "largest_batch": 0}
+        self.in_flight = 0
+        self.started = None
+        self.httpd: Optional[_HTTPServer] = None
+        self._ids = itertools.count(1)
+        self._finished: deque = deque()
+        self._lock = threading.Lock()
+        self._fetchers: List[threading.Thread] = []
+        self._parsers: List[threading.Thread] = []
+        self._writer: Optional[threading.Thread] = None
+        self._serving: Optional[threading.Thread] = None
+
+    # QUEUES %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def submit(self, items: List[Dict]) -> Optional[List[int]]:
+        """Queue items and return their ids, or None (and queue nothing) when the backlog is full"""
+        with self._lock:
+            if self.in_flight + len(items) > self.max_queue:
+                self.counts["rejected"] += len(items)
+                return None
+            ids = [next(self._ids) for _ in items]
+            for item_id, item in zip(ids, items):
+                self.items[item_id] = {"id": item_id, "input": _preview(item), "status": "queued"}
+            self.in_flight += len(items)
+            self.counts["received"] += len(items)
+        for item_id, item in zip(ids, items):
+            if "posting" in item:
+                posting = dict(item["posting"])
+                posting.setdefault("source", "ingest")
+                self._set(item_id, "writing")
+                self.write_queue.put(("save", item_id, posting))
+            else:
+                self.fetch_queue.put((item_id, item))
+        return ids
+
+    def _set(self, item_id: int, status: str, **fields):
+        with self._lock:
+            entry = self.items.get(item_id)
+            if entry is None:
+                return
+            entry.update(fields, status=status)
+            if status in FINISHED:
+                self.in_flight -= 1
+                self.counts["saved" if status == "saved" else "duplicates" if status == "duplicate" else "failed"] += 1
+                self._finished.append(item_id)
+                while len(self._finished) > MAX_TRACKED:
+                    self.items.pop(self._finished.popleft(), None)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.counts[key] += delta
+
+    def item_status(self, item_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self.items.get(item_id)
+            return dict(entry) if entry else None
+
+    def status(self) -> Dict:
+        with self._lock:
+            return dict(
+                self.counts,
+                in_flight=self.in_flight,
+                max_queue=self.max_queue,
+                queues={"fetch": self.fetch_queue.qsize(), "parse": self.parse_queue.qsize(),
+                        "write": self.write_queue.qsize()},
+                workers=self.workers,
+                commit_size=self.commit_size,
+                uptime_seconds=round(time.monotonic() - self.started, 1) if self.started else 0.0,
+            )
+
+    # WORKERS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    @staticmethod
+    def _load(item: Dict) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
+        """(text, structured data, page) for a url, html or text item"""
+        if item.get("html"):
+            content, _, structured = read_posting_page(item["html"])
+            return content, structured, item["html"]
+        if item.get("url"):
+            content, report, structured = fetch_posting(item["url"])
+            return content, structured, report.get("html")
+        return item["text"], None, None
+
+    def _fetch_worker(self):
+        while True:
+            entry = self.fetch_queue.get()
+            if entry is _DONE:
+                return
+            item_id, item = entry
+            self._set(item_id, "fetching")
+            source = item.get("url", "ingest")
+            try:
+                content, structured, page = self._load(item)
+            except Exception as e:
+                save_error(f"Ingest fetch failed for {_preview(item)}: {e}")
+                content, structured, page = None, None, None
+            if not content:
+                self._set(item_id, "failed", error="nothing to parse")
+                continue
+            self._count(fetched=1)
+
+            # a read on this thread; the link itself is written by the writer
+            duplicate = db.find_duplicate(content)
+            if duplicate:
+                self._set(item_id, "writing")
+                self.write_queue.put(("link", item_id, (duplicate["id"], source, duplicate["similarity"])))
+            elif structured:
+                structured.setdefault("source", source)
+                structured.setdefault("raw_source", page)
+                self._count(parsed=1, structured=1)
+                self._set(item_id, "writing")
+                self.write_queue.put(("save", item_id, tag_version(structured, structured["parse_source"])))
+            else:
+                self._set(item_id, "parsing")
+                self.parse_queue.put((item_id, content, source, page))
+
+    def _parse_worker(self):
+        finished = False
+        while not finished:
+            first = self.parse_queue.get()
+            if first is _DONE:
+                return
+            batch = [first]
+            while len(batch) < PARSE_BATCH_SIZE:
+                try:
+                    entry = self.parse_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _DONE:
+                    finished = True
+                    break
+                batch.append(entry)
+
+            try:
+                results = parser_router.parse_batch([content for _, content, _, _ in batch])
+            except Exception as e:
+                save_error(f"Ingest parse failed for {len(batch)} postings: {e}")
+                results = [None] * len(batch)
+            for (item_id, _, source, page), parsed_data in zip(batch, results):
+                if parsed_data and parsed_data.get("job_title") and parsed_data.get("company"):
+                    parsed_data.setdefault("source", source)
+                    parsed_data.setdefault("raw_source", page)
+                    self._count(parsed=1)
+                    self._set(item_id, "writing")
+                    self.write_queue.put(("save", item_id, parsed_data))
+                else:
+                    self._set(item_id, "failed", error="could not parse a job title and company")
+
+    def _write_worker(self):
+        """The only thread that writes: each batch of queued rows is one transaction"""
+        finished = False
+        while not finished:
+            batch = [self.write_queue.get()]
+            deadline = time.monotonic() + WRITE_WAIT_SECONDS
+            while len(batch) < self.commit_size and batch[-1] is not _DONE:
+                try:
+                    batch.append(self.write_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is _DONE:
+                finished = True
+                batch.pop()
+            if batch:
+                self._write(batch)
+        db.close()
+
+    def _write(self, batch: List[Tuple]):
+        saves = [(item_id, posting) for kind, item_id, posting in batch if kind == "save"]
+        cache_writes = [statements for kind, _, statements in batch if kind == "cache"]
+        if cache_writes:
+            try:
+                with db.transaction() as conn:
+                    for statements in cache_writes:
+                        statements(conn)
+            except Exception as e:
+                print(f"Parse cache write error: {e}")
+        for kind, item_id, link in batch:
+            if kind == "link":
+                posting_id, source, similarity = link
+                ok = db.link_duplicate(posting_id, source, similarity)
+                self._set(item_id, "duplicate" if ok else "failed", posting_id=posting_id)
+        if saves:
+            outcomes = db.save_job_postings([posting for _, posting in saves])["outcomes"]
+            for (item_id, posting), outcome in zip(saves, outcomes):
+                if outcome in SAVE_ERRORS:
+                    self._set(item_id, "failed", error=SAVE_ERRORS[outcome])
+                else:
+                    self._set(item_id, SAVE_STATUS[outcome], job_title=posting.get("job_title"),
+                              company=posting.get("company"))
+            self._count(batches=1)
+            with self._lock:
+                self.counts["largest_batch"] = max(self.counts["largest_batch"], len(saves))
+
+    # LIFECYCLE %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def start(self) -> "IngestServer":
+        """Bind the port and start the workers, the writer and the HTTP server thread"""
+        self.httpd = _HTTPServer((self.host, self.port), IngestHandler)
+        self.httpd.ingest = self
+        self.port = self.httpd.server_address[1]
+        self.started = time.monotonic()
+        parse_cache.route_writes(lambda statements: self.write_queue.put(("cache", None, statements)))
+        self._fetchers = [threading.Thread(target=self._fetch_worker, name=f"ingest-fetch-{i}", daemon=True)
+                          for i in range(self.workers)]
+        self._parsers = [threading.Thread(target=self._parse_worker, name=f"ingest-parse-{i}", daemon=True)
+                         for i in range(self.workers)]
+        self._writer = threading.Thread(target=self._write_worker, name="ingest-writer", daemon=True)
+        self._serving = threading.Thread(target=self.httpd.serve_forever, name="ingest-http", daemon=True)
+        for thread in self._fetchers + self._parsers + [self._writer, self._serving]:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop accepting requests, finish everything already queued, then stop the writer"""
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        for threads, stage in ((self._fetchers, self.fetch_queue), (self._parsers, self.parse_queue)):
+            for _ in threads:
+                stage.put(_DONE)
+            for thread in threads:
+                thread.join()
+        if self._writer is not None:
+            self.write_queue.put(_DONE)
+            self._writer.join()
+        parse_cache.route_writes(None)
+
+
+class IngestHandler(BaseHTTPRequestHandler):
+    """JSON API over an IngestServer (self.server.ingest)"""
+    server_version = "Parsio"
+
+    def log_message(self, format, *args):
+        pass                    # one line per request would drown the progress output
+
+    def _cors_headers(self):
+        """Let an allow-listed page read the response; other pages can still post blind (no-cors)"""
+        origin = self.headers.get("Origin")
+        if origin and origin in self.server.ingest.allowed_origins:
+            self.send_header("Access-Control-Allow-Origin", origin)
+        self.send_header("Vary", "Origin")
+
+    def _send(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self._cors_headers()
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        token = self.server.ingest.token
+        if not token:
+            return False
+        given = (self.headers.get("X-Parsio-Token")
+                 or self.headers.get("Authorization", "").replace("Bearer ", "", 1)
+                 or parse_qs(urlparse(self.path).query).get("token", [""])[0])
+        return hmac.compare_digest(given.encode("utf-8"), token.encode("utf-8"))
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization, X-Parsio-Token")
+        self.end_headers()
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._send(401, {"error": "missing or wrong token"})
+        path = urlparse(self.path).path.rstrip("/")
+        if path == "/status":
+            return self._send(200, self.server.ingest.status())
+        match = re.fullmatch(r"/postings/(\d+)", path)
+        if match:
+            entry = self.server.ingest.item_status(int(match.group(1)))
+            return self._send(200, entry) if entry else self._send(404, {"error": "unknown id"})
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return self._send(401, {"error": "missing or wrong token"})
+        if urlparse(self.path).path.rstrip("/") != "/postings":
+            return self._send(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            if not self.headers.get("Content-Length"):
+                return self._send(411, {"error": "Content-Length required"})
+            return self._send(400, {"error": "invalid Content-Length"})
+        if length < 0:
+            return self._send(400, {"error": "invalid Content-Length"})
+        if length > MAX_BODY_BYTES:
+            return self._send(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+        try:
+            items = parse_submission(self.rfile.read(length), self.headers.get("Content-Type", ""))
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+        ingest = self.server.ingest
+        ids = ingest.submit(items)
+        if ids is None:
+            return self._send(503, {"error": "queue full", "in_flight": ingest.in_flight,
+                                    "max_queue": ingest.max_queue}, {"Retry-After": "5"})
+        self._send(202, {"ids": ids, "in_flight": ingest.in_flight})
+
+
+def serve(host: str = "127.0.0.1", port: Optional[int] = None, workers: Optional[int] = None,
+          progress_interval: float = 5.0):
+    """Run the ingestion server until Ctrl+C, printing a status line whenever the counters change"""
+    if not parser_router.available():
+        print("Warning: no parser backend available; only structured-data pages and parsed postings will be saved.")
+    server = IngestServer(host, port, workers).start()
+    print(f"Parsio ingestion server on http://{server.host}:{server.port} "
+          f"({server.workers} workers, batches of up to {server.commit_size} rows). Ctrl+C to stop.")
+    print(f"Token (ingest_token setting): {server.token}")
+    last = None
+    try:
+        while True:
+            time.sleep(progress_interval)
+            status = server.status()
+            line = (f"received {status['received']}  in flight {status['in_flight']}  saved {status['saved']}  "
+                    f"duplicates {status['duplicates']}  failed {status['failed']}  rejected {status['rejected']}  "
+                    f"batches {status['batches']}")
+            if line != last:
+                print(line, flush=True)
+                last = line
+    except KeyboardInterrupt:
+        print(f"Stopping: finishing {server.in_flight} queued postings...")
+    server.stop()
+    print("Stopped.")
@@ -62,7 +62,7 @@ class Ui_ParsioApp(object):
 "    background-color: #f0f0f0;\n"
 "    color: black;\n"
 "}\n"
-"QTextEdit {\n"
+"QTextEdit, QLineEdit {\n"
 "    background-color: #D6D9E0;  /* light gray/blue */\n"
 "    color: black;\n"
 "    border: 1px solid #324A80;  /* medium dark blue border */\n"
@@ -109,6 +109,21 @@ class Ui_ParsioApp(object):
         self.btn_commit.setFont(font)
         self.btn_commit.setObjectName("btn_commit")
         self.right_panel.addWidget(self.btn_commit)
+        self.search_box = QtWidgets.QLineEdit(self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial,sans-serif")
+        font.setPointSize(-1)
+        self.search_box.setFont(font)
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setObjectName("search_box")
+        self.right_panel.addWidget(self.search_box)
+        self.btn_search = QtWidgets.QPushButton(self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial,sans-serif")
+        font.setPointSize(-1)
+        self.btn_search.setFont(font)
+        self.btn_search.setObjectName("btn_search")
+        self.right_panel.addWidget(self.btn_search)
         spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.right_panel.addItem(spacerItem)
         self.main_layout.addLayout(self.right_panel)
@@ -152,12 +167,24 @@ class Ui_ParsioApp(object):
         self.actionRefresh.setObjectName("actionRefresh")
         self.actionFull_Screen = QtWidgets.QAction(ParsioApp)
         self.actionFull_Screen.setObjectName("actionFull_Screen")
+        self.actionBrowse_Postings = QtWidgets.QAction(ParsioApp)
+        self.actionBrowse_Postings.setCheckable(True)
+        self.actionBrowse_Postings.setObjectName("actionBrowse_Postings")
+        self.actionPerformance_Panel = QtWidgets.QAction(ParsioApp)
+        self.actionPerformance_Panel.setCheckable(True)
+        self.actionPerformance_Panel.setObjectName("actionPerformance_Panel")
+        self.actionWatch_Clipboard = QtWidgets.QAction(ParsioApp)
+        self.actionWatch_Clipboard.setCheckable(True)
+        self.actionWatch_Clipboard.setObjectName("actionWatch_Clipboard")
         self.actionSettings = QtWidgets.QAction(ParsioApp)
         self.actionSettings.setObjectName("actionSettings")
         self.actionExport_Data = QtWidgets.QAction(ParsioApp)
         self.actionExport_Data.setObjectName("actionExport_Data")
         self.actionImport_Data = QtWidgets.QAction(ParsioApp)
         self.actionImport_Data.setObjectName("actionImport_Data")
+        self.actionReparse_Stale = QtWidgets.QAction(ParsioApp)
+        self.actionReparse_Stale.setCheckable(True)
+        self.actionReparse_Stale.setObjectName("actionReparse_Stale")
         self.actionAbout = QtWidgets.QAction(ParsioApp)
         self.actionAbout.setObjectName("actionAbout")
         self.actionUser_Guide = QtWidgets.QAction(ParsioApp)
@@ -176,9 +203,16 @@ class Ui_ParsioApp(object):
         self.menuView.addAction(self.actionRefresh)
         self.menuView.addSeparator()
         self.menuView.addAction(self.actionFull_Screen)
+        self.menuView.addSeparator()
+        self.menuView.addAction(self.actionBrowse_Postings)
+        self.menuView.addAction(self.actionPerformance_Panel)
+        self.menuTools.addAction(self.actionWatch_Clipboard)
+        self.menuTools.addSeparator()
         self.menuTools.addAction(self.actionSettings)
         self.menuTools.addAction(self.actionExport_Data)
         self.menuTools.addAction(self.actionImport_Data)
+        self.menuTools.addSeparator()
+        self.menuTools.addAction(self.actionReparse_Stale)
         self.menuHelp.addAction(self.actionAbout)
         self.menuHelp.addAction(self.actionUser_Guide)
         self.menubar.addAction(self.menuFile.menuAction())
@@ -195,6 +229,8 @@ class Ui_ParsioApp(object):
         ParsioApp.setWindowTitle(_translate("ParsioApp", "Parsio - AI Job Application Tracker"))
         self.btn_paste.setText(_translate("ParsioApp", "Click Here To Paste"))
         self.btn_commit.setText(_translate("ParsioApp", "Commit Changes"))
+        self.search_box.setPlaceholderText(_translate("ParsioApp", "Search saved jobs..."))
+        self.btn_search.setText(_translate("ParsioApp", "Search"))
         self.menuFile.setTitle(_translate("ParsioApp", "File"))
         self.menuEdit.setTitle(_translate("ParsioApp", "Edit"))
         self.menuView.setTitle(_translate("ParsioApp", "View"))
@@ -222,10 +258,17 @@ class Ui_ParsioApp(object):
         self.actionRefresh.setShortcut(_translate("ParsioApp", "F5"))
         self.actionFull_Screen.setText(_translate("ParsioApp", "Full Screen"))
         self.actionFull_Screen.setShortcut(_translate("ParsioApp", "F11"))
+        self.actionBrowse_Postings.setText(_translate("ParsioApp", "Saved Postings"))
+        self.actionBrowse_Postings.setShortcut(_translate("ParsioApp", "Ctrl+B"))
+        self.actionPerformance_Panel.setText(_translate("ParsioApp", "Performance Panel"))
+        self.actionPerformance_Panel.setShortcut(_translate("ParsioApp", "Ctrl+Shift+P"))
+        self.actionWatch_Clipboard.setText(_translate("ParsioApp", "Watch Clipboard"))
+        self.actionWatch_Clipboard.setShortcut(_translate("ParsioApp", "Ctrl+Shift+W"))
         self.actionSettings.setText(_translate("ParsioApp", "Settings"))
         self.actionSettings.setShortcut(_translate("ParsioApp", "Ctrl+,"))
         self.actionExport_Data.setText(_translate("ParsioApp", "Export Data"))
         self.actionImport_Data.setText(_translate("ParsioApp", "Import Data"))
+        self.actionReparse_Stale.setText(_translate("ParsioApp", "Re-parse Stale Postings"))
         self.actionAbout.setText(_translate("ParsioApp", "About"))
         self.actionAbout.setShortcut(_translate("ParsioApp", "F1"))
         self.actionUser_Guide.setText(_translate("ParsioApp", "User Guide"))
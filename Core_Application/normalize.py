@@ -0,0 +1,224 @@
+"""
+Normalization of the free-text salary and location fields into columns that
+can be indexed and range-filtered: salary min/max/currency/period and
+location city/region/country/remote. Unknown parts come back as None.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# SALARY %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+CURRENCY_CODES = {"USD", "CAD", "AUD", "NZD", "GBP", "EUR", "CHF", "SEK", "NOK", "DKK", "PLN",
+                  "INR", "JPY", "CNY", "SGD", "HKD", "MXN", "BRL", "ZAR"}
+# longest first, so "CA$" is not read as "$"; a bare "$" depends on the country (DOLLAR_CURRENCIES)
+CURRENCY_SYMBOLS = [("CA$", "CAD"), ("C$", "CAD"), ("AU$", "AUD"), ("A$", "AUD"), ("NZ$", "NZD"),
+                    ("US$", "USD"), ("$", None), ("£", "GBP"), ("€", "EUR"), ("₹", "INR"), ("¥", "JPY")]
+DOLLAR_CURRENCIES = {"US": "USD", "CA": "CAD", "AU": "AUD", "NZ": "NZD", "SG": "SGD", "HK": "HKD",
+                     "MX": "MXN"}
+CURRENCY_CODE_PATTERN = re.compile(r"\b(" + "|".join(sorted(CURRENCY_CODES)) + r")\b", re.IGNORECASE)
+
+PERIOD_PATTERNS = [
+    ("hour", re.compile(r"\b(hour|hourly|hr|hrs)\b|/\s*h\b", re.IGNORECASE)),
+    ("day", re.compile(r"\b(day|daily|diem)\b", re.IGNORECASE)),
+    ("week", re.compile(r"\b(week|weekly|wk)\b", re.IGNORECASE)),
+    ("month", re.compile(r"\b(month|monthly|mo|mth)\b", re.IGNORECASE)),
+    ("year", re.compile(r"\b(year|yearly|yr|annum|annual|annually|p\.?a\.?)\b", re.IGNORECASE)),
+]
+PERIOD_ALIASES = {"hourly": "hour", "daily": "day", "weekly": "week", "monthly": "month",
+                  "yearly": "year", "annual": "year", "annually": "year", "annum": "year"}
+
+# 120,000 / 60.000 / 1 200 000 (thousands separators, optionally with cents: 120,000.00 / 120.000,00),
+# then plain 58 / 58.50, with an optional k / m suffix
+GROUPED_AMOUNT = r"(\d{1,3}(?:[,.  ]\d{3})+)(?:[.,](\d{2}))?"
+AMOUNT_PATTERN = re.compile(r"(\d{1,3}(?:[,.  ]\d{3})+(?:[.,]\d{2})?(?![.,]?\d)|\d+(?:[.,]\d{1,2})?)\s*([km])?\b",
+                            re.IGNORECASE)
+# numbers that are not pay: 401(k) plans, "20 days PTO", "12-hour shifts", "3+ years", "10% bonus"
+NOT_PAY_PATTERN = re.compile(r"\b401\s*\(?k\)?|\d+\+?[\s-]*(hours?|days?|weeks?|months?|years?|%|percent)\b",
+                             re.IGNORECASE)
+
+
+def _amount(number: str, suffix: Optional[str]) -> float:
+    grouped = re.fullmatch(GROUPED_AMOUNT, number)
+    if grouped:
+        value = float(re.sub(r"\D", "", grouped.group(1))) + int(grouped.group(2) or 0) / 100
+    else:
+        value = float(number.replace(",", "."))
+    if suffix:
+        value *= 1_000 if suffix.lower() == "k" else 1_000_000
+    return value
+
+
+def normalize_currency(text: str, country: Optional[str] = None) -> Optional[str]:
+    """
+    ISO code for a currency code or symbol found in text. A bare "$" is the
+    dollar of country (USD for a country without one), and None when the
+    country is unknown.
+    """
+    match = CURRENCY_CODE_PATTERN.search(text or "")
+    if match:
+        return match.group(1).upper()
+    for symbol, code in CURRENCY_SYMBOLS:
+        if symbol in (text or ""):
+            if code is None and country:
+                return DOLLAR_CURRENCIES.get(country, "USD")
+            return code
+    return None
+
+
+def normalize_period(text: str) -> Optional[str]:
+    """hour, day, week, month or year"""
+    text = (text or "").strip().lower()
+    if text in PERIOD_ALIASES:
+        return PERIOD_ALIASES[text]
+    for period, pattern in PERIOD_PATTERNS:
+        if pattern.search(text):
+            return period
+    return None
+
+
+def parse_salary(text: str, country: Optional[str] = None) -> Dict:
+    """
+    salary_min, salary_max, salary_currency and salary_period parsed from a
+    salary string. A single figure ("$100k", "100k+", "up to $150k") is both
+    the min and the max, so range filters stay single index ranges. country
+    (ISO code, from the location) decides which dollar a bare "$" is.
+    """
+    result = {"salary_min": None, "salary_max": None, "salary_currency": None, "salary_period": None}
+    text = NOT_PAY_PATTERN.sub(" ", (text or "").strip())
+    matches = list(AMOUNT_PATTERN.finditer(text))[:2]
+    if not matches:
+        return result
+    amounts = [_amount(m.group(1), m.group(2)) for m in matches]
+    # "100-120k": the suffix on the upper bound applies to the lower one too
+    if len(matches) == 2 and matches[1].group(2) and not matches[0].group(2) and amounts[0] < 1000:
+        amounts[0] = _amount(matches[0].group(1), matches[1].group(2))
+
+    result["salary_min"], result["salary_max"] = min(amounts), max(amounts)
+
+    result["salary_currency"] = normalize_currency(text, country)
+    period = normalize_period(text)
+    if period is None:
+        top = max(amounts)
+        period = "hour" if top < 500 else "year" if top >= 10_000 else None
+    result["salary_period"] = period
+    return result
+
+
+# LOCATION %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+US_STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC", "florida": "FL",
+    "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA",
+    "kansas": "KS", "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS", "missouri": "MO",
+    "montana": "MT", "nebraska": "NE", "nevada": "NV", "new hampshire": "NH", "new jersey": "NJ",
+    "new mexico": "NM", "new york": "NY", "north carolina": "NC", "north dakota": "ND", "ohio": "OH",
+    "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT",
+    "virginia": "VA", "washington": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+CA_PROVINCES = {
+    "alberta": "AB", "british columbia": "BC", "manitoba": "MB", "new brunswick": "NB",
+    "newfoundland and labrador": "NL", "nova scotia": "NS", "northwest territories": "NT", "nunavut": "NU",
+    "ontario": "ON", "prince edward island": "PE", "quebec": "QC", "québec": "QC", "saskatchewan": "SK",
+    "yukon": "YT",
+}
+REGION_COUNTRY = dict([(code, "US") for code in US_STATES.values()] + [(code, "CA") for code in CA_PROVINCES.values()])
+
+COUNTRIES = {
+    "united states": "US", "united states of america": "US", "usa": "US", "us": "US", "u.s.": "US",
+    "u.s.a.": "US", "america": "US", "canada": "CA", "united kingdom": "GB", "uk": "GB", "u.k.": "GB",
+    "great britain": "GB", "england": "GB", "scotland": "GB", "wales": "GB", "ireland": "IE",
+    "germany": "DE", "deutschland": "DE", "france": "FR", "spain": "ES", "portugal": "PT", "italy": "IT",
+    "netherlands": "NL", "the netherlands": "NL", "belgium": "BE", "switzerland": "CH", "austria": "AT",
+    "sweden": "SE", "norway": "NO", "denmark": "DK", "finland": "FI", "poland": "PL", "czechia": "CZ",
+    "czech republic": "CZ", "australia": "AU", "new zealand": "NZ", "india": "IN", "japan": "JP",
+    "china": "CN", "singapore": "SG", "hong kong": "HK", "mexico": "MX", "brazil": "BR",
+    "argentina": "AR", "south africa": "ZA", "israel": "IL", "united arab emirates": "AE", "uae": "AE",
+}
+COUNTRY_CODES = set(COUNTRIES.values())
+
+REMOTE_PATTERN = re.compile(r"\b(fully remote|remote|work from home|wfh|telecommute|anywhere)\b", re.IGNORECASE)
+# "Remote in Canada", "based in Berlin" - left over once the work mode is removed
+LEADING_WORDS_PATTERN = re.compile(r"^(?:(?:based|located|anywhere)\s+)?(?:in|from|within|across)\s+",
+                                   re.IGNORECASE)
+WORK_MODE_PATTERN = re.compile(r"\b(fully remote|remote|work from home|wfh|telecommute|anywhere|hybrid|"
+                               r"on-?site|in[- ]office|in[- ]person|only|first|friendly)\b", re.IGNORECASE)
+
+
+def normalize_country(text: str) -> Optional[str]:
+    """ISO 3166 alpha-2 code for a country name, alias or code"""
+    text = (text or "").strip().lower()
+    text = re.sub(r"^the\s+", "", text)
+    code = COUNTRIES.get(text) or COUNTRIES.get(text.rstrip("."))
+    if code:
+        return code
+    return text.upper() if text.upper() in COUNTRY_CODES else None
+
+
+def normalize_region(text: str) -> Optional[str]:
+    """Two-letter code for a US state or Canadian province, else the text as given"""
+    text = (text or "").strip()
+    key = text.lower().rstrip(".")
+    if key in US_STATES:
+        return US_STATES[key]
+    if key in CA_PROVINCES:
+        return CA_PROVINCES[key]
+    return key.upper() if key.upper() in REGION_COUNTRY else (text or None)
+
+
+def _known_region(text: str) -> Optional[str]:
+    region = normalize_region(text)
+    return region if region in REGION_COUNTRY else None
+
+
+def _parse_place(place: str) -> Dict:
+    parts = [part.strip(" -") for part in place.split(",")]
+    parts = [part for part in parts if part]
+    result = {"city": None, "region": None, "country": None}
+    if not parts:
+        return result
+    # a trailing two-letter code after city, region is a country ("Toronto, ON, CA"); otherwise
+    # state / province codes win ("Sacramento, CA")
+    if len(parts) >= 3 or not _known_region(parts[-1]):
+        country = normalize_country(parts[-1])
+        if country:
+            result["country"] = country
+            parts.pop()
+    if parts and _known_region(parts[-1]):
+        result["region"] = _known_region(parts.pop())
+        result["country"] = result["country"] or REGION_COUNTRY[result["region"]]
+    if len(parts) >= 2 and not result["region"]:
+        result["region"] = parts.pop()
+    if parts:
+        result["city"] = parts[0]
+    return result
+
+
+def parse_location(text: str) -> Dict:
+    """city, region, country (ISO code) and remote (1/0) parsed from a location string"""
+    result = {"city": None, "region": None, "country": None, "remote": None}
+    text = (text or "").strip()
+    if not text:
+        return result
+    result["remote"] = 1 if REMOTE_PATTERN.search(text) else 0
+    # "Remote (United States); Toronto, ON" - the first place that is more than a work mode
+    candidates: List[str] = []
+    for segment in re.split(r"[;|/\n]| or ", text):
+        candidates += re.findall(r"\(([^)]*)\)", segment)
+        candidates.append(re.sub(r"\([^)]*\)", " ", segment))
+    for candidate in candidates:
+        place = " ".join(WORK_MODE_PATTERN.sub(" ", candidate).split()).strip(" ,-:")
+        place = LEADING_WORDS_PATTERN.sub("", place).strip(" ,-:")
+        if place:
+            result.update(_parse_place(place))
+            break
+    return result
+
+
+def normalize_fields(salary: str, location: str) -> Dict:
+    """All normalized columns for one posting"""
+    place = parse_location(location)
+    return dict(parse_salary(salary, place["country"]), **place)
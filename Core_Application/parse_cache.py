@@ -0,0 +1,149 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from database_context import db
+from utils import LazyObject
+
+
+class ParseCache:
+    """Persistent LRU cache of parsed postings, stored next to job_postings in SQLite"""
+    TABLE_NAME = "parse_cache"
+
+    def __init__(self, database, ttl_hours: float = 720, max_entries: int = 5000):
+        self.db = database
+        self.ttl_seconds = float(ttl_hours) * 3600
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+        self._route: Optional[Callable[[Callable], None]] = None
+
+    @staticmethod
+    def make_key(text: str, model_name: str, prompt_version) -> str:
+        """Hash of the normalized posting text, model and prompt version"""
+        normalized = re.sub(r"\s+", " ", text or "").strip().casefold()
+        digest = hashlib.sha256()
+        digest.update(f"{model_name}\x00{prompt_version}\x00".encode("utf-8"))
+        digest.update(normalized.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _ensure_table(self):
+        if self._ready:
+            return
+        with self.db.transaction() as conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                    cache_key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    model TEXT,
+                    prompt_version TEXT,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute(f'''
+                CREATE INDEX IF NOT EXISTS idx_{self.TABLE_NAME}_last_access
+                ON {self.TABLE_NAME} (last_access)
+            ''')
+        self._ready = True
+
+    def route_writes(self, route: Optional[Callable[[Callable], None]]):
+        """
+        Hand every later write, as a function of a connection, to route instead
+        of running it on the calling thread (None writes in place again).
+        """
+        self._ensure_table()
+        self._route = route
+
+    def _write(self, statements: Callable):
+        if self._route is not None:
+            self._route(statements)
+            return
+        with self.db.transaction() as conn:
+            statements(conn)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None on a miss/expired entry"""
+        now = time.time()
+        try:
+            self._ensure_table()
+            row = self.db.connection().execute(
+                f'SELECT result, created_at FROM {self.TABLE_NAME} WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                self._write(lambda conn: conn.execute(
+                    f'UPDATE {self.TABLE_NAME} SET last_access = ? WHERE cache_key = ?', (now, key)
+                ))
+                self._count(hit=True)
+                return json.loads(row[0])
+            if row:
+                self._write(lambda conn: conn.execute(f'DELETE FROM {self.TABLE_NAME} WHERE cache_key = ?', (key,)))
+        except Exception as e:
+            print(f"Parse cache read error: {e}")
+        self._count(hit=False)
+        return None
+
+    def put(self, key: str, result: Dict, model_name: str = "", prompt_version="") -> None:
+        """Store a parsed result and evict expired / least recently used entries"""
+        now = time.time()
+
+        def store(conn):
+            conn.execute(f'''
+                INSERT OR REPLACE INTO {self.TABLE_NAME}
+                    (cache_key, result, model, prompt_version, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (key, json.dumps(result), model_name, str(prompt_version), now, now))
+            conn.execute(
+                f'DELETE FROM {self.TABLE_NAME} WHERE created_at < ?', (now - self.ttl_seconds,)
+            )
+            conn.execute(f'''
+                DELETE FROM {self.TABLE_NAME} WHERE cache_key IN (
+                    SELECT cache_key FROM {self.TABLE_NAME}
+                    ORDER BY last_access DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+
+        try:
+            self._ensure_table()
+            self._write(store)
+        except Exception as e:
+            print(f"Parse cache write error: {e}")
+
+    def clear(self) -> None:
+        try:
+            self._ensure_table()
+            with self.db.transaction() as conn:
+                conn.execute(f'DELETE FROM {self.TABLE_NAME}')
+        except Exception as e:
+            print(f"Parse cache clear error: {e}")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this session"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+# Global parse cache instance
+parse_cache = LazyObject(lambda: ParseCache(
+    db,
+    ttl_hours=db.get_setting("parse_cache_ttl_hours"),
+    max_entries=db.get_setting("parse_cache_max_entries"),
+))
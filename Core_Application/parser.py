@@ -1,19 +1,112 @@
 import json
-import google.generativeai as genai
 import os
+import threading
+from typing import Callable, Dict, List, Optional
 
-from utils import extract_json  
+from utils import JsonStreamParser, LazyObject, extract_json, extract_json_array, estimate_tokens, save_error
+from parse_cache import parse_cache
+from extraction import reduce_text
+from database_context import db
+from rate_limit import ClientGovernor
+from telemetry import span
 
-def parse_with_gemini(text, api_key: str):
-    """Parses info into json"""
-    if not api_key:
-        raise ValueError("Gemini API key is required")
-    
-    # Configure Gemini with the provided API key
+MODEL_NAME = "gemini-1.5-flash"
+PROMPT_VERSION = 1      # bump when the prompt changes so cached results are not reused
+BATCH_TOKEN_BUDGET = 24000
+REQUIRED_FIELDS = ["job_title", "company", "location", "salary"]
+EXPECTED_OUTPUT_TOKENS = 100        # per posting, counted against the tokens/minute budget
+
+# shared by every worker thread so the whole app stays inside the API quota
+gemini_governor = LazyObject(lambda: ClientGovernor(
+    requests_per_minute=db.get_setting("gemini_requests_per_minute"),
+    tokens_per_minute=db.get_setting("gemini_tokens_per_minute"),
+    max_concurrent=db.get_setting("gemini_max_concurrent"),
+    max_retries=db.get_setting("gemini_max_retries"),
+    failure_threshold=db.get_setting("gemini_breaker_threshold"),
+    reset_timeout=db.get_setting("gemini_breaker_reset_seconds"),
+))
+
+
+GENERATION_CONFIG = {"response_mime_type": "application/json", "temperature": 0}
+
+
+def _create_gemini_model(api_key: str):
+    """Default model factory: a GenerativeModel bound to api_key"""
+    # the SDK takes most of a second to import, so it is loaded on first use (or by the warm-up)
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
     genai.configure(api_key=api_key)
-    
-    # TODO: error handling
-    prompt = (
+    model = genai.GenerativeModel(MODEL_NAME, generation_config=GENERATION_CONFIG)
+    # bind the client now; otherwise it is picked up from the global config on first request
+    model._client = genai_client.get_default_generative_client()
+    return model
+
+
+class ModelPool:
+    """One configured model per API key, created on first use and reused across calls"""
+    def __init__(self, factory: Callable = _create_gemini_model):
+        self.factory = factory
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_key: str):
+        with self._lock:
+            model = self._models.get(api_key)
+            if model is None:
+                model = self._models[api_key] = self.factory(api_key)
+            return model
+
+    def set_factory(self, factory: Callable):
+        """Swap the model factory (e.g. for a local stub) and drop cached models"""
+        with self._lock:
+            self.factory = factory
+            self._models.clear()
+
+
+model_pool = ModelPool()
+
+
+def _chunk_text(chunk) -> str:
+    try:
+        return chunk.text
+    except (AttributeError, IndexError, ValueError):
+        return ""       # chunks without text parts (e.g. safety metadata only)
+
+
+def _call_gemini(prompt: str, api_key: str) -> str:
+    """One raw streamed Gemini request, without rate limiting or retries"""
+    model = model_pool.get(api_key)
+    json_stream = JsonStreamParser()
+    received = []
+    for chunk in model.generate_content(prompt, stream=True):
+        text = _chunk_text(chunk)
+        received.append(text)
+        # stop reading as soon as the JSON value is complete
+        result = json_stream.feed(text)
+        if result is not None:
+            return result
+    return "".join(received).strip()
+
+
+def _generate(prompt: str, api_key: str, expected_items: int = 1) -> str:
+    """Send a prompt to Gemini through the shared rate limiter and return the raw text output"""
+    tokens = estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS * expected_items
+    with span("gemini", tokens=tokens, items=expected_items) as gemini_span:
+        raw_output = gemini_governor.call(lambda: _call_gemini(prompt, api_key), estimated_tokens=tokens)
+        gemini_span.set(bytes=len(raw_output))
+    return raw_output
+
+
+def _fill_required_fields(parsed_data: Dict) -> Dict:
+    for field in REQUIRED_FIELDS:
+        if field not in parsed_data:
+            parsed_data[field] = ""
+    return parsed_data
+
+
+def build_prompt(text: str) -> str:
+    """Single-posting extraction prompt (shared with the other LLM backends)"""
+    return (
             "Extract the following fields from the job posting text below: "
             "job_title, company, location, salary. "
             "ALWAYS return a valid JSON object with these exact keys: "
@@ -21,18 +114,152 @@ def parse_with_gemini(text, api_key: str):
             "Do not include any text outside of the JSON object.\n\n"
             f"Job Posting:\n{text}\n\n"
         )
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    response = model.generate_content(prompt)
 
-    raw_output = response.candidates[0].content.parts[0].text.strip()
 
-    json_text = extract_json(raw_output)
-    parsed_data = json.loads(json_text)
-    required_fields = ["job_title", "company", "location", "salary"]
-    
-    for field in required_fields:
-        if field not in parsed_data:
-            parsed_data[field] = ""
+def parse_with_gemini(text, api_key: str, use_cache: bool = True):
+    """Parses info into json"""
+    if not api_key:
+        raise ValueError("Gemini API key is required")
+
+    cache_key = parse_cache.make_key(text, MODEL_NAME, PROMPT_VERSION)
+    if use_cache:
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            cached["parse_source"] = "cache"
+            cached["posting_text"] = text
+            return cached
+
+    original_text = text
+    text = reduce_text(text, db.get_setting("prompt_token_budget"))
+
+    raw_output = _generate(build_prompt(text), api_key)
 
+    with span("extract_json", bytes=len(raw_output)):
+        parsed_data = _fill_required_fields(json.loads(extract_json(raw_output)))
+    parsed_data["parse_source"] = "gemini"
 
+    if use_cache:
+        parse_cache.put(cache_key, parsed_data, MODEL_NAME, PROMPT_VERSION)
+
+    # kept with the row for full-text search, but not stored in the cache
+    return dict(parsed_data, posting_text=original_text)
+
+
+def tag_version(parsed_data: Dict, model: str) -> Dict:
+    """Record which prompt version and parser model produced a result, so stale rows can be re-parsed"""
+    parsed_data.setdefault("prompt_version", str(PROMPT_VERSION))
+    parsed_data.setdefault("parser_model", model)
     return parsed_data
+
+
+def pack_batches(texts: List[str], token_budget: int = BATCH_TOKEN_BUDGET) -> List[List[int]]:
+    """Group text indexes into batches whose estimated prompt size fits the token budget"""
+    batches, current, used = [], [], 0
+    for index, text in enumerate(texts):
+        cost = estimate_tokens(text) + 20      # per-item framing overhead
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_response(raw_output: str, count: int) -> Dict[int, Dict]:
+    """Map a JSON array response back to item indexes, ignoring malformed entries"""
+    results = {}
+    try:
+        with span("extract_json", bytes=len(raw_output), items=count):
+            items = json.loads(extract_json_array(raw_output))
+    except Exception as e:
+        save_error(f"Batch response was not a JSON array: {e}")
+        return results
+    if not isinstance(items, list):
+        return results
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.pop("index"))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < count and index not in results:
+            results[index] = _fill_required_fields(item)
+            results[index]["parse_source"] = "gemini-batch"
+    return results
+
+
+def parse_with_gemini_batch(texts: List[str], api_key: str, token_budget: int = BATCH_TOKEN_BUDGET,
+                            use_cache: bool = True) -> List[Optional[Dict]]:
+    """Parses several postings per Gemini request; returns results in input order (None on failure)"""
+    if not api_key:
+        raise ValueError("Gemini API key is required")
+
+    results: List[Optional[Dict]] = [None] * len(texts)
+    cache_keys = [parse_cache.make_key(text, MODEL_NAME, PROMPT_VERSION) for text in texts]
+
+    todo = []
+    for index, text in enumerate(texts):
+        cached = parse_cache.get(cache_keys[index]) if use_cache else None
+        if cached is not None:
+            cached["parse_source"] = "cache"
+            results[index] = cached
+        else:
+            todo.append(index)
+
+    token_limit = db.get_setting("prompt_token_budget")
+    reduced = {index: reduce_text(texts[index], token_limit) for index in todo}
+
+    retry = []
+    for batch in pack_batches([reduced[i] for i in todo], token_budget):
+        batch_indexes = [todo[i] for i in batch]
+        if len(batch_indexes) == 1:
+            retry.extend(batch_indexes)
+            continue
+
+        postings = "\n\n".join(
+            f"### Posting {position}\n{reduced[index]}" for position, index in enumerate(batch_indexes)
+        )
+        prompt = (
+                f"Below are {len(batch_indexes)} job postings, each starting with '### Posting N'. "
+                "For EACH posting extract the fields job_title, company, location, salary. "
+                "ALWAYS return a valid JSON array with one object per posting using these exact keys: "
+                '[{"index": 0, "job_title": "", "company": "", "location": "", "salary": ""}], '
+                "where index is the posting number N. "
+                "Do not include any text outside of the JSON array.\n\n"
+                f"{postings}\n\n"
+            )
+        try:
+            parsed = _parse_batch_response(
+                _generate(prompt, api_key, len(batch_indexes)), len(batch_indexes)
+            )
+        except Exception as e:
+            save_error(f"Batch parse failed for {len(batch_indexes)} postings: {e}")
+            parsed = {}
+
+        for position, index in enumerate(batch_indexes):
+            if position in parsed:
+                results[index] = parsed[position]
+                if use_cache:
+                    parse_cache.put(cache_keys[index], parsed[position], MODEL_NAME, PROMPT_VERSION)
+            else:
+                retry.append(index)
+
+    # re-run only the items that failed or were missing from a batch response
+    for index in retry:
+        try:
+            parsed_data = parse_with_gemini(texts[index], api_key, use_cache=False)
+            parsed_data.pop("posting_text", None)
+            results[index] = parsed_data
+            if use_cache:
+                parse_cache.put(cache_keys[index], parsed_data, MODEL_NAME, PROMPT_VERSION)
+        except Exception as e:
+            save_error(f"Parse failed for posting {index}: {e}")
+
+    # kept with the row for full-text search, but not stored in the cache
+    for index, text in enumerate(texts):
+        if results[index] is not None:
+            results[index] = dict(results[index], posting_text=text)
+    return results
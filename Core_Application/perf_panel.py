@@ -0,0 +1,65 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QDockWidget, QTableWidget, QTableWidgetItem, QHeaderView
+from telemetry import telemetry
+
+COLUMNS = ["Stage", "Count", "Errors", "p50 ms", "p95 ms", "Bytes", "Tokens"]
+
+# pipeline order first, anything else (e.g. per-backend stages) after
+STAGE_ORDER = ["paste", "fetch", "extract", "parse", "gemini", "extract_json", "save"]
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class PerfPanel(QDockWidget):
+    """Dockable table of rolling p50/p95 latency, bytes and tokens per pipeline stage"""
+    REFRESH_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__("Performance", parent)
+        self.setObjectName("perfPanel")
+        self.table = QTableWidget(0, len(COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.setWidget(self.table)
+
+        # only poll while the panel is on screen
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self._on_visibility_changed)
+
+    def _on_visibility_changed(self, visible: bool):
+        if visible:
+            self.refresh()
+            self.timer.start(self.REFRESH_MS)
+        else:
+            self.timer.stop()
+
+    def refresh(self):
+        summary = telemetry.summary()
+        stages = sorted(summary, key=lambda s: (STAGE_ORDER.index(s) if s in STAGE_ORDER else len(STAGE_ORDER), s))
+        self.table.setRowCount(len(stages))
+        for row, stage in enumerate(stages):
+            stats = summary[stage]
+            values = [
+                stage,
+                f"{stats['count']:,}",
+                f"{stats['errors']:,}",
+                f"{stats['p50_ms']:.1f}",
+                f"{stats['p95_ms']:.1f}",
+                _format_bytes(stats["bytes"]) if stats["bytes"] else "",
+                f"{stats['tokens']:,}" if stats["tokens"] else "",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
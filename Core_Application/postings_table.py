@@ -0,0 +1,250 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QDockWidget, QHeaderView, QLabel, QLineEdit, QTableView,
+                             QVBoxLayout, QWidget)
+from database_context import BROWSE_COLUMNS, EDITABLE_COLUMNS, REQUIRED_COLUMNS, db
+
+HEADERS = {
+    "id": "ID",
+    "job_title": "Job Title",
+    "company": "Company",
+    "location": "Location",
+    "salary": "Salary",
+    "created_at": "Added",
+}
+
+
+class PostingsTableModel(QAbstractTableModel):
+    """Saved postings, read from SQLite a page at a time as the view scrolls
+
+    Pages are fetched with keyset pagination (canFetchMore / fetchMore) and only
+    the MAX_CACHED_PAGES most recently used ones stay in memory; a page scrolled
+    back to is read again from its start key. Sorting and filtering run in SQL.
+    Edits are buffered and written back together EDIT_FLUSH_MS after the last one.
+    """
+    edits_saved = pyqtSignal(int)        # postings updated
+    edits_failed = pyqtSignal(str)       # error message
+
+    PAGE_SIZE = 200
+    MAX_CACHED_PAGES = 25
+    EDIT_FLUSH_MS = 1500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self.filters: Dict = {}
+        self.sort_column = "created_at"
+        self.descending = True
+        self.total = 0
+        self._active = False                 # no queries until the view is first shown
+        self._pages: "OrderedDict[int, List[list]]" = OrderedDict()
+        self._page_keys: List[Optional[tuple]] = [None]   # (sort value, id) each page starts after
+        self._loaded = 0                     # rows handed to the view so far
+        self._exhausted = True
+        self._edits: Dict[int, Dict[str, str]] = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush_edits)
+
+    # PAGING %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def activate(self):
+        if not self._active:
+            self._active = True
+            self.refresh()
+
+    def refresh(self):
+        """Drop every cached page and start again from the first one (after saving pending edits)"""
+        self.flush_edits()
+        self.beginResetModel()
+        self._pages.clear()
+        self._page_keys = [None]
+        self._loaded = 0
+        self._exhausted = not self._active
+        if self._active:
+            try:
+                self.total = db.count_postings(self.query, self.filters)
+            except Exception as e:
+                print(f"Postings count error: {e}")
+                self.total = 0
+        self.endResetModel()
+
+    def _key(self, row: list) -> tuple:
+        return row[BROWSE_COLUMNS.index(self.sort_column)], row[0]
+
+    def _load_page(self, page: int) -> List[list]:
+        rows = [list(row) for row in db.browse_page(
+            self.query, self.filters, self.sort_column, self.descending,
+            after=self._page_keys[page], limit=self.PAGE_SIZE,
+        )]
+        for row in rows:
+            for column, value in self._edits.get(row[0], {}).items():
+                row[BROWSE_COLUMNS.index(column)] = value
+        self._pages[page] = rows
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return rows
+
+    def _row(self, row: int) -> Optional[list]:
+        page = row // self.PAGE_SIZE
+        rows = self._pages.get(page)
+        if rows is None:
+            try:
+                rows = self._load_page(page)
+            except Exception as e:
+                print(f"Postings page error: {e}")
+                return None
+        else:
+            self._pages.move_to_end(page)
+        offset = row % self.PAGE_SIZE
+        return rows[offset] if offset < len(rows) else None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        try:
+            rows = self._load_page(len(self._page_keys) - 1)
+        except Exception as e:
+            print(f"Postings page error: {e}")
+            rows = []
+        if len(rows) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not rows:
+            return
+        self._page_keys.append(self._key(rows[-1]))
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + len(rows) - 1)
+        self._loaded += len(rows)
+        self.endInsertRows()
+
+    # MODEL %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(BROWSE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[BROWSE_COLUMNS[section]]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        row = self._row(index.row())
+        if row is None:
+            return None
+        value = row[index.column()]
+        return "" if value is None else value
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and BROWSE_COLUMNS[index.column()] in EDITABLE_COLUMNS:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        column = BROWSE_COLUMNS[index.column()] if index.isValid() else None
+        if role != Qt.EditRole or column not in EDITABLE_COLUMNS:
+            return False
+        value = str(value).strip()
+        row = self._row(index.row())
+        if row is None or (column in REQUIRED_COLUMNS and not value):
+            return False
+        if row[index.column()] == value:
+            return True
+        row[index.column()] = value
+        self._edits.setdefault(row[0], {})[column] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        self._flush_timer.start(self.EDIT_FLUSH_MS)
+        return True
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self.sort_column = BROWSE_COLUMNS[column]
+        self.descending = order == Qt.DescendingOrder
+        self.refresh()
+
+    def set_filter(self, query: str, filters: Optional[Dict] = None):
+        self.query = query
+        self.filters = filters or {}
+        self.refresh()
+
+    def pending_edits(self) -> int:
+        return len(self._edits)
+
+    def flush_edits(self):
+        """Write buffered edits back in one transaction"""
+        self._flush_timer.stop()
+        if not self._edits:
+            return
+        edits, self._edits = self._edits, {}
+        try:
+            self.edits_saved.emit(db.update_postings(edits))
+        except Exception as e:
+            # keep them (newer edits win) so the next flush retries
+            for posting_id, fields in edits.items():
+                self._edits[posting_id] = dict(fields, **self._edits.get(posting_id, {}))
+            self.edits_failed.emit(f"Could not save edits: {e}")
+
+
+class PostingsBrowser(QDockWidget):
+    """Dockable, sortable and filterable table of saved postings with inline editing"""
+    FILTER_DELAY_MS = 300
+
+    def __init__(self, parent=None):
+        super().__init__("Saved Postings", parent)
+        self.setObjectName("postingsBrowser")
+        self.model = PostingsTableModel(self)
+
+        self.filter_box = QLineEdit()
+        self.filter_box.setPlaceholderText("Filter saved postings...")
+        self.filter_box.setClearButtonEnabled(True)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        # fixed row heights so the view never measures rows it is not showing
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSortIndicator(BROWSE_COLUMNS.index("created_at"), Qt.DescendingOrder)
+        self.table.setSortingEnabled(True)
+        self.status = QLabel()
+
+        body = QWidget()
+        layout = QVBoxLayout(body)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.addWidget(self.filter_box)
+        layout.addWidget(self.table)
+        layout.addWidget(self.status)
+        self.setWidget(body)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.timeout.connect(self.apply_filter)
+        self.filter_box.textChanged.connect(lambda _: self._filter_timer.start(self.FILTER_DELAY_MS))
+        self.model.modelReset.connect(self.update_status)
+        self.model.edits_saved.connect(lambda count: self.update_status(f"Saved edits to {count} postings"))
+        self.model.edits_failed.connect(self.update_status)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.model.activate()
+
+    def apply_filter(self):
+        self.model.set_filter(self.filter_box.text().strip())
+
+    def refresh(self):
+        if self.isVisible():
+            self.model.refresh()
+
+    def update_status(self, message: str = ""):
+        text = f"{self.model.total:,} postings"
+        self.status.setText(f"{text} - {message}" if message else text)
@@ -0,0 +1,225 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# HTTP statuses / google.api_core exception names worth retrying
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "Aborted",
+    "ConnectionError", "Timeout", "TimeoutError", "ReadTimeout", "ConnectTimeout",
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker stays open longer than a caller is willing to wait"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Quota (429), transient 5xx and network errors are retried; everything else fails fast"""
+    for attr in ("code", "status_code", "status"):
+        value = getattr(error, attr, None)
+        value = getattr(value, "value", value)      # grpc / enum style codes
+        if isinstance(value, int) and value in RETRYABLE_STATUS:
+            return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in RETRYABLE_STATUS:
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = float(rate_per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """Block until amount tokens are available, take them and return the seconds waited"""
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures, half-opens after reset_timeout seconds"""
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._state = self.CLOSED
+        self._trial_running = False
+        self._trial_thread = None
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            return self._state
+
+    def wait_time(self) -> float:
+        """Seconds until a call may go through (0 when closed or a half-open trial is free)"""
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return 0.0
+            if state == self.HALF_OPEN:
+                if self._trial_running:
+                    return min(1.0, self.reset_timeout)
+                self._trial_running = True
+                self._trial_thread = threading.get_ident()
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self.opened_at))
+
+    def release_trial(self):
+        """Free the half-open trial held by this thread without a verdict, so the next call becomes the trial"""
+        with self._lock:
+            if self._trial_running and self._trial_thread == threading.get_ident():
+                self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opens += 1
+                self._state = self.OPEN
+                self.opened_at = self._clock()
+
+
+class ClientGovernor:
+    """
+    Shared gate in front of an API client: requests/minute and tokens/minute
+    buckets, a concurrency cap, retries with exponential backoff and full
+    jitter, and a circuit breaker that pauses callers during outages.
+    """
+    def __init__(self, requests_per_minute: float = 15, tokens_per_minute: float = 1_000_000,
+                 max_concurrent: int = 4, max_retries: int = 4, backoff_base: float = 1.0,
+                 backoff_cap: float = 30.0, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_breaker_wait: float = 120.0, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.request_bucket = TokenBucket(requests_per_minute, clock=clock, sleep=sleep)
+        self.token_bucket = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock=clock)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_breaker_wait = max_breaker_wait
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._metrics = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "rate_wait_seconds": 0.0, "concurrency_wait_seconds": 0.0,
+            "breaker_wait_seconds": 0.0, "backoff_seconds": 0.0, "in_flight": 0,
+        }
+
+    def _add(self, name: str, amount):
+        with self._lock:
+            self._metrics[name] += amount
+
+    def _wait_for_breaker(self):
+        waited = 0.0
+        while True:
+            delay = self.breaker.wait_time()
+            if delay <= 0:
+                break
+            if waited + delay > self.max_breaker_wait:
+                raise CircuitOpenError(f"API circuit open for {waited:.0f}s, giving up")
+            self._sleep(delay)
+            waited += delay
+        self._add("breaker_wait_seconds", waited)
+
+    def call(self, fn: Callable, estimated_tokens: int = 0):
+        """Run fn() under the limits, retrying retryable errors; re-raises the last error"""
+        self._add("calls", 1)
+        attempt = 0
+        while True:
+            self._wait_for_breaker()
+            settled = False
+            try:
+                self._add("rate_wait_seconds", self.request_bucket.acquire(1))
+                if estimated_tokens:
+                    self._add("rate_wait_seconds", self.token_bucket.acquire(estimated_tokens))
+
+                started = self._clock()
+                with self._slots:
+                    self._add("concurrency_wait_seconds", self._clock() - started)
+                    self._add("in_flight", 1)
+                    try:
+                        result = fn()
+                    except Exception as e:
+                        error = e
+                    else:
+                        error = None
+                    finally:
+                        self._add("in_flight", -1)
+
+                if error is None:
+                    self.breaker.record_success()
+                    settled = True
+                    self._add("successes", 1)
+                    return result
+
+                retryable = is_retryable(error)
+                if retryable:
+                    self.breaker.record_failure()
+                    settled = True
+            finally:
+                # a non-retryable error (or an interrupt) says nothing about an outage, but a
+                # half-open trial held by this call must still be given back
+                if not settled:
+                    self.breaker.release_trial()
+
+            if not retryable or attempt >= self.max_retries:
+                self._add("failures", 1)
+                raise error
+
+            attempt += 1
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+            self._add("retries", 1)
+            self._add("backoff_seconds", delay)
+            self._sleep(delay)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["breaker_state"] = self.breaker.state
+        metrics["breaker_opens"] = self.breaker.opens
+        return metrics
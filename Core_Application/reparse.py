@@ -0,0 +1,136 @@
+"""
+Re-parse saved postings whose prompt version (or parser model) is out of date.
+
+Stale rows are read in id order a batch at a time, re-extracted from their
+stored page source (or from their posting text when no page was kept), run
+through the parser backends and written back with the current version tags.
+A re-parsed row is no longer stale, so an interrupted run carries on where it
+stopped the next time it is started. Rows that come back without a title or
+company are marked and left out of later runs with the same prompt version
+and model.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database_context import db
+from extraction import extract_posting_text
+from structured_data import extract_structured_posting
+from parser import PROMPT_VERSION, tag_version
+from backends import parser_router
+from utils import save_error
+
+
+def _prepare(row: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """(structured data result, text to parse) for one stale row"""
+    html = row["raw_source"]
+    if not html:
+        return None, row["posting_text"]
+    content, _ = extract_posting_text(html, db.get_setting("prompt_token_budget"))
+    structured = extract_structured_posting(html)
+    if structured:
+        structured["posting_text"] = content
+        return tag_version(structured, structured["parse_source"]), content
+    return None, content
+
+
+def _has_required_fields(job: Dict) -> bool:
+    return bool((job.get("job_title") or "").strip() and (job.get("company") or "").strip())
+
+
+def _parser_for(model: Optional[str]) -> Callable[[List[str]], List[Optional[Dict]]]:
+    """The router, or only the backend for model when one is named"""
+    if not model:
+        return parser_router.parse_batch
+    for backend in parser_router.backends:
+        if backend.model_id == model and backend.available():
+            return lambda contents: [tag_version(parsed_data, model) if parsed_data else None
+                                     for parsed_data in backend.parse_batch(contents)]
+    known = ", ".join(backend.model_id for backend in parser_router.backends if backend.available())
+    raise ValueError(f"No available parser backend for model {model} (available: {known or 'none'})")
+
+
+def _wait(seconds: float, should_stop: Callable[[], bool]):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not should_stop():
+        time.sleep(min(0.1, seconds))
+
+
+def reparse_postings(model: Optional[str] = None, batch_size: Optional[int] = None,
+                     pause_seconds: Optional[float] = None, limit: Optional[int] = None,
+                     progress: Callable[[str], None] = print,
+                     should_stop: Callable[[], bool] = lambda: False) -> Dict:
+    """
+    Re-parse every row parsed with another prompt version (and, when model is
+    given, rows parsed by another model, using only that model) in batches of
+    batch_size with pause_seconds between them. Each batch is committed on its
+    own, so stopping loses at most the batch in flight.
+    """
+    parse = _parser_for(model)
+    batch_size = max(1, int(batch_size or db.get_setting("reparse_batch_size")))
+    pause = float(db.get_setting("reparse_pause_seconds") if pause_seconds is None else pause_seconds)
+    stats = {"stale": db.count_stale(PROMPT_VERSION, model), "updated": 0, "failed": 0, "skipped": 0,
+             "stopped": False, "seconds": 0.0}
+    if limit is not None:
+        stats["stale"] = min(stats["stale"], limit)
+    started = time.perf_counter()
+    after_id = 0
+    seen = 0
+    attempted = 0                    # rows sent to a parser; limit counts these
+
+    while attempted < stats["stale"]:
+        if should_stop():
+            stats["stopped"] = True
+            break
+        rows = db.stale_postings(PROMPT_VERSION, model, after_id, min(batch_size, stats["stale"] - attempted))
+        if not rows:
+            break
+        after_id = rows[-1]["id"]
+        seen += len(rows)
+
+        results, to_parse, unreadable = [], [], []
+        for row in rows:
+            try:
+                structured, content = _prepare(row)
+            except Exception as e:
+                save_error(f"Re-parse could not read posting {row['id']}: {e}")
+                structured, content = None, None
+            if structured:
+                results.append(dict(structured, id=row["id"]))
+            elif content:
+                to_parse.append((row["id"], content))
+            else:
+                unreadable.append(row["id"])     # the stored page holds no posting text
+        failed = []
+        if to_parse:
+            try:
+                parsed = parse([content for _, content in to_parse])
+            except Exception as e:
+                save_error(f"Re-parse failed for {len(to_parse)} postings: {e}")
+                parsed = None
+            if parsed is not None and (any(parsed) or len(to_parse) == 1):
+                for (posting_id, _), parsed_data in zip(to_parse, parsed):
+                    if parsed_data:
+                        results.append(dict(parsed_data, id=posting_id))
+                    else:
+                        failed.append(posting_id)
+            # else: nothing in a whole batch came back, more likely an outage than bad postings
+        complete = [job for job in results if _has_required_fields(job)]
+        failed += [job["id"] for job in results if not _has_required_fields(job)]
+
+        # rows that cannot be re-parsed are left out of later runs for this prompt version / model
+        if unreadable or failed:
+            db.mark_reparse_failed(unreadable + failed, PROMPT_VERSION, model)
+        updated = db.apply_reparse(complete) if complete else 0
+        attempted += len(rows) - len(unreadable)
+        stats["updated"] += updated
+        stats["skipped"] += len(unreadable)
+        stats["failed"] += len(rows) - len(unreadable) - updated
+        elapsed = time.perf_counter() - started
+        progress(f"Re-parsed {stats['updated']:,} of {stats['stale']:,} stale postings "
+                 f"({stats['failed']:,} failed, {stats['skipped']:,} without text, {seen / elapsed:.1f} rows/s)")
+        if pause and attempted < stats["stale"]:
+            _wait(pause, should_stop)
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
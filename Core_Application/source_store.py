@@ -0,0 +1,39 @@
+"""
+Compression for the page sources kept with saved postings. zstd is used when
+the zstandard package is installed, zlib otherwise; the codec is stored with
+each row so either can be read back later.
+"""
+
+import hashlib
+import zlib
+from typing import Tuple
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the source text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(text: str) -> Tuple[str, bytes]:
+    """(codec, compressed bytes) for text"""
+    data = text.encode("utf-8")
+    try:
+        import zstandard
+    except ImportError:
+        return "zlib", zlib.compress(data, ZLIB_LEVEL)
+    return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def decompress(codec: str, blob: bytes) -> str:
+    if codec == "zlib":
+        return zlib.decompress(blob).decode("utf-8")
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("This source was stored with zstd: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    raise ValueError(f"Unknown source codec: {codec}")
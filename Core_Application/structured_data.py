@@ -0,0 +1,162 @@
+import html as html_lib
+import json
+import re
+from typing import Dict, List, Optional
+
+# regex scanning is much cheaper than building a soup just to read a few tags
+LD_JSON_PATTERN = re.compile(
+    r"<script[^>]+type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+META_PATTERN = re.compile(r"<meta\s[^>]*>", re.IGNORECASE)
+META_ATTR_PATTERN = re.compile(r"([\w:-]+)\s*=\s*(\"[^\"]*\"|'[^']*')")
+
+SALARY_UNITS = {"HOUR": "hour", "DAY": "day", "WEEK": "week", "MONTH": "month", "YEAR": "year"}
+
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _text(value) -> str:
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("@value") or ""
+    if isinstance(value, list):
+        value = next((_text(v) for v in value if _text(v)), "")
+    return html_lib.unescape(str(value)).strip() if value else ""
+
+
+def _is_job_posting(node: Dict) -> bool:
+    return any(str(t).lower() == "jobposting" for t in _as_list(node.get("@type")))
+
+
+def _find_job_postings(data) -> List[Dict]:
+    found = []
+    for node in _as_list(data):
+        if not isinstance(node, dict):
+            continue
+        if _is_job_posting(node):
+            found.append(node)
+        found.extend(_find_job_postings(node.get("@graph")))
+    return found
+
+
+def _load_ld_json(raw: str):
+    raw = raw.strip()
+    raw = re.sub(r"^\s*(<!--|<!\[CDATA\[)|(-->|\]\]>)\s*$", "", raw)
+    try:
+        return json.loads(raw)
+    except ValueError:
+        # some boards leave raw newlines / tabs inside strings
+        try:
+            return json.loads(re.sub(r"[\r\n\t]+", " ", raw))
+        except ValueError:
+            return None
+
+
+def is_job_posting_ld_json(raw: str) -> bool:
+    """The contents of one ld+json script describe a JobPosting"""
+    return bool(_find_job_postings(_load_ld_json(raw)))
+
+
+def _format_location(posting: Dict) -> str:
+    places = []
+    for place in _as_list(posting.get("jobLocation")):
+        address = place.get("address", place) if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [_text(address.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry")]
+            text = ", ".join(p for p in parts if p)
+        else:
+            text = _text(address)
+        if text and text not in places:
+            places.append(text)
+
+    if str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE":
+        requirements = [_text(r) for r in _as_list(posting.get("applicantLocationRequirements"))]
+        remote = "Remote" + (f" ({', '.join(r for r in requirements if r)})" if any(requirements) else "")
+        places.insert(0, remote)
+    return "; ".join(places)
+
+
+def _format_number(value) -> str:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return f"{number:,.0f}" if number == int(number) else f"{number:,.2f}"
+
+
+def _format_salary(posting: Dict) -> str:
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    salary = _as_list(salary)[0] if salary else None
+    if not salary:
+        return ""
+    if not isinstance(salary, dict):
+        return _text(salary)
+
+    currency = _text(salary.get("currency"))
+    value = salary.get("value", salary)
+    if isinstance(value, dict):
+        low, high = value.get("minValue"), value.get("maxValue")
+        exact = value.get("value")
+        unit = _text(value.get("unitText")) or _text(salary.get("unitText"))
+    else:
+        low = high = None
+        exact = value
+        unit = _text(salary.get("unitText"))
+
+    if low is not None and high is not None and low != high:
+        amount = f"{_format_number(low)} - {_format_number(high)}"
+    elif exact is not None and not isinstance(exact, dict):
+        amount = _format_number(exact)
+    elif low is not None or high is not None:
+        amount = _format_number(low if low is not None else high)
+    else:
+        return ""
+
+    text = f"{currency} {amount}".strip()
+    if unit:
+        text += f" per {SALARY_UNITS.get(unit.upper(), unit.lower())}"
+    return text
+
+
+def _meta_tags(html: str) -> Dict[str, str]:
+    tags = {}
+    for tag in META_PATTERN.findall(html):
+        attrs = {k.lower(): v[1:-1] for k, v in META_ATTR_PATTERN.findall(tag)}
+        name = (attrs.get("property") or attrs.get("name") or "").lower()
+        if name and "content" in attrs and name not in tags:
+            tags[name] = html_lib.unescape(attrs["content"]).strip()
+    return tags
+
+
+def extract_structured_posting(html: str) -> Optional[Dict]:
+    """
+    Read schema.org JobPosting JSON-LD (with the og:title meta tag as a fallback).
+    Returns the four parser fields only when title, company and location are all
+    present; salary is left empty when the posting does not publish one.
+    """
+    if not html:
+        return None
+
+    result = {"job_title": "", "company": "", "location": "", "salary": ""}
+    source = ""
+    for raw in LD_JSON_PATTERN.findall(html):
+        for posting in _find_job_postings(_load_ld_json(raw)):
+            result["job_title"] = result["job_title"] or _text(posting.get("title"))
+            result["company"] = result["company"] or _text(posting.get("hiringOrganization"))
+            result["location"] = result["location"] or _format_location(posting)
+            result["salary"] = result["salary"] or _format_salary(posting)
+            source = "json-ld"
+
+    # og:site_name is usually the job board, so meta tags only fill in a missing title
+    if source and not result["job_title"]:
+        result["job_title"] = _meta_tags(html).get("og:title", "")
+        source = "json-ld+meta"
+
+    if result["job_title"] and result["company"] and result["location"]:
+        result["parse_source"] = source
+        return result
+    return None
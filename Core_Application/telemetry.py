@@ -0,0 +1,159 @@
+"""
+Per-stage span timing and buffered, rotating logs.
+
+Spans (fetch, extract, gemini, extract_json, save, ...) are kept in a rolling
+window per stage for the performance panel and appended to a JSON-lines log.
+Log writes are buffered in memory and flushed by a background thread, so a
+log call never touches the disk on the calling thread.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Deque, Dict, List
+
+from utils import LazyObject, data_directory
+
+WINDOW = 500                 # spans kept per stage for the rolling percentiles
+
+
+class BufferedLog:
+    """Append-only text log: lines are buffered and flushed every interval, rotated at max_bytes"""
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024, backups: int = 3,
+                 flush_interval: float = 1.0, max_buffered: int = 1000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_buffered = max_buffered
+        self._lines: List[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flush_interval = flush_interval
+        self._thread = threading.Thread(target=self._run, name=f"log-{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def write(self, line: str):
+        with self._lock:
+            self._lines.append(line)
+            full = len(self._lines) >= self.max_buffered
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def flush(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+        if not lines:
+            return
+        with self._write_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                    self._rotate()
+                with open(self.path, 'a', encoding='utf-8') as file:
+                    file.write("\n".join(lines) + "\n")
+            except Exception as e:
+                print(f"Failed to write {self.path}: {e}")
+
+
+class StageStats:
+    """Rolling window of span durations plus running byte/token totals for one stage"""
+    def __init__(self):
+        self.durations: Deque[float] = deque(maxlen=WINDOW)
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.tokens = 0
+
+    def summary(self) -> Dict:
+        ordered = sorted(self.durations)
+
+        def pick(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000 if ordered else 0.0
+
+        return {"count": self.count, "errors": self.errors, "p50_ms": pick(0.50), "p95_ms": pick(0.95),
+                "bytes": self.bytes, "tokens": self.tokens}
+
+
+class Telemetry:
+    """Collects spans from any thread; see span() for the usual entry point"""
+    def __init__(self, data_dir: str):
+        self.events = BufferedLog(os.path.join(data_dir, "logs", "parsio.jsonl"))
+        self.errors = BufferedLog(os.path.join(data_dir, "error.txt"))
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, ok: bool = True, **fields):
+        with self._lock:
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.durations.append(seconds)
+            stats.count += 1
+            stats.errors += 0 if ok else 1
+            stats.bytes += int(fields.get("bytes") or 0)
+            stats.tokens += int(fields.get("tokens") or 0)
+        event = {"ts": datetime.now().isoformat(), "type": "span", "stage": stage,
+                 "ms": round(seconds * 1000, 3), "ok": ok}
+        event.update(fields)
+        self.events.write(json.dumps(event, default=str))
+
+    def event(self, kind: str, **fields):
+        self.events.write(json.dumps(dict({"ts": datetime.now().isoformat(), "type": kind}, **fields), default=str))
+
+    def error(self, message: str):
+        timestamp = datetime.now().isoformat()
+        self.errors.write(f"[{timestamp}] {message}")
+        self.event("error", message=message)
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {stage: stats.summary() for stage, stats in self._stages.items()}
+
+    def flush(self):
+        self.events.flush()
+        self.errors.flush()
+
+
+class _Span:
+    """Mutable handle yielded by span() so the body can attach bytes/tokens/other fields"""
+    def __init__(self, fields: Dict):
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+@contextmanager
+def span(stage: str, **fields):
+    """Time the with-block as one span of stage; exceptions are recorded and re-raised"""
+    handle = _Span(dict(fields))
+    started = time.perf_counter()
+    try:
+        yield handle
+    except BaseException as e:
+        handle.fields.setdefault("error", type(e).__name__)
+        telemetry.record(stage, time.perf_counter() - started, ok=False, **handle.fields)
+        raise
+    telemetry.record(stage, time.perf_counter() - started, **handle.fields)
+
+
+# Global telemetry instance: spans go to Data/logs/parsio.jsonl, errors to Data/error.txt
+telemetry = LazyObject(lambda: Telemetry(data_directory()))
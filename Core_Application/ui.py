@@ -1,10 +1,30 @@
-from PyQt5.QtWidgets import QMainWindow, QApplication
+from PyQt5.QtWidgets import QMainWindow, QApplication, QFileDialog, QMessageBox
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
 from PyQt5.QtGui import QGuiApplication, QIcon
 from interface import Ui_ParsioApp
-from parser import parse_with_gemini
-from database_context import fetch_url_content, db
+from database_context import db
+from workers import JobQueue, CommitJob, ExportJob, ReparseJob, WarmUpJob
+from parse_cache import parse_cache
+from parser import PROMPT_VERSION, gemini_governor
+from backends import parser_router
+from perf_panel import PerfPanel
+from postings_table import PostingsBrowser
+from clipboard_watch import ClipboardWatcher
+from datetime import datetime
 import sys
 import os
+import time
+
+
+def commit_summary(result: dict) -> str:
+    """'3 new job postings (1 linked to a saved posting, ...)' for a commit or save result"""
+    details = []
+    if result["linked"]:
+        details.append(f"{result['linked']} linked to postings already saved")
+    if result["skipped"]:
+        details.append(f"{result['skipped']} skipped without a title or company")
+    summary = f"{result['inserted']} new job posting{'' if result['inserted'] == 1 else 's'}"
+    return summary + (f" ({', '.join(details)})" if details else "") + "."
 
 
 class ParsioApp(QMainWindow):
@@ -16,16 +36,89 @@ class ParsioApp(QMainWindow):
         self.ui = Ui_ParsioApp()
         self.ui.setupUi(self)
         
-        self.pending_changes = []  # List of job postings to save
+        # parsed postings wait in the on-disk pending journal until a (group) commit
+        self.pending_count = 0
+        self.pending_since = None  # monotonic time the oldest pending posting was journaled
+        self.commit_job = None
+        self.export_job = None
+        self.reparse_job = None
+        self.warm_up_job = None
+
+        # auto-commit once enough postings are pending or the oldest has waited long enough
+        self.autocommit_timer = QTimer(self)
+        self.autocommit_timer.setInterval(1000)
+        self.autocommit_timer.timeout.connect(self.check_autocommit)
+
+        # saved postings table, hidden until View > Saved Postings
+        self.postings_browser = PostingsBrowser(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.postings_browser)
+        self.postings_browser.hide()
+
+        # per-stage timings, hidden until View > Performance Panel
+        self.perf_panel = PerfPanel(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.perf_panel)
+        self.perf_panel.hide()
+
+        # background fetch/parse queue; sized from the settings once the warm-up has read them
+        self.job_queue = JobQueue(parent=self)
+
+        # opt-in clipboard capture (Tools > Watch Clipboard), fed into the same queue
+        self.clipboard_watcher = ClipboardWatcher(
+            lambda text: self.queue_posting(text, "Captured"), self.job_queue.pending_count, parent=self,
+        )
         
         # button events
         self.connect_signals()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.warm_up_job is None:
+            # let the first frame paint, then load the heavy modules in the background
+            QTimer.singleShot(0, self.start_warm_up)
+
+    def start_warm_up(self):
+        if self.warm_up_job is not None:
+            return
+        self.warm_up_job = WarmUpJob()
+        self.warm_up_job.signals.progress.connect(self.on_warm_up_finished)
+        QThreadPool.globalInstance().start(self.warm_up_job)
+
+    def on_warm_up_finished(self, _, message: str):
+        self.statusBar().showMessage(message, 10000)
+        self.job_queue.set_max_workers(db.get_max_workers())
+        self.clipboard_watcher.set_limits(db.get_setting("clipboard_max_in_flight"),
+                                          db.get_setting("clipboard_max_backlog"))
+        # replay postings journaled by a previous session that were never committed
+        self.refresh_pending()
+        if self.pending_count:
+            self.log(f"Recovered {self.pending_count} pending job postings from the last session.")
+        self.autocommit_timer.start()
+
     def connect_signals(self):
         self.ui.btn_paste.clicked.connect(self.handle_paste)
         self.ui.btn_commit.clicked.connect(self.commit_changes)
         self.ui.actionExit.triggered.connect(self.close)
         self.ui.actionClear_Log.triggered.connect(self.clear_log)
+        self.ui.actionExport_Data.triggered.connect(self.handle_export)
+        self.ui.actionWatch_Clipboard.toggled.connect(self.toggle_clipboard_watch)
+        self.ui.actionReparse_Stale.triggered.connect(self.toggle_reparse)
+        self.clipboard_watcher.queued.connect(
+            lambda preview, backlog: self.log(f"Waiting ({backlog} in backlog): {preview}"))
+        self.clipboard_watcher.rejected.connect(
+            lambda preview, reason: self.log(f"Ignored clipboard ({reason}): {preview}"))
+        self.clipboard_watcher.dropped.connect(lambda preview: self.log(f"Backlog full, dropped: {preview}"))
+        self.job_queue.done.connect(self.clipboard_watcher.drain)
+        self.ui.actionBrowse_Postings.triggered.connect(self.postings_browser.setVisible)
+        self.postings_browser.visibilityChanged.connect(self.ui.actionBrowse_Postings.setChecked)
+        self.ui.actionPerformance_Panel.triggered.connect(self.perf_panel.setVisible)
+        self.perf_panel.visibilityChanged.connect(self.ui.actionPerformance_Panel.setChecked)
+        self.ui.btn_search.clicked.connect(self.handle_search)
+        self.ui.search_box.returnPressed.connect(self.handle_search)
+        self.job_queue.progress.connect(self.on_job_progress)
+        self.job_queue.finished.connect(self.on_job_finished)
+        self.job_queue.failed.connect(self.on_job_failed)
+        self.job_queue.duplicate.connect(self.on_job_duplicate)
+        self.job_queue.idle.connect(self.on_queue_idle)
 
     def handle_paste(self):
         """Handles paste button event"""
@@ -34,50 +127,136 @@ class ParsioApp(QMainWindow):
             self.log("Clipboard is empty.")
             return
 
-        # Check if API key is configured
-        api_key = db.get_gemini_api_key()
-        if not api_key:
-            self.log("Error: Gemini API key not configured. Please set your API key in the settings.")
+        # Check that at least one parser backend can run (e.g. Gemini needs an API key)
+        if not parser_router.available():
+            self.log("Error: No parser backend available. Set your Gemini API key or enable the local parser in the settings.")
+            return
+
+        self.queue_posting(clipboard_text)
+
+    def queue_posting(self, text: str, verb: str = "Queued"):
+        """Hand a URL or posting text to the background queue"""
+        # fetch + parse runs on the worker pool, results come back through signals
+        job_id = self.job_queue.submit(text)
+        preview = text if len(text) <= 60 else text[:57] + "..."
+        self.log(f"[#{job_id}] {verb}: {preview} ({self.job_queue.pending_count()} in progress)")
+
+    def toggle_clipboard_watch(self, enabled: bool):
+        """Tools > Watch Clipboard: queue job links and postings as soon as they are copied"""
+        if enabled and not parser_router.available():
+            self.log("Error: No parser backend available. Set your Gemini API key or enable the local parser in the settings.")
+            self.ui.actionWatch_Clipboard.setChecked(False)
+            return
+        if enabled:
+            self.clipboard_watcher.start()
+            self.log("Watching the clipboard: copied job links and postings are queued automatically.")
+        elif self.clipboard_watcher.is_active():
+            self.clipboard_watcher.stop()
+            backlog = len(self.clipboard_watcher.backlog)
+            self.log(f"Stopped watching the clipboard ({backlog} captured items still waiting).")
+
+    def on_job_progress(self, job_id: int, message: str):
+        self.log(f"[#{job_id}] {message}")
+
+    def on_job_finished(self, job_id: int, parsed_data: dict):
+        try:
+            db.journal_pending(parsed_data)
+        except Exception as e:
+            self.log(f"[#{job_id}] Could not add to pending: {e}")
             return
+        self.pending_count += 1
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+        source = parsed_data.get('parse_source', 'gemini')
+        self.log(f"[#{job_id}] Added to pending: {parsed_data['job_title']} at {parsed_data['company']} ({source})")
 
-        # URL OR RAW TEXT %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
-        if clipboard_text.lower().startswith("http"):
-            content = fetch_url_content(clipboard_text)
-        else:
-            content = clipboard_text
+    def on_job_duplicate(self, job_id: int, existing: dict):
+        self.log(f"[#{job_id}] Already saved: {existing['job_title']} at {existing['company']} "
+                 f"(row {existing['id']}), linked instead of parsing again")
 
-        if content:
-            try:
-                parsed_data = parse_with_gemini(content, api_key)
-                if parsed_data:
-                    self.pending_changes.append(parsed_data)
-                    self.log(f"Added to pending: {parsed_data['job_title']} at {parsed_data['company']}")
-                else:
-                    self.log("Unable to parse job posting. Check error.txt for details.")
-            except ValueError as e:
-                self.log(f"API Key Error: {e}")
-            except Exception as e:
-                self.log(f"Parsing Error: {e}")
+    def on_job_failed(self, job_id: int, message: str):
+        self.log(f"[#{job_id}] {message}")
+
+    def on_queue_idle(self):
+        self.log(f"All jobs done. {self.pending_count} job postings pending commit.")
+
+    def refresh_pending(self):
+        """Re-read the pending count and the age of the oldest posting from the journal"""
+        try:
+            count, oldest = db.pending_summary()
+        except Exception as e:
+            self.log(f"Could not read pending journal: {e}")
+            return
+        self.pending_count = count
+        self.pending_since = None
+        if count and oldest:
+            age = (datetime.now() - datetime.fromisoformat(oldest)).total_seconds()
+            self.pending_since = time.monotonic() - max(0.0, age)
+
+    def check_autocommit(self):
+        """Group commit when autocommit_max_pending postings are waiting or the oldest is autocommit_interval_seconds old"""
+        if self.commit_job is not None or not self.pending_count:
+            return
+        max_pending = db.get_setting("autocommit_max_pending")
+        max_seconds = db.get_setting("autocommit_interval_seconds")
+        waited = time.monotonic() - self.pending_since if self.pending_since is not None else 0.0
+        if (max_pending and self.pending_count >= max_pending) or (max_seconds and waited >= max_seconds):
+            self.start_commit("auto-commit")
 
     def commit_changes(self):
         """Save pending changes to database"""
-        if not self.pending_changes:
+        if self.commit_job is not None:
+            self.log("A commit is already running.")
+            return
+        if not self.pending_count:
             self.log("No changes to commit.")
             return
+        self.log(f"Saving {self.pending_count} job postings...")
+        self.start_commit("manual")
 
-        try:
-            self.log(f"Saving {len(self.pending_changes)} job postings...")
-            
-            success = db.save_job_postings(self.pending_changes)
-            if success:
-                self.log(f"Successfully saved {len(self.pending_changes)} job postings!")
-                self.pending_changes.clear()
-                self.show_database_stats()
-            else:
-                self.log("Failed to save to database.")
-                
-        except Exception as e:
-            self.log(f"Error: {e}")
+    def start_commit(self, reason: str):
+        self.commit_job = CommitJob(reason)
+        self.commit_job.signals.finished.connect(self.on_commit_finished)
+        self.commit_job.signals.failed.connect(self.on_commit_failed)
+        QThreadPool.globalInstance().start(self.commit_job)
+
+    def on_commit_finished(self, _, result: dict):
+        self.commit_job = None
+        self.refresh_pending()
+        self.postings_browser.refresh()
+        if result["reason"] == "manual" or result["taken"]:
+            self.log(("Saved" if result["reason"] == "manual" else "Auto-committed") + " " + commit_summary(result))
+        if result["reason"] == "manual":
+            self.show_database_stats()
+
+    def on_commit_failed(self, _, message: str):
+        self.commit_job = None
+        self.log(message)
+
+    def handle_search(self):
+        """Full-text search over saved postings, results go to the log board"""
+        query = self.ui.search_box.text().strip()
+        if not query:
+            self.log("Type something to search for.")
+            return
+
+        results = db.search(query, limit=20)
+        self.log(f"=== Search: {query} ({len(results)} results) ===")
+        for job in results:
+            self.log(f"  • {job['job_title']} at {job['company']}")
+            if job['location']:
+                self.log(f"    Location: {job['location']}")
+            if job['salary']:
+                self.log(f"    Salary: {job['salary']}")
+            if job['snippet']:
+                self.log(f"    ...{job['snippet']}")
+
+    def closeEvent(self, event):
+        if self.reparse_job is not None:
+            self.reparse_job.stop()
+        self.postings_browser.model.flush_edits()
+        self.job_queue.shutdown()
+        super().closeEvent(event)
 
     def log(self, message):
         """Add message to log board"""
@@ -88,6 +267,87 @@ class ParsioApp(QMainWindow):
         self.ui.log_board.clear()
         self.log("Log cleared.")
 
+    def handle_export(self):
+        """Export saved postings to Excel, CSV or Parquet in the background"""
+        if self.export_job is not None:
+            self.log("An export is already running.")
+            return
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export Data", "job_postings.xlsx",
+            "Excel Workbook (*.xlsx);;CSV (*.csv);;Parquet (*.parquet)"
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += "." + selected.split("*.")[-1].rstrip(")")
+
+        answer = QMessageBox.question(
+            self, "Export Data",
+            "Export only postings added or changed since the last export?\n"
+            "Choose No to export everything.",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.No
+        )
+        if answer == QMessageBox.Cancel:
+            return
+
+        self.export_job = ExportJob(path, incremental=answer == QMessageBox.Yes)
+        self.export_job.signals.finished.connect(self.on_export_finished)
+        self.export_job.signals.failed.connect(self.on_export_failed)
+        QThreadPool.globalInstance().start(self.export_job)
+        self.log(f"Exporting to {path}...")
+
+    def on_export_finished(self, _, result: dict):
+        self.export_job = None
+        scope = "new/changed" if result["incremental"] else "all"
+        self.log(f"Exported {result['rows']} {scope} postings to {result['path']}")
+
+    def on_export_failed(self, _, message: str):
+        self.export_job = None
+        self.log(message)
+
+    def toggle_reparse(self):
+        """Tools > Re-parse Stale Postings: start re-parsing rows from an older prompt version, or stop it"""
+        if self.reparse_job is not None:
+            self.reparse_job.stop()
+            self.log("Stopping re-parse after the current batch...")
+            return
+        self.ui.actionReparse_Stale.setChecked(False)
+        if not parser_router.available():
+            self.log("Error: No parser backend available. Set your Gemini API key or enable the local parser in the settings.")
+            return
+        stale = db.count_stale(PROMPT_VERSION)
+        if not stale:
+            self.log("Every saved posting is up to date with the current prompt.")
+            return
+        answer = QMessageBox.question(
+            self, "Re-parse Stale Postings",
+            f"Re-parse {stale:,} postings saved with an older prompt version?\n"
+            "It runs in the background and can be stopped at any time; a later run continues where it stopped.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes
+        )
+        if answer != QMessageBox.Yes:
+            return
+        self.ui.actionReparse_Stale.setChecked(True)
+        self.reparse_job = ReparseJob()
+        self.reparse_job.signals.progress.connect(lambda _, message: self.log(message))
+        self.reparse_job.signals.finished.connect(self.on_reparse_finished)
+        self.reparse_job.signals.failed.connect(self.on_reparse_failed)
+        QThreadPool.globalInstance().start(self.reparse_job)
+        self.log(f"Re-parsing {stale:,} stale postings...")
+
+    def on_reparse_finished(self, _, stats: dict):
+        self.reparse_job = None
+        self.ui.actionReparse_Stale.setChecked(False)
+        state = "Stopped" if stats["stopped"] else "Finished"
+        self.log(f"{state} re-parse: {stats['updated']:,} updated, {stats['failed']:,} failed, "
+                 f"{stats['skipped']:,} without text in {stats['seconds']:.0f}s")
+        self.postings_browser.refresh()
+
+    def on_reparse_failed(self, _, message: str):
+        self.reparse_job = None
+        self.ui.actionReparse_Stale.setChecked(False)
+        self.log(message)
+
     def show_database_stats(self):
         """Show basic database statistics"""
         try:
@@ -95,6 +355,17 @@ class ParsioApp(QMainWindow):
             for line in stats.split('\n'):
                 if line.strip():  
                     self.log(line)
+            cache_stats = parse_cache.stats()
+            self.log(f"Parse cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            api = gemini_governor.metrics()
+            self.log(f"Gemini API: {api['calls']} calls, {api['retries']} retries, "
+                     f"{api['rate_wait_seconds']:.1f}s rate-limited, breaker {api['breaker_state']}")
+            for backend in parser_router.stats():
+                state = "healthy" if backend["healthy"] else "degraded"
+                if not backend["available"]:
+                    state = "unavailable"
+                self.log(f"Parser {backend['name']} ({backend['type']}, priority {backend['priority']}): {state}, "
+                         f"{backend['latency_ms']:.0f} ms/posting, {backend['errors']}/{backend['calls']} errors")
         except Exception as e:
             self.log(f"Could not get stats: {e}")
 
@@ -1,9 +1,90 @@
 import re
 import os
-from typing import Dict
+import threading
+from typing import Callable, Dict, Optional
+
+
+class LazyObject:
+    """
+    Stand-in for a module-level singleton that is only built on first attribute
+    access, so importing a module does no settings, file or network work.
+    """
+    def __init__(self, factory: Callable):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self):
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    instance = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def is_ready(self) -> bool:
+        return object.__getattribute__(self, "_instance") is not None
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+
+class JsonStreamParser:
+    """
+    Incremental brace/bracket matcher: feed() text chunks as they arrive and it
+    returns the first complete top-level JSON object or array as soon as it closes.
+    """
+    def __init__(self, opening: str = "{["):
+        self.opening = opening
+        self.buffer = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+        self.result: Optional[str] = None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        if self.result is not None:
+            return self.result
+        for char in chunk or "":
+            if not self.started:
+                if char not in self.opening:
+                    continue
+                self.started = True
+            self.buffer.append(char)
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.result = "".join(self.buffer)
+                    return self.result
+        return None
+
+
+def extract_balanced(text, opening: str = "{["):
+    """First complete JSON object/array in text, or None when nothing closes."""
+    return JsonStreamParser(opening).feed(text)
 
 def extract_json(text):
     """Extract the first JSON object substring from a string."""
+    balanced = extract_balanced(text, "{")
+    if balanced:
+        return balanced
     try:
         match = re.search(r"\{.*\}", text, re.DOTALL)
         if match:
@@ -12,15 +93,41 @@ def extract_json(text):
         pass
     return text
 
+def extract_json_array(text):
+    """Extract the first JSON array substring from a string."""
+    balanced = extract_balanced(text, "[")
+    if balanced:
+        return balanced
+    try:
+        match = re.search(r"\[.*\]", text, re.DOTALL)
+        if match:
+            return match.group(0)
+    except Exception:
+        pass
+    return text
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting prompts (~4 characters per token)."""
+    return len(text or "") // 4 + 1
+
+def data_directory() -> str:
+    """Data/ in the project root, or $PARSIO_DATA_DIR (used to keep benchmark runs separate)"""
+    override = os.environ.get("PARSIO_DATA_DIR")
+    if override:
+        return os.path.abspath(override)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_root, "Data")
+
 def save_error(error_message: str, error_file: str = None):
     """
     Save error messages to a log file for debugging.
+    Data/error.txt is written through the buffered telemetry log.
     """
     if error_file is None:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        error_file = os.path.join(project_root, "Data", "error.txt")
-    
+        from telemetry import telemetry
+        telemetry.error(error_message)
+        return
+
     try:
         os.makedirs(os.path.dirname(error_file), exist_ok=True)
         
@@ -0,0 +1,37 @@
+"""
+Work deferred from startup: heavy imports and database setup. The GUI runs
+warm_up() on the thread pool once the window is visible, so the first paste
+does not pay for it; --profile-startup times the same steps.
+"""
+
+import importlib
+import time
+from typing import Callable, List, Tuple
+
+from database_context import db, http_client
+
+
+def warm_up_steps() -> List[Tuple[str, Callable]]:
+    """(name, callable) pairs in the order they should run"""
+    steps = [
+        ("settings", lambda: db.settings),
+        ("database", db.init_database),
+        ("bs4", lambda: importlib.import_module("bs4")),
+        ("requests session", lambda: http_client.session),
+    ]
+    if db.get_gemini_api_key():
+        steps.append(("google.generativeai", lambda: importlib.import_module("google.generativeai")))
+    return steps
+
+
+def warm_up() -> List[Tuple[str, float]]:
+    """Run every warm-up step and return how long each took; failures are left for first use"""
+    timings = []
+    for name, step in warm_up_steps():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"Warm-up step {name} failed: {e}")
+        timings.append((name, time.perf_counter() - started))
+    return timings
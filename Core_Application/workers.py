@@ -0,0 +1,291 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+from parser import pack_batches, tag_version
+from backends import parser_router
+from database_context import db, fetch_posting
+from export import export_postings
+from reparse import reparse_postings
+from warmup import warm_up
+from telemetry import telemetry
+from typing import List
+import itertools
+import time
+
+
+class WorkerSignals(QObject):
+    """Signals emitted from a background job back to the GUI thread"""
+    progress = pyqtSignal(int, str)      # job id, message
+    fetched = pyqtSignal(int, str)       # job id, posting text
+    source = pyqtSignal(int, str)        # job id, downloaded page (saved compressed with the row)
+    duplicate = pyqtSignal(int, dict)    # job id, already saved posting it matches
+    finished = pyqtSignal(int, dict)     # job id, parsed data
+    failed = pyqtSignal(int, str)        # job id, error message
+
+
+class FetchJob(QRunnable):
+    """Fetch stage: downloads a pasted URL (raw text passes straight through)
+
+    Near-duplicates of saved postings and pages with complete JobPosting
+    structured data finish here without a parse stage.
+    """
+    def __init__(self, job_id: int, text: str):
+        super().__init__()
+        self.job_id = job_id
+        self.text = text
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            # URL OR RAW TEXT %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+            structured = None
+            is_url = self.text.lower().startswith("http")
+            if is_url:
+                self.signals.progress.emit(self.job_id, f"Fetching {self.text}")
+                content, report, structured = fetch_posting(self.text)
+                if not content:
+                    self.signals.failed.emit(self.job_id, f"Could not fetch {self.text}")
+                    return
+                self.signals.source.emit(self.job_id, report["html"])
+                self.signals.progress.emit(
+                    self.job_id,
+                    f"Reduced page from {report['input_chars']:,} to {report['output_chars']:,} chars "
+                    f"(~{report['output_tokens']:,} tokens)"
+                )
+            else:
+                content = self.text
+
+            duplicate = db.find_duplicate(content)
+            if duplicate:
+                db.link_duplicate(duplicate["id"], self.text if is_url else "", duplicate["similarity"])
+                self.signals.duplicate.emit(self.job_id, duplicate)
+                return
+            if structured:
+                # JobPosting structured data on the page, no LLM call needed
+                self.signals.finished.emit(self.job_id, tag_version(structured, structured["parse_source"]))
+                return
+            self.signals.fetched.emit(self.job_id, content)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, f"Fetch Error: {e}")
+
+
+class ParseJob(QRunnable):
+    """Parse stage: sends one or more fetched postings through the parser backends"""
+    def __init__(self, job_ids: List[int], contents: List[str]):
+        super().__init__()
+        self.job_ids = job_ids
+        self.contents = contents
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            batch = f" (batch of {len(self.job_ids)})" if len(self.job_ids) > 1 else ""
+            for job_id in self.job_ids:
+                self.signals.progress.emit(job_id, f"Parsing{batch}...")
+            results = parser_router.parse_batch(self.contents)
+        except Exception as e:
+            for job_id in self.job_ids:
+                self.signals.failed.emit(job_id, f"Parsing Error: {e}")
+            return
+
+        for job_id, parsed_data in zip(self.job_ids, results):
+            if parsed_data:
+                self.signals.finished.emit(job_id, parsed_data)
+            else:
+                self.signals.failed.emit(job_id, "Unable to parse job posting. Check error.txt for details.")
+
+
+class ExportJob(QRunnable):
+    """Streams saved postings to a file off the GUI thread"""
+    def __init__(self, path: str, incremental: bool = False):
+        super().__init__()
+        self.path = path
+        self.incremental = incremental
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = export_postings(self.path, incremental=self.incremental)
+        except Exception as e:
+            self.signals.failed.emit(0, f"Export Error: {e}")
+            return
+        self.signals.finished.emit(0, result)
+
+
+class CommitJob(QRunnable):
+    """Group commit: moves the pending journal into the jobs table in one transaction"""
+    def __init__(self, reason: str = "manual"):
+        super().__init__()
+        self.reason = reason
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = db.commit_pending()
+        except Exception as e:
+            self.signals.failed.emit(0, f"Commit Error: {e}")
+            return
+        self.signals.finished.emit(0, dict(result, reason=self.reason))
+
+
+class ReparseJob(QRunnable):
+    """Re-parses postings saved with an older prompt version, in throttled batches, until done or stopped"""
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            stats = reparse_postings(progress=lambda message: self.signals.progress.emit(0, message),
+                                     should_stop=lambda: self._stop)
+        except Exception as e:
+            self.signals.failed.emit(0, f"Re-parse Error: {e}")
+            return
+        self.signals.finished.emit(0, stats)
+
+
+class WarmUpJob(QRunnable):
+    """Runs the deferred imports and database setup after the window is shown"""
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        timings = warm_up()
+        total = sum(seconds for _, seconds in timings)
+        telemetry.event("warm_up", ms=round(total * 1000, 3),
+                        steps={name: round(seconds * 1000, 3) for name, seconds in timings})
+        detail = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings)
+        self.signals.progress.emit(0, f"Warm-up finished in {total * 1000:.0f} ms ({detail})")
+
+
+class JobQueue(QObject):
+    """Runs paste jobs on a thread pool and relays their signals to the GUI
+
+    Fetches run concurrently; fetched postings are buffered briefly so that
+    several queued postings go to the parser together in one batched request.
+    """
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(int, dict)
+    failed = pyqtSignal(int, str)
+    duplicate = pyqtSignal(int, dict)
+    done = pyqtSignal(int)               # job id, after it finished, failed or matched a duplicate
+    idle = pyqtSignal()                  # emitted once every queued job is done
+
+    BATCH_WAIT_MS = 400                  # how long fetched postings wait for others to join a batch
+
+    def __init__(self, max_workers: int = 4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        self.set_max_workers(max_workers)
+        self._ids = itertools.count(1)
+        self._active = set()             # job ids not yet finished or failed
+        self._fetching = set()           # job ids still in the fetch stage
+        self._runnables = []             # keeps running jobs (and their signals) alive
+        self._buffer = []                # (job id, content) waiting for the parse stage
+        self._sources = {}               # job id -> pasted URL, saved with the row
+        self._pages = {}                 # job id -> downloaded page, saved compressed with the row
+        self._submitted = {}             # job id -> submit time, for the end-to-end "paste" span
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_parse_buffer)
+
+    def set_max_workers(self, max_workers: int):
+        self.pool.setMaxThreadCount(max(1, max_workers))
+
+    def submit(self, text: str) -> int:
+        """Queue a posting (URL or raw text) and return its job id"""
+        job_id = next(self._ids)
+        job = FetchJob(job_id, text)
+        job.signals.progress.connect(self.progress)
+        job.signals.fetched.connect(self._on_fetched)
+        job.signals.source.connect(self._on_source)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.duplicate.connect(self._on_duplicate)
+        self._active.add(job_id)
+        self._fetching.add(job_id)
+        self._submitted[job_id] = time.perf_counter()
+        if text.lower().startswith("http"):
+            self._sources[job_id] = text
+        self._start(job)
+        return job_id
+
+    def pending_count(self) -> int:
+        return len(self._active)
+
+    def _start(self, job: QRunnable):
+        self._runnables.append(job)
+        self.pool.start(job)
+
+    def _on_source(self, job_id: int, html: str):
+        if job_id in self._active:
+            self._pages[job_id] = html
+
+    def _on_fetched(self, job_id: int, content: str):
+        self._fetching.discard(job_id)
+        self._buffer.append((job_id, content))
+        if not self._fetching:
+            self._flush_parse_buffer()
+        elif not self._flush_timer.isActive():
+            self._flush_timer.start(self.BATCH_WAIT_MS)
+
+    def _flush_parse_buffer(self):
+        self._flush_timer.stop()
+        buffered, self._buffer = self._buffer, []
+        contents = [content for _, content in buffered]
+        for batch in pack_batches(contents):
+            job = ParseJob([buffered[i][0] for i in batch], [contents[i] for i in batch])
+            job.signals.progress.connect(self.progress)
+            job.signals.finished.connect(self._on_finished)
+            job.signals.failed.connect(self._on_failed)
+            self._start(job)
+
+    def _on_finished(self, job_id: int, parsed_data: dict):
+        parsed_data.setdefault("source", self._sources.get(job_id, ""))
+        if job_id in self._pages:
+            parsed_data.setdefault("raw_source", self._pages[job_id])
+        self._done(job_id, "parsed")
+        self.finished.emit(job_id, parsed_data)
+        self._check_idle()
+
+    def _on_duplicate(self, job_id: int, existing: dict):
+        self._done(job_id, "duplicate")
+        self.duplicate.emit(job_id, existing)
+        self._check_idle()
+
+    def _on_failed(self, job_id: int, message: str):
+        self._done(job_id, "failed")
+        self.failed.emit(job_id, message)
+        self._check_idle()
+
+    def _done(self, job_id: int, outcome: str):
+        submitted = self._submitted.pop(job_id, None)
+        if submitted is not None:
+            telemetry.record("paste", time.perf_counter() - submitted, ok=outcome != "failed", outcome=outcome)
+        self._active.discard(job_id)
+        self._sources.pop(job_id, None)
+        self._pages.pop(job_id, None)
+        self._fetching.discard(job_id)
+        if not self._fetching and self._buffer:
+            self._flush_parse_buffer()
+        self.done.emit(job_id)
+
+    def _check_idle(self):
+        if not self._active:
+            self._runnables.clear()
+            self.idle.emit()
+
+    def shutdown(self, timeout_ms: int = 3000):
+        """Drop queued jobs and wait briefly for running ones"""
+        self._flush_timer.stop()
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
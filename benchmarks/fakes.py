@@ -0,0 +1,182 @@
+"""
+Offline stand-ins for the services Parsio talks to: a Gemini model stub, an
+OpenAI-compatible chat completions server and an HTTP server for recorded job
+pages. Latency and error rates are configurable so slow or flaky APIs can be
+reproduced.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+FAKE_RESULT = {"job_title": "Senior Backend Engineer", "company": "Northwind Labs",
+               "location": "Toronto, ON", "salary": "CAD 130,000 - 155,000 per year"}
+
+
+class ResourceExhausted(Exception):
+    """Looks like google.api_core's 429 error to the rate limiter"""
+    code = 429
+
+
+# GEMINI %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGeminiModel:
+    """
+    Mimics GenerativeModel.generate_content(prompt, stream=True): waits
+    first_token_ms, then yields the JSON answer in chunks chunk_ms apart,
+    followed by trailing whitespace chunks the parser should not wait for.
+    """
+    def __init__(self, first_token_ms: float = 300, chunk_ms: float = 15, chunk_chars: int = 12,
+                 trailing_chunks: int = 5, error_rate: float = 0.0, seed: int = 1):
+        self.first_token_ms = first_token_ms
+        self.chunk_ms = chunk_ms
+        self.chunk_chars = chunk_chars
+        self.trailing_chunks = trailing_chunks
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt: str) -> str:
+        count = prompt.count("### Posting ")
+        if count:
+            return json.dumps([dict(FAKE_RESULT, index=i) for i in range(count)])
+        return json.dumps(FAKE_RESULT)
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.error_rate
+        time.sleep(self.first_token_ms / 1000)
+        if fail:
+            raise ResourceExhausted("429 Resource has been exhausted (stub)")
+        answer = self._answer(prompt)
+        chunks = [answer[i:i + self.chunk_chars] for i in range(0, len(answer), self.chunk_chars)]
+        chunks += [" "] * self.trailing_chunks
+        return self._stream(chunks)
+
+    def _stream(self, chunks: List[str]):
+        for index, chunk in enumerate(chunks):
+            if index:
+                time.sleep(self.chunk_ms / 1000)
+            yield _Chunk(chunk)
+
+
+# HTTP SERVERS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+class _BackgroundServer:
+    """ThreadingHTTPServer on a free localhost port, served from a daemon thread"""
+    def __init__(self, handler):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FixtureServer(_BackgroundServer):
+    """Serves benchmarks/pages/*.html with ETags, so conditional GETs get 304s"""
+    def __init__(self, latency_ms: float = 0, pages_dir: str = PAGES_DIR):
+        pages: Dict[str, bytes] = {}
+        for name in sorted(os.listdir(pages_dir)):
+            if name.endswith(".html"):
+                with open(os.path.join(pages_dir, name), 'rb') as file:
+                    pages["/" + name] = file.read()
+        self.pages = pages
+        self.stats = {"requests": 0, "not_modified": 0}
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                # /page.html?n=123 serves page.html under a distinct cache key
+                body = pages.get(self.path.split("?")[0])
+                time.sleep(latency_ms / 1000)
+                owner.stats["requests"] += 1
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    owner.stats["not_modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        super().__init__(Handler)
+
+    def urls(self, count: int) -> List[str]:
+        """count distinct URLs cycling through the recorded pages"""
+        paths = list(self.pages)
+        return [f"{self.url}{paths[i % len(paths)]}?n={i}" for i in range(count)]
+
+
+class FakeOpenAIServer(_BackgroundServer):
+    """Minimal /v1/chat/completions endpoint with configurable latency and 503 rate"""
+    def __init__(self, latency_ms: float = 300, error_rate: float = 0.0, seed: int = 1):
+        rng = random.Random(seed)
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(latency_ms / 1000)
+                with lock:
+                    fail = rng.random() < error_rate
+                if fail:
+                    self.send_error(503)
+                    return
+                body = json.dumps({
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(FAKE_RESULT)}}]
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        super().__init__(Handler)
+
+
+def large_response(size: int, seed: Optional[int] = 1) -> str:
+    """Model-style output of roughly size chars: prose, a big JSON object, then trailing braces"""
+    rng = random.Random(seed)
+    words = ["engineer", "python", "remote", "salary", "team", "benefits", "{", "}", "\"quoted\""]
+    filler = " ".join(rng.choice(words) for _ in range(size // 16))
+    payload = dict(FAKE_RESULT, description=filler[: size // 2],
+                   notes=[filler[i:i + 200] for i in range(0, size // 4, 200)])
+    return "Here is the JSON you asked for:\n" + json.dumps(payload) + "\nLet me know if {you need more}."
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks, run fully offline against local fakes (see fakes.py).
+
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --output after.json --baseline before.json
+
+Results are printed (and optionally written) as JSON. With --baseline, every
+metric ending in _ms (lower is better) or _per_sec (higher is better) is
+compared and the run exits with status 1 if any got worse by more than
+--threshold percent. Everything runs in a temporary data directory; the
+real Data/ folder is never touched.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "Core_Application"))
+
+BENCH_SETTINGS = {
+    "gemini_api_key": "",
+    "gemini_requests_per_minute": 1000000,
+    "gemini_tokens_per_minute": 1000000000,
+    "gemini_max_concurrent": 64,
+    "gemini_max_retries": 3,
+}
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def latency_summary(seconds: List[float]) -> Dict:
+    ms = [s * 1000 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+        "p50_ms": percentile(ms, 50),
+        "p90_ms": percentile(ms, 90),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": max(ms) if ms else 0.0,
+    }
+
+
+def timed(fn: Callable, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+# BENCHMARKS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def bench_fetch(count: int, concurrency: int, latency_ms: float) -> Dict:
+    """fetch_url_content throughput, first with an empty page cache, then revalidating (304s)"""
+    from database_context import fetch_url_content
+    from fakes import FixtureServer
+
+    result = {"pages": count, "concurrency": concurrency, "server_latency_ms": latency_ms}
+    with FixtureServer(latency_ms=latency_ms) as server:
+        urls = server.urls(count)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for phase in ("cold", "revalidate"):
+                contents, elapsed = timed(lambda: list(pool.map(fetch_url_content, urls)))
+                result[f"{phase}_pages_per_sec"] = count / elapsed
+                result[f"{phase}_failed"] = sum(1 for content in contents if not content)
+        result["server_not_modified"] = server.stats["not_modified"]
+    return result
+
+
+def bench_parse(count: int, concurrency: int, first_token_ms: float, chunk_ms: float, error_rate: float) -> Dict:
+    """parse_with_gemini latency against the stub model (cache disabled, retries enabled)"""
+    import parser
+    from fakes import StubGeminiModel
+
+    model = StubGeminiModel(first_token_ms=first_token_ms, chunk_ms=chunk_ms, error_rate=error_rate)
+    parser.model_pool.set_factory(lambda api_key: model)
+    parser.gemini_governor.backoff_base = 0.05
+    retries_before = parser.gemini_governor.metrics()["retries"]
+
+    latencies, failures = [], 0
+
+    def one(index: int):
+        started = time.perf_counter()
+        try:
+            parser.parse_with_gemini(f"Senior Backend Engineer posting #{index}\nNorthwind Labs", "bench-key",
+                                     use_cache=False)
+            return time.perf_counter() - started, None
+        except Exception as e:
+            return time.perf_counter() - started, e
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes, elapsed = timed(lambda: list(pool.map(one, range(count))))
+    for seconds, error in outcomes:
+        if error is None:
+            latencies.append(seconds)
+        else:
+            failures += 1
+
+    result = latency_summary(latencies)
+    result.update({
+        "concurrency": concurrency,
+        "stub_first_token_ms": first_token_ms,
+        "stub_chunk_ms": chunk_ms,
+        "stub_error_rate": error_rate,
+        "failed": failures,
+        "retries": parser.gemini_governor.metrics()["retries"] - retries_before,
+        "parses_per_sec": count / elapsed,
+    })
+    return result
+
+
+def bench_parse_openai(count: int, concurrency: int, latency_ms: float, error_rate: float) -> Dict:
+    """Latency of the OpenAI-compatible backend against a local fake server"""
+    from backends import BackendRouter
+    from fakes import FakeOpenAIServer
+
+    with FakeOpenAIServer(latency_ms=latency_ms, error_rate=error_rate) as server:
+        router = BackendRouter.from_settings([
+            {"name": "fake-openai", "type": "openai", "base_url": server.url + "/v1", "model": "bench"}
+        ])
+        router.backends[0].governor.backoff_base = 0.05
+
+        def one(index: int):
+            started = time.perf_counter()
+            parsed = router.parse(f"Data Analyst posting #{index} {random.random()}\nGlobex")
+            return time.perf_counter() - started, parsed
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes, elapsed = timed(lambda: list(pool.map(one, range(count))))
+
+    result = latency_summary([seconds for seconds, parsed in outcomes if parsed])
+    result.update({
+        "concurrency": concurrency,
+        "server_latency_ms": latency_ms,
+        "server_error_rate": error_rate,
+        "failed": sum(1 for _, parsed in outcomes if not parsed),
+        "parses_per_sec": count / elapsed,
+    })
+    return result
+
+
+def bench_extract_json(sizes: List[int], repeats: int) -> Dict:
+    """extract_json on large model responses (prose, one big object, trailing braces)"""
+    from utils import extract_json
+    from fakes import large_response
+
+    result = {}
+    for size in sizes:
+        text = large_response(size)
+        json.loads(extract_json(text))          # must return the object, not run to the last brace
+        samples = [timed(extract_json, text)[1] for _ in range(repeats)]
+        mean = sum(samples) / len(samples)
+        result[f"{size}_chars"] = {
+            "mean_ms": mean * 1000,
+            "p90_ms": percentile([s * 1000 for s in samples], 90),
+            "mb_per_sec": len(text) / mean / 1e6 if mean else 0.0,
+        }
+    return result
+
+
+WORDS = ("python data remote senior engineer analyst team product platform cloud sql api design "
+         "customers growth mentor build scale reliable systems benefits vacation salary hybrid office").split()
+
+
+def _rows(start: int, count: int, with_text: bool, rng: random.Random) -> List[Dict]:
+    rows = []
+    for i in range(start, start + count):
+        row = {
+            "job_title": f"{rng.choice(['Senior', 'Junior', 'Staff', 'Lead'])} {rng.choice(['Engineer', 'Analyst', 'Designer'])} {i}",
+            "company": f"Company {rng.randrange(2000)}",
+            "location": rng.choice(["Remote", "Toronto, ON", "Austin, TX", "Berlin, Germany"]),
+            "salary": f"${rng.randrange(50, 200)}k",
+        }
+        if with_text:
+            row["posting_text"] = f"posting {i} " + " ".join(rng.choice(WORDS) for _ in range(80))
+        rows.append(row)
+    return rows
+
+
+def bench_database(sizes: List[int], batch_size: int, with_text: bool, stats_repeats: int) -> Dict:
+    """save_job_postings rows/sec and get_database_stats latency as the table grows to each size"""
+    from database_context import db
+
+    db.init_database()
+    rng = random.Random(7)
+    result = {"batch_size": batch_size, "with_text": with_text}
+    total = 0
+    for size in sorted(sizes):
+        inserted, elapsed = 0, 0.0
+        while total < size:
+            rows = _rows(total, min(batch_size, size - total), with_text, rng)
+            saved, seconds = timed(db.save_job_postings, rows)
+            if saved["failed"]:
+                raise RuntimeError("save_job_postings failed during benchmark")
+            elapsed += seconds
+            inserted += len(rows)
+            total += len(rows)
+        stats_samples = [timed(db.get_database_stats, 3)[1] for _ in range(stats_repeats)]
+        search_samples = [timed(db.search, "senior engineer", None, 20)[1] for _ in range(stats_repeats)]
+        result[f"{size}_rows"] = {
+            "insert_rows_per_sec": inserted / elapsed if elapsed else 0.0,
+            "get_database_stats": latency_summary(stats_samples),
+            "search": latency_summary(search_samples),
+            "db_file_mb": os.path.getsize(db.DB_FILE) / 1e6,
+        }
+        log(f"  database: {size:,} rows, {result[f'{size}_rows']['insert_rows_per_sec']:,.0f} rows/s")
+    return result
+
+
+# COMPARISON %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def flatten(data: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print metric changes against the baseline; returns the regressions"""
+    current, previous = flatten(results["results"]), flatten(baseline.get("results", {}))
+    regressions = []
+    print(f"{'metric':<60}{'baseline':>14}{'current':>14}{'change':>10}", file=sys.stderr)
+    for name in sorted(current):
+        if name not in previous or not (name.endswith("_ms") or name.endswith("_per_sec")):
+            continue
+        old, new = previous[name], current[name]
+        change = (new - old) / old * 100 if old else 0.0
+        worse = change > threshold if name.endswith("_ms") else change < -threshold
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:<60}{old:>14.2f}{new:>14.2f}{change:>+9.1f}%{flag}", file=sys.stderr)
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip()
+    except Exception:
+        return ""
+
+
+# MAIN %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+BENCHMARKS = ["fetch", "parse", "parse_openai", "extract_json", "database"]
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Offline Parsio benchmarks")
+    arg_parser.add_argument("--only", default=",".join(BENCHMARKS),
+                            help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    arg_parser.add_argument("--quick", action="store_true", help="small sizes for a fast smoke run")
+    arg_parser.add_argument("--db-sizes", default=None, help="row counts to grow the table to (default 1000,100000,1000000)")
+    arg_parser.add_argument("--with-text", action="store_true", help="store posting text (FTS + fingerprints) with each row")
+    arg_parser.add_argument("--latency-ms", type=float, default=300, help="stub model / fake server latency")
+    arg_parser.add_argument("--error-rate", type=float, default=0.05, help="stub model / fake server error rate")
+    arg_parser.add_argument("--output", default=None, help="also write the JSON results to this file")
+    arg_parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=10.0, help="percent change counted as a regression")
+    arg_parser.add_argument("--keep-data", action="store_true", help="keep the temporary data directory")
+    args = arg_parser.parse_args(argv)
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        arg_parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    if args.db_sizes:
+        db_sizes = [int(size) for size in args.db_sizes.split(",")]
+    else:
+        db_sizes = [1000, 10000] if args.quick else [1000, 100000, 1000000]
+
+    data_dir = tempfile.mkdtemp(prefix="parsio-bench-")
+    os.environ["PARSIO_DATA_DIR"] = data_dir
+    with open(os.path.join(data_dir, "parsio_settings.json"), 'w') as file:
+        json.dump(BENCH_SETTINGS, file)
+
+    runs = {
+        "fetch": lambda: bench_fetch(50 if args.quick else 500, 8, latency_ms=5),
+        "parse": lambda: bench_parse(30 if args.quick else 200, 8, args.latency_ms, 10, args.error_rate),
+        "parse_openai": lambda: bench_parse_openai(30 if args.quick else 200, 8, args.latency_ms, args.error_rate),
+        "extract_json": lambda: bench_extract_json([10_000, 100_000, 1_000_000], 5 if args.quick else 20),
+        "database": lambda: bench_database(db_sizes, 1000, args.with_text, 5 if args.quick else 20),
+    }
+
+    results = {}
+    try:
+        for name in selected:
+            log(f"Running {name}...")
+            result, elapsed = timed(runs[name])
+            result["wall_seconds"] = elapsed
+            results[name] = result
+    finally:
+        if not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "quick": args.quick,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + "\n")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        if regressions:
+            log(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0f}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Headless bulk import for Parsio.
+Usage: python run_bulk_import.py urls.txt --checkpoint import.ckpt
+       cat urls.txt | python run_bulk_import.py
+"""
+
+import sys
+import os
+
+# Core_Application modules import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Core_Application"))
+
+from bulk_import import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,16 +2,155 @@
 """
 Launcher script for Parsio application.
 This script runs the Core_Application module from the correct context.
+
+Maintenance commands (no window is opened):
+    python run_parsio.py --rebuild-stats    recompute the dashboard summary tables
+    python run_parsio.py --export jobs.xlsx [--incremental]
+                                            export saved postings (.xlsx, .csv or .parquet)
+    python run_parsio.py --profile-startup  time imports, window creation and warm-up
+    python run_parsio.py --reparse [--model gemini:gemini-1.5-flash]
+                                            re-parse postings saved with an older prompt version
+                                            (or another model); safe to interrupt and run again
+    python run_parsio.py --serve [--port 8765] [--workers 4]
+                                            accept postings over HTTP on localhost (see README)
 """
 
+import argparse
 import sys
 import os
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Core_Application modules import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Core_Application"))
+
+
+def rebuild_stats():
+    from database_context import db
+    result = db.rebuild_summary_tables()
+    print(f"Before: {result['before']}")
+    print(f"After:  {result['after']}")
+    print("Summary tables were consistent." if result["consistent"] else "Summary tables were out of date and have been rebuilt.")
+
+
+def export(args):
+    from export import export_postings
+    result = export_postings(args.export, incremental=args.incremental, name=args.export_name,
+                             include_text=args.include_text)
+    scope = f"changed since {result['since'][0]}" if result["since"] else "all"
+    print(f"Exported {result['rows']} postings ({scope}) to {result['path']}")
+
+
+def reparse(args):
+    from database_context import db
+    from parser import PROMPT_VERSION
+    from reparse import reparse_postings
+
+    print(f"Current prompt version: {PROMPT_VERSION}")
+    for prompt_version, parser_model, rows in db.parser_versions():
+        print(f"  {rows:>8,}  prompt {prompt_version or '-'}  {parser_model or 'unknown model'}")
+    try:
+        stats = reparse_postings(model=args.model, batch_size=args.batch_size, pause_seconds=args.pause,
+                                 limit=args.limit)
+    except KeyboardInterrupt:
+        print("Interrupted. Finished batches are saved; run --reparse again to continue.")
+        return
+    print(f"Re-parsed {stats['updated']:,} of {stats['stale']:,} stale postings in {stats['seconds']:.1f}s "
+          f"({stats['failed']:,} failed, {stats['skipped']:,} without text)")
+
+
+def serve(args):
+    from ingest_server import serve
+    serve(host=args.host, port=args.port, workers=args.workers)
+
+
+def profile_startup():
+    """Time each startup stage the way main() runs it, then the deferred warm-up steps"""
+    import importlib
+    import time
+
+    started = time.perf_counter()
+    timings = []
+
+    def stage(name, action):
+        stage_start = time.perf_counter()
+        result = action()
+        timings.append((name, time.perf_counter() - stage_start))
+        return result
+
+    # modules in dependency order, so each line is that module's own import cost
+    for module in ["PyQt5.QtWidgets", "utils", "database_context", "parse_cache", "parser",
+                   "backends", "export", "warmup", "workers", "interface", "ui"]:
+        stage(f"import {module}", lambda: importlib.import_module(module))
+
+    from PyQt5.QtWidgets import QApplication
+    from ui import ParsioApp
+    app = stage("QApplication()", lambda: QApplication(sys.argv))
+    window = stage("ParsioApp()", ParsioApp)
+    window.warm_up_job = False          # the profile runs the warm-up itself below
+    stage("show window", lambda: (window.show(), app.processEvents()))
+    time_to_window = time.perf_counter() - started
+
+    from warmup import warm_up
+    warm = warm_up()
+
+    print("Startup profile")
+    for name, seconds in timings:
+        print(f"  {name:<28}{seconds * 1000:8.1f} ms")
+    print(f"  {'time to window':<28}{time_to_window * 1000:8.1f} ms")
+    print("Deferred warm-up (runs in the background after the window is shown)")
+    for name, seconds in warm:
+        print(f"  {name:<28}{seconds * 1000:8.1f} ms")
+    print("For a per-module breakdown run: python -X importtime run_parsio.py --profile-startup")
+    window.close()
 
-# Import and run the main application
-from Core_Application.main import main
 
 if __name__ == "__main__":
-    main()
+    arg_parser = argparse.ArgumentParser(description="Parsio - AI Job Application Tracker")
+    arg_parser.add_argument("--rebuild-stats", action="store_true",
+                            help="recompute the dashboard summary tables and report any drift")
+    arg_parser.add_argument("--export", metavar="PATH",
+                            help="export saved postings to PATH (.xlsx, .csv or .parquet)")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="with --export, only rows added or changed since the last incremental export")
+    arg_parser.add_argument("--export-name", default=None,
+                            help="watermark name for incremental exports (default: the file format)")
+    arg_parser.add_argument("--include-text", action="store_true",
+                            help="with --export, also write the full posting text")
+    arg_parser.add_argument("--profile-startup", action="store_true",
+                            help="report import, window and warm-up times, then exit")
+    arg_parser.add_argument("--reparse", action="store_true",
+                            help="re-parse postings saved with an older prompt version, from their stored source")
+    arg_parser.add_argument("--model", default=None,
+                            help="with --reparse, also re-parse rows from other models, using only this one "
+                                 "(e.g. gemini:gemini-1.5-flash, openai:qwen2.5:7b, heuristic)")
+    arg_parser.add_argument("--batch-size", type=int, default=None,
+                            help="with --reparse, postings per batch (default: reparse_batch_size setting)")
+    arg_parser.add_argument("--pause", type=float, default=None,
+                            help="with --reparse, seconds to wait between batches (default: reparse_pause_seconds)")
+    arg_parser.add_argument("--limit", type=int, default=None,
+                            help="with --reparse, stop after this many postings")
+    arg_parser.add_argument("--serve", action="store_true",
+                            help="run the local HTTP ingestion server instead of the window")
+    arg_parser.add_argument("--host", default="127.0.0.1",
+                            help="with --serve, address to listen on (default: localhost only)")
+    arg_parser.add_argument("--port", type=int, default=None,
+                            help="with --serve, port to listen on (default: ingest_port setting)")
+    arg_parser.add_argument("--workers", type=int, default=None,
+                            help="with --serve, fetch and parse workers (default: max_workers setting)")
+    args = arg_parser.parse_args()
+
+    if args.rebuild_stats:
+        rebuild_stats()
+    elif args.export:
+        export(args)
+    elif args.profile_startup:
+        profile_startup()
+    elif args.reparse:
+        reparse(args)
+    elif args.serve:
+        serve(args)
+    else:
+        # Import and run the main application
+        from Core_Application.main import main
+        main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Core_Application modules import each other by bare name
+sys.path.insert(0, os.path.join(ROOT, "Core_Application"))
+# settings, database and logs go to a throwaway folder, never Data/
+os.environ["PARSIO_DATA_DIR"] = tempfile.mkdtemp(prefix="parsio-tests-")
+
+
+class FakeClock:
+    """Injectable clock/sleep pair: sleeping advances the clock instantly and is recorded"""
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def db():
+    """The shared database, emptied after the test"""
+    from database_context import db
+    yield db
+    with db.transaction() as conn:
+        conn.execute(f"DELETE FROM {db.TABLE_NAME}")
@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional
+
+from backends import BackendRouter, HeuristicBackend, ParserBackend
+from heuristic_parser import extract_fields
+
+NO_COMPANY = "Senior Backend Engineer\nToronto, ON\nSalary: $120,000 - $150,000\nBuild payment APIs in Python."
+
+
+class FixedBackend(ParserBackend):
+    """Answers every posting with the same fields"""
+    kind = "fixed"
+
+    def __init__(self, name: str, priority: int, fields: Optional[Dict]):
+        super().__init__(name, priority)
+        self.fields = fields
+        self.calls = 0
+
+    def parse_batch(self, texts: List[str]) -> List[Optional[Dict]]:
+        self.calls += 1
+        return [dict(self.fields) if self.fields else None for _ in texts]
+
+
+def test_heuristic_needs_a_company():
+    assert extract_fields(NO_COMPANY) is None
+    assert HeuristicBackend("local").parse(NO_COMPANY) is None
+    found = extract_fields("Senior Backend Engineer at Northwind\nToronto, ON")
+    assert (found["job_title"], found["company"]) == ("Senior Backend Engineer", "Northwind")
+
+
+def test_router_falls_through_when_the_company_is_empty():
+    first = FixedBackend("first", 1, {"job_title": "Engineer", "company": "", "location": "Toronto, ON"})
+    second = FixedBackend("second", 2, {"job_title": "Engineer", "company": "Northwind"})
+    result = BackendRouter([first, second]).parse(NO_COMPANY)
+    assert result["company"] == "Northwind"
+    assert second.calls == 1
+
+
+def test_router_returns_none_when_no_backend_finds_a_company():
+    router = BackendRouter([HeuristicBackend("local"), FixedBackend("empty", 2, {"job_title": "Engineer"})])
+    assert router.parse(NO_COMPANY) is None
+    assert router.health["local"].misses == 1
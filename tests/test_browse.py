@@ -0,0 +1,60 @@
+import pytest
+
+from database_context import BROWSE_COLUMNS
+
+# ties, case variants and NULLs in every nullable column
+ROWS = [
+    ("Engineer", "acme", "Toronto, ON", None, "2024-01-03 09:00:00"),
+    ("engineer", "Acme", None, "$100k", "2024-01-01 09:00:00"),
+    ("Analyst", "Beta", "toronto, on", "$90k", "2024-01-03 09:00:00"),
+    ("ENGINEER", "beta", "Austin, TX", None, "2024-01-02 09:00:00"),
+    ("Designer", "Acme", None, "$100K", "2024-01-01 09:00:00"),
+    ("analyst", "Gamma", "Austin, TX", "$80k", "2024-01-02 09:00:00"),
+    ("Manager", "gamma", "austin, tx", "$100k", "2024-01-03 09:00:00"),
+]
+
+
+@pytest.fixture
+def rows(db):
+    with db.transaction() as conn:
+        for row in ROWS:
+            conn.execute(f"INSERT INTO {db.TABLE_NAME} (job_title, company, location, salary, created_at) "
+                         f"VALUES (?, ?, ?, ?, ?)", row)
+    return db.connection().execute(f"SELECT {', '.join(BROWSE_COLUMNS)} FROM {db.TABLE_NAME}").fetchall()
+
+
+def expected_order(rows, sort, descending):
+    index = BROWSE_COLUMNS.index(sort)
+
+    def key(row):
+        value = row[index]
+        if value is None:
+            return (0, "", row[0])
+        return (1, value.lower() if isinstance(value, str) and sort not in ("id", "created_at") else value, row[0])
+    ordered = sorted(rows, key=key)
+    return [row[0] for row in (ordered[::-1] if descending else ordered)]
+
+
+def page_through(db, sort, descending, limit, filters=None):
+    ids, after = [], None
+    while True:
+        page = db.browse_page(filters=filters, sort=sort, descending=descending, after=after, limit=limit)
+        ids += [row[0] for row in page]
+        if len(page) < limit:
+            return ids
+        last = page[-1]
+        after = (last[BROWSE_COLUMNS.index(sort)], last[0])
+
+
+@pytest.mark.parametrize("sort", BROWSE_COLUMNS)
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("limit", [1, 2, 3, 50])
+def test_pages_have_no_gaps_or_repeats(db, rows, sort, descending, limit):
+    assert page_through(db, sort, descending, limit) == expected_order(rows, sort, descending)
+
+
+def test_filtered_pages_match_the_count(db, rows):
+    acme = [row for row in rows if row[2].lower() == "acme"]
+    assert page_through(db, "salary", True, 1, {"company": "ACME"}) == expected_order(acme, "salary", True)
+    assert db.count_postings(filters={"company": "ACME"}) == len(acme) == 3
+    assert db.count_postings() == len(ROWS)
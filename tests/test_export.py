@@ -0,0 +1,60 @@
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from openpyxl import load_workbook
+
+import database_context
+from export import export_postings
+from test_save_postings import posting
+
+
+def test_excel_export_strips_illegal_characters(db, tmp_path):
+    db.save_job_postings([posting("platform\x07 engineer", location="Remote\x00\x1f")])
+    path = str(tmp_path / "postings.xlsx")
+    assert export_postings(path, include_text=True)["rows"] == 1
+    sheet = load_workbook(path).active
+    header, row = [[cell.value for cell in row] for row in sheet.iter_rows()]
+    values = dict(zip(header, row))
+    assert values["job_title"] == "platform engineer"
+    assert values["location"] == "Remote"
+    assert "\x07" not in values["posting_text"]
+
+
+def updated_at(db, posting_id):
+    return db.connection().execute(f"SELECT updated_at FROM {db.TABLE_NAME} WHERE id = ?", (posting_id,)).fetchone()[0]
+
+
+def test_updated_at_is_utc_in_one_format_on_insert_and_edit(db):
+    db.save_job_postings([posting("platform engineer")])
+    posting_id = db.connection().execute(f"SELECT id FROM {db.TABLE_NAME}").fetchone()[0]
+    inserted = updated_at(db, posting_id)
+    assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}", inserted)
+    assert abs(datetime.fromisoformat(inserted) - datetime.utcnow()) < timedelta(minutes=1)
+
+    time.sleep(0.002)
+    db.update_postings({posting_id: {"salary": "$120k"}})
+    edited = updated_at(db, posting_id)
+    assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}", edited)
+    assert edited > inserted
+
+
+def test_migration_moves_local_stamps_to_utc(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        conn = sqlite3.connect(":memory:")
+        for migration in database_context.SCHEMA_MIGRATIONS[:11]:
+            migration(conn, "jobs")
+        conn.execute("INSERT INTO jobs (job_title, company, created_at, updated_at) "
+                     "VALUES ('Engineer', 'Acme', '2024-07-01T12:00:00.123456', '2024-07-01T12:00:00.123456')")
+        conn.execute("INSERT INTO jobs_export_watermarks VALUES ('csv', '2024-07-01T12:00:00.123456', 1, '', 1)")
+        database_context.SCHEMA_MIGRATIONS[11](conn, "jobs")
+        assert conn.execute("SELECT updated_at FROM jobs").fetchone()[0] == "2024-07-01T16:00:00.123"
+        assert conn.execute("SELECT updated_at FROM jobs_export_watermarks").fetchone()[0] == "2024-07-01T16:00:00.123"
+        conn.execute("UPDATE jobs SET salary = '$1'")
+        assert conn.execute("SELECT updated_at FROM jobs").fetchone()[0] > "2024-07-01T16:00:00.123"
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
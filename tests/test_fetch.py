@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from extraction import STOP_LOOKAHEAD_CHARS, PostingRegionWatch
+from http_client import HttpClient
+
+REGION = '<div class="job-description">' + "<p>Build payment APIs in Python and SQL.</p>" * 10 + "</div>"
+LD_JSON = ('<script type="application/ld+json">'
+           + json.dumps({"@type": "JobPosting", "title": "Engineer", "hiringOrganization": {"name": "Acme"}})
+           + "</script>")
+RELATED = "<p>related job</p>" * 15000                  # ~270 KB of carousel after the posting
+PAGES = {
+    "/job": f"<html><body><h1>Engineer</h1>{REGION}{'<p>related job</p>' * 500}{LD_JSON}{RELATED}</body></html>",
+    "/plain": f"<html><body><h1>Engineer</h1>{REGION}{RELATED}</body></html>",
+}
+PAGE = PAGES["/job"]
+
+
+def feed(page: str, chunk_size: int = 4096) -> int:
+    """How much of page a PostingRegionWatch lets through before it stops"""
+    watch = PostingRegionWatch()
+    for start in range(0, len(page), chunk_size):
+        if watch(page[start:start + chunk_size]):
+            return start + chunk_size
+    return len(page)
+
+
+# EARLY STOP %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_stops_after_json_ld_that_follows_the_posting():
+    read = feed(PAGE)
+    assert PAGE.index(LD_JSON) + len(LD_JSON) <= read < len(PAGE) // 2
+
+
+def test_stops_within_the_lookahead_without_json_ld():
+    page = PAGES["/plain"]
+    read = feed(page)
+    assert page.index(REGION) + len(REGION) + STOP_LOOKAHEAD_CHARS <= read
+    assert read <= page.index(REGION) + len(REGION) + STOP_LOOKAHEAD_CHARS + 4096
+    assert read < len(page) // 2
+
+
+def test_json_ld_in_the_head_stops_at_the_end_of_the_posting():
+    page = f"<html><head>{LD_JSON}</head><body>{REGION}{RELATED}</body></html>"
+    assert feed(page, 512) <= page.index(REGION) + len(REGION) + 512
+
+
+def test_open_json_ld_script_is_read_to_its_end():
+    script = '<script type="application/ld+json">{"@type": "WebPage", "text": "' + "x" * 100000 + '"}</script>'
+    page = f"<html><body>{REGION}{script}{RELATED}</body></html>"
+    assert feed(page) >= page.index(script) + len(script)
+
+
+def test_tags_split_across_chunks_are_found():
+    for size in (7, 64, 1000):
+        assert feed(PAGE, size) >= PAGE.index(LD_JSON) + len(LD_JSON)
+        assert feed(PAGE, size) < len(PAGE)
+
+
+def test_short_marked_element_is_not_the_posting():
+    page = f'<html><body><div class="posting-meta">Posted today</div>{REGION}{RELATED}</body></html>'
+    assert feed(page, 100) >= page.index(REGION) + len(REGION) + STOP_LOOKAHEAD_CHARS
+
+
+# HTTP CLIENT %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+@pytest.fixture
+def page_server():
+    bodies = {path: page.encode("utf-8") for path, page in PAGES.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = bodies[self.path]
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/job"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_keeps_json_ld_after_the_posting_element(page_server, tmp_path):
+    client = HttpClient(str(tmp_path))
+    client.CHUNK_BYTES = 4096
+    html = client.get_text(page_server, stop_when=PostingRegionWatch())
+    assert LD_JSON in html
+    assert len(html) < len(PAGE)
+    assert client.stats()["stopped_early"] == 1
+
+
+def test_only_complete_pages_are_cached(page_server, tmp_path):
+    client = HttpClient(str(tmp_path))
+    client.CHUNK_BYTES = 4096
+    partial = client.get_text(page_server, stop_when=lambda text: "job-description" in text)
+    assert client.stats()["stopped_early"] == 1
+    full = client.get_text(page_server)                   # not a 304 serving the partial page
+    assert len(full) > len(partial)
+    assert full == PAGE
+    assert client.get_text(page_server) == PAGE           # the complete page is cached
+    assert client.stats()["cache_hits"] == 1
+
+
+def test_missing_cached_body_refetches_the_page(page_server, tmp_path):
+    client = HttpClient(str(tmp_path))
+    assert client.get_text(page_server) == PAGE
+    _, body_path = client._paths(client._key(page_server))
+    os.remove(body_path)
+    assert client.get_text(page_server) == PAGE          # not the empty body of the 304
+    assert client.stats()["cache_hits"] == 0
+    assert HttpClient(str(tmp_path)).get_text(page_server) == PAGE
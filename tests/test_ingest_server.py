@@ -0,0 +1,108 @@
+import http.client
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import ingest_server
+from ingest_server import IngestServer
+from parse_cache import parse_cache
+from test_save_postings import posting
+
+TOKEN = "test-token"
+EXTENSION = "chrome-extension://parsio"
+
+
+@pytest.fixture
+def server(db):
+    server = IngestServer(port=0, workers=1, token=TOKEN, allowed_origins=[EXTENSION]).start()
+    yield server
+    server.stop()
+
+
+def request(server, path, body=None, headers=None):
+    """(status, headers, json payload) of one request"""
+    url = f"http://127.0.0.1:{server.port}{path}"
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, response.headers, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.load(e)
+
+
+def wait_finished(server, item_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entry = server.item_status(item_id)
+        if entry["status"] in ingest_server.FINISHED:
+            return entry
+        time.sleep(0.02)
+    raise AssertionError(f"item {item_id} still {entry['status']}")
+
+
+# AUTH %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_requests_need_the_token(server):
+    assert request(server, "/status")[0] == 401
+    assert request(server, "/status", headers={"X-Parsio-Token": "wrong"})[0] == 401
+    assert request(server, "/status", headers={"X-Parsio-Token": TOKEN})[0] == 200
+    assert request(server, f"/status?token={TOKEN}")[0] == 200
+    assert request(server, "/status", headers={"Authorization": f"Bearer {TOKEN}"})[0] == 200
+
+
+def test_token_is_generated_and_saved_on_first_start(db, monkeypatch):
+    monkeypatch.setitem(db.settings, "ingest_token", "")
+    token = ingest_server.ingest_token()
+    assert len(token) >= 24
+    with open(db.HELPER_FILE) as file:
+        assert json.load(file)["ingest_token"] == token
+    assert ingest_server.ingest_token() == token
+    assert IngestServer(port=0, token="").token == token        # an empty token is never accepted
+
+
+def test_only_allow_listed_origins_are_reflected(server):
+    _, headers, _ = request(server, "/status", headers={"X-Parsio-Token": TOKEN, "Origin": EXTENSION})
+    assert headers["Access-Control-Allow-Origin"] == EXTENSION
+    _, headers, _ = request(server, "/status", headers={"X-Parsio-Token": TOKEN, "Origin": "https://evil.example"})
+    assert headers["Access-Control-Allow-Origin"] is None
+
+
+# WRITER %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_linked_postings_are_reported_as_duplicates(server, db):
+    headers = {"X-Parsio-Token": TOKEN}
+    status, _, payload = request(server, "/postings", posting("backend engineer"), headers)
+    assert status == 202
+    assert wait_finished(server, payload["ids"][0])["status"] == "saved"
+
+    _, _, payload = request(server, "/postings", posting("backend engineer"), headers)
+    assert wait_finished(server, payload["ids"][0])["status"] == "duplicate"
+    counts = server.status()
+    assert (counts["saved"], counts["duplicates"]) == (1, 1)
+    assert db.count_postings() == 1
+
+
+def test_parse_cache_writes_go_through_the_writer(server):
+    routed = []
+    server.write_queue.put = lambda entry: routed.append(entry)      # hold writes instead of running them
+    parse_cache.put("ingest-test", {"job_title": "x"}, "model", 1)
+    assert [kind for kind, _, _ in routed] == ["cache"]
+    del server.write_queue.put
+    server._write(routed)
+    assert parse_cache.get("ingest-test") == {"job_title": "x"}
+
+
+@pytest.mark.parametrize("length, status", [("abc", 400), ("-1", 400), (None, 411)])
+def test_bad_content_length_is_rejected(server, length, status):
+    conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    conn.putrequest("POST", "/postings")
+    conn.putheader("X-Parsio-Token", TOKEN)
+    if length is not None:
+        conn.putheader("Content-Length", length)
+    conn.endheaders()
+    assert conn.getresponse().status == status
+    conn.close()
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+import database_context
+from normalize import normalize_fields, parse_location, parse_salary
+
+
+@pytest.mark.parametrize("text, low, high, currency, period", [
+    ("$120,000.00 - $150,000.00", 120000, 150000, None, "year"),
+    ("$120,000.00", 120000, 120000, None, "year"),
+    ("120.000 €", 120000, 120000, "EUR", "year"),
+    ("120.000,00 € - 140.000,00 €", 120000, 140000, "EUR", "year"),
+    ("$120k–150k", 120000, 150000, None, "year"),
+    ("100-120k USD", 100000, 120000, "USD", "year"),
+    ("45/hr", 45, 45, None, "hour"),
+    ("$58.50 per hour", 58.5, 58.5, None, "hour"),
+    ("CA$90,000/year", 90000, 90000, "CAD", "year"),
+    ("£4,000 per month", 4000, 4000, "GBP", "month"),
+])
+def test_parse_salary_formats(text, low, high, currency, period):
+    result = parse_salary(text)
+    assert (result["salary_min"], result["salary_max"]) == (pytest.approx(low), pytest.approx(high))
+    assert result["salary_currency"] == currency
+    assert result["salary_period"] == period
+
+
+def test_parse_salary_ignores_numbers_that_are_not_pay():
+    assert parse_salary("401k matching, 20 days PTO")["salary_min"] is None
+    assert parse_salary("3+ years experience, $90k")["salary_max"] == 90000
+
+
+@pytest.mark.parametrize("location, currency", [
+    ("Toronto, ON", "CAD"),
+    ("Sydney, Australia", "AUD"),
+    ("Austin, TX", "USD"),
+    ("Paris, France", "USD"),            # a "$" quoted for a country without a dollar
+    ("Remote", None),                    # no country: ambiguous
+])
+def test_bare_dollar_follows_the_country(location, currency):
+    assert normalize_fields("$120k", location)["salary_currency"] == currency
+
+
+def test_explicit_currency_wins_over_the_country():
+    assert normalize_fields("US$120k", "Toronto, ON")["salary_currency"] == "USD"
+    assert normalize_fields("120k EUR", "Toronto, ON")["salary_currency"] == "EUR"
+
+
+@pytest.mark.parametrize("text, city, region, country, remote", [
+    ("Austin, Texas, U.S.", "Austin", "TX", "US", 0),
+    ("Toronto, ON", "Toronto", "ON", "CA", 0),
+    ("St. Louis, MO", "St. Louis", "MO", "US", 0),
+    ("Remote - US", None, None, "US", 1),
+    ("Remote (United States)", None, None, "US", 1),
+    ("Remote in Canada", None, None, "CA", 1),
+    ("Remote within the United States", None, None, "US", 1),
+    ("Based in Berlin, Germany", "Berlin", None, "DE", 0),
+    ("Hybrid from London, UK", "London", None, "GB", 0),
+    ("", None, None, None, None),
+])
+def test_parse_location(text, city, region, country, remote):
+    assert parse_location(text) == {"city": city, "region": region, "country": country, "remote": remote}
+
+
+def test_backfill_migration_recomputes_saved_rows():
+    conn = sqlite3.connect(":memory:")
+    for migration in database_context.SCHEMA_MIGRATIONS[:9]:
+        migration(conn, "jobs")
+    conn.execute("INSERT INTO jobs (job_title, company, location, salary, created_at) "
+                 "VALUES ('Engineer', 'Acme', 'Remote in Canada', '$120,000.00', '2024-01-01')")
+    conn.execute("UPDATE jobs SET city = 'in Canada', salary_max = 120")   # what migration 9 used to store
+    database_context.SCHEMA_MIGRATIONS[9](conn, "jobs")
+    assert conn.execute("SELECT salary_max, salary_currency, city, country FROM jobs").fetchone() == \
+        (120000.0, "CAD", None, "CA")
+
+
+def test_editing_one_field_renormalizes_with_the_other(db):
+    from test_save_postings import posting
+    db.save_job_postings([posting("payments engineer", salary="$100k", location="Toronto, ON")])
+    posting_id = db.connection().execute(f"SELECT id FROM {db.TABLE_NAME}").fetchone()[0]
+    columns = f"SELECT salary_max, salary_currency, country FROM {db.TABLE_NAME} WHERE id = ?"
+
+    db.update_postings({posting_id: {"salary": "$120k"}})
+    assert db.connection().execute(columns, (posting_id,)).fetchone() == (120000, "CAD", "CA")
+
+    db.update_postings({posting_id: {"location": "Austin, TX"}})
+    assert db.connection().execute(columns, (posting_id,)).fetchone() == (120000, "USD", "US")
@@ -0,0 +1,209 @@
+import pytest
+
+import rate_limit
+from rate_limit import CircuitBreaker, CircuitOpenError, ClientGovernor, TokenBucket, is_retryable
+
+
+class ResourceExhausted(Exception):
+    """Named like google.api_core's 429 error"""
+
+
+class FakeModel:
+    """Stand-in for a Gemini call: raises the queued errors in order, then answers"""
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def governor(clock, **overrides):
+    settings = dict(requests_per_minute=6000, tokens_per_minute=1_000_000, max_concurrent=2,
+                    max_retries=3, backoff_base=1.0, backoff_cap=30.0, failure_threshold=5,
+                    reset_timeout=30.0, max_breaker_wait=120.0, sleep=clock.sleep, clock=clock)
+    settings.update(overrides)
+    return ClientGovernor(**settings)
+
+
+# TOKEN BUCKET %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_bucket_starts_full_then_waits_for_refill(clock):
+    bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+    assert all(bucket.acquire() == 0.0 for _ in range(60))
+    waited = bucket.acquire()
+    assert waited == pytest.approx(1.0)          # 60/min is one token a second
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(60, capacity=10, clock=clock, sleep=clock.sleep)
+    bucket.acquire(10)
+    clock.advance(5)
+    assert bucket.acquire(5) == 0.0
+    clock.advance(3600)
+    bucket._refill()
+    assert bucket.tokens == pytest.approx(10)
+
+
+def test_bucket_caps_requests_larger_than_capacity(clock):
+    bucket = TokenBucket(60, capacity=10, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire(50) == 0.0             # trimmed to the capacity instead of waiting forever
+
+
+# RETRIES %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_is_retryable():
+    assert is_retryable(ResourceExhausted("quota"))
+    assert is_retryable(type("Err", (Exception,), {"code": 503})())
+    assert not is_retryable(ValueError("bad prompt"))
+    assert not is_retryable(type("Err", (Exception,), {"code": 400})())
+
+
+def test_backoff_jitter_stays_within_exponential_bounds(clock):
+    gate = governor(clock, max_retries=6, backoff_base=1.0, backoff_cap=10.0, failure_threshold=100)
+    model = FakeModel(*[ResourceExhausted()] * 6)
+    assert gate.call(model) == "ok"
+    assert model.calls == 7
+    assert len(clock.sleeps) == 6
+    for attempt, delay in enumerate(clock.sleeps, start=1):
+        assert 0.0 <= delay <= min(10.0, 2 ** attempt)
+
+
+def test_backoff_upper_bound_is_capped(clock, monkeypatch):
+    bounds = []
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: bounds.append((low, high)) or high)
+    gate = governor(clock, max_retries=5, backoff_base=1.0, backoff_cap=10.0, failure_threshold=100)
+    gate.call(FakeModel(*[ResourceExhausted()] * 5))
+    assert bounds == [(0, 2), (0, 4), (0, 8), (0, 10.0), (0, 10.0)]
+
+
+def test_retries_give_up_and_reraise_the_last_error(clock):
+    gate = governor(clock, max_retries=2, failure_threshold=100)
+    model = FakeModel(*[ResourceExhausted("quota")] * 5)
+    with pytest.raises(ResourceExhausted):
+        gate.call(model)
+    assert model.calls == 3
+
+
+def test_non_retryable_error_passes_straight_through(clock):
+    gate = governor(clock)
+    model = FakeModel(ValueError("bad prompt"))
+    with pytest.raises(ValueError):
+        gate.call(model)
+    assert model.calls == 1
+    assert clock.sleeps == []
+    assert gate.breaker.failures == 0
+
+
+# CIRCUIT BREAKER %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opens == 1
+    assert breaker.wait_time() == pytest.approx(10)
+    clock.advance(4)
+    assert breaker.wait_time() == pytest.approx(6)
+
+
+def test_breaker_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_allows_one_trial_then_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.wait_time() == 0.0            # this caller is the trial
+    assert breaker.wait_time() == 1.0            # everyone else waits for it
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.wait_time() == 0.0
+
+
+def test_breaker_half_open_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.wait_time() == 0.0
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opens == 2
+    assert breaker.wait_time() == pytest.approx(10)
+
+
+def test_governor_waits_out_an_open_breaker(clock):
+    gate = governor(clock, max_retries=0, failure_threshold=1, reset_timeout=5)
+    with pytest.raises(ResourceExhausted):
+        gate.call(FakeModel(ResourceExhausted()))
+    assert gate.breaker.state == CircuitBreaker.OPEN
+    assert gate.call(FakeModel()) == "ok"
+    assert clock.sleeps == [pytest.approx(5)]
+    assert gate.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_governor_gives_up_when_breaker_stays_open_too_long(clock):
+    gate = governor(clock, max_retries=0, failure_threshold=1, reset_timeout=60, max_breaker_wait=10)
+    with pytest.raises(ResourceExhausted):
+        gate.call(FakeModel(ResourceExhausted()))
+    model = FakeModel()
+    with pytest.raises(CircuitOpenError):
+        gate.call(model)
+    assert model.calls == 0
+
+
+def test_non_retryable_error_in_half_open_trial_releases_the_trial(clock):
+    gate = governor(clock, max_retries=0, failure_threshold=1, reset_timeout=5, max_breaker_wait=3)
+    with pytest.raises(ResourceExhausted):
+        gate.call(FakeModel(ResourceExhausted()))
+    clock.advance(5)
+    with pytest.raises(ValueError):              # the half-open trial fails without a verdict
+        gate.call(FakeModel(ValueError("bad prompt")))
+    assert gate.call(FakeModel()) == "ok"        # used to raise CircuitOpenError from here on
+    assert gate.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_interrupted_half_open_trial_releases_the_trial(clock):
+    gate = governor(clock, max_retries=0, failure_threshold=1, reset_timeout=5, max_breaker_wait=3)
+    with pytest.raises(ResourceExhausted):
+        gate.call(FakeModel(ResourceExhausted()))
+    clock.advance(5)
+    with pytest.raises(KeyboardInterrupt):
+        gate.call(FakeModel(KeyboardInterrupt()))
+    assert gate.call(FakeModel()) == "ok"
+
+
+# METRICS %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+def test_metrics_counters(clock):
+    gate = governor(clock, requests_per_minute=60, max_retries=1, failure_threshold=2, reset_timeout=30)
+    gate.request_bucket.tokens = 0               # the first call waits one second for a token
+    assert gate.call(FakeModel(ResourceExhausted())) == "ok"
+    with pytest.raises(ValueError):
+        gate.call(FakeModel(ValueError()))
+    with pytest.raises(ResourceExhausted):
+        gate.call(FakeModel(ResourceExhausted(), ResourceExhausted()))
+
+    metrics = gate.metrics()
+    assert metrics["calls"] == 3
+    assert metrics["successes"] == 1
+    assert metrics["failures"] == 2
+    assert metrics["retries"] == 2
+    assert metrics["in_flight"] == 0
+    assert metrics["rate_wait_seconds"] >= 1.0
+    # every sleep was either a rate-limit wait or a backoff
+    assert metrics["rate_wait_seconds"] + metrics["backoff_seconds"] == pytest.approx(sum(clock.sleeps))
+    assert metrics["breaker_state"] == CircuitBreaker.OPEN
+    assert metrics["breaker_opens"] == 1
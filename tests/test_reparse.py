@@ -0,0 +1,56 @@
+import pytest
+
+import reparse
+from parser import PROMPT_VERSION
+from test_save_postings import posting
+
+WORDS = ["ledger", "kafka", "billing", "terraform", "mobile", "search", "fraud", "compliance", "vision", "robotics"]
+
+
+def distinct(role, seed):
+    """A posting whose text shares few words with the others, so none is linked as a duplicate"""
+    words = " ".join(WORDS[(seed + i) % len(WORDS)] * (i + 1) for i in range(6))
+    return posting(role, posting_text=f"{role} {seed} {words} " * 8)
+
+
+@pytest.fixture
+def parse(monkeypatch):
+    """Parser stand-in: postings mentioning "unparseable" come back without a company"""
+    calls = []
+
+    def parse_batch(texts):
+        calls.append(len(texts))
+        return [{"job_title": "Engineer", "company": "" if "unparseable" in text else "Northwind",
+                 "prompt_version": str(PROMPT_VERSION), "parser_model": "fake"} for text in texts]
+    monkeypatch.setattr(reparse, "_parser_for", lambda model: parse_batch)
+    return calls
+
+
+def run(**kwargs):
+    return reparse.reparse_postings(batch_size=2, pause_seconds=0, progress=lambda message: None, **kwargs)
+
+
+def test_rows_without_text_or_source_are_not_stale(db):
+    db.save_job_postings([posting("legacy analyst", posting_text=""), posting("data engineer")])
+    assert db.count_stale(PROMPT_VERSION) == 1
+
+
+def test_rows_that_fail_are_not_retried(db, parse):
+    db.save_job_postings([distinct("unparseable role", i) for i in range(3)] + [distinct("platform engineer", 3)])
+    assert db.count_stale(PROMPT_VERSION) == 4
+
+    stats = run()
+    assert (stats["updated"], stats["failed"]) == (1, 3)
+    assert db.count_stale(PROMPT_VERSION) == 0
+    assert run()["stale"] == 0
+    # another model is a fresh attempt
+    assert db.count_stale(PROMPT_VERSION, "other-model") == 3
+
+
+def test_limit_reaches_past_rows_that_failed_before(db, parse):
+    db.save_job_postings([distinct("unparseable role", i) for i in range(2)]
+                         + [distinct("platform engineer", 2), distinct("site reliability engineer", 3)])
+    assert run(limit=2)["updated"] == 0
+    stats = run(limit=2)
+    assert stats["updated"] == 2
+    assert db.count_stale(PROMPT_VERSION) == 0
@@ -0,0 +1,51 @@
+TEXT = ("We are hiring a {role} to build APIs in Python and SQL for our payments platform team. "
+        "You will own services end to end, review code and mentor engineers. ") * 2
+
+
+def posting(role, **fields):
+    return dict({"job_title": role, "company": "Northwind", "posting_text": TEXT.format(role=role)}, **fields)
+
+
+def test_save_reports_inserted_linked_and_skipped(db):
+    result = db.save_job_postings([posting("platform engineer"), posting("platform engineer"),
+                                   posting("analyst", company="")])
+    assert result["outcomes"] == ["inserted", "linked", "skipped"]
+    assert (result["inserted"], result["linked"], result["skipped"], result["failed"]) == (1, 1, 1, 0)
+
+
+def test_saving_only_duplicates_inserts_nothing(db):
+    db.save_job_postings([posting("site reliability engineer")])
+    result = db.save_job_postings([posting("site reliability engineer")])
+    assert result["inserted"] == 0
+    assert result["linked"] == 1
+    assert db.count_postings() == 1
+
+
+def test_commit_pending_reports_counts(db):
+    db.save_job_postings([posting("data engineer")])
+    db.journal_pending(posting("data engineer"))
+    db.journal_pending(posting("frontend developer"))
+    result = db.commit_pending()
+    assert result["taken"] == 2
+    assert result["outcomes"] == ["linked", "inserted"]
+    assert db.commit_pending()["taken"] == 0
+
+
+def test_journal_survives_a_reopen_and_commits_in_order(db):
+    from database_context import database_context
+    roles = ["mobile developer", "security analyst", "database administrator"]
+    for role in roles:
+        db.journal_pending(posting(role, salary="$100k"))
+    db.close()
+
+    reopened = database_context()
+    assert reopened.pending_summary()[0] == 3
+    assert [job["job_title"] for job in reopened.get_pending()] == roles
+
+    first = reopened.commit_pending(limit=2)                # the group commit takes the oldest first
+    assert (first["taken"], first["inserted"]) == (2, 2)
+    assert [job["job_title"] for job in reopened.get_pending()] == roles[2:]
+    assert reopened.commit_pending()["taken"] == 1
+    assert reopened.pending_summary() == (0, None)
+    assert reopened.count_postings() == 3
+    reopened.close()
@@ -0,0 +1,46 @@
+import pytest
+
+ROWS = [
+    ("Kubernetes Engineer", "Acme", "Toronto, ON", "Run our clusters and on-call rotation."),
+    ("Backend Developer", "Beta", "Austin, TX", "Python services deployed on Kubernetes with Terraform."),
+    ("Data Analyst", "Acme", "Toronto, ON", "Dashboards in SQL and Looker for the finance team."),
+]
+
+
+@pytest.fixture
+def ids(db):
+    with db.transaction() as conn:
+        return [conn.execute(f"INSERT INTO {db.TABLE_NAME} (job_title, company, location, posting_text, created_at) "
+                             f"VALUES (?, ?, ?, ?, '2024-01-01')", row).lastrowid for row in ROWS]
+
+
+def found(db, query, filters=None):
+    return [row["id"] for row in db.search(query, filters)]
+
+
+def test_title_matches_rank_above_text_matches(db, ids):
+    assert found(db, "kubernetes") == [ids[0], ids[1]]
+    assert found(db, "kube") == [ids[0], ids[1]]                # every word matches as a prefix
+    assert found(db, "kubernetes python") == [ids[1]]
+
+
+def test_snippet_marks_the_match_in_the_posting_text(db, ids):
+    row = db.search("terraform")[0]
+    assert row["id"] == ids[1]
+    assert "[Terraform]" in row["snippet"]
+
+
+def test_index_follows_updates_and_deletes(db, ids):
+    with db.transaction() as conn:
+        conn.execute(f"UPDATE {db.TABLE_NAME} SET posting_text = 'Spark pipelines' WHERE id = ?", (ids[2],))
+        conn.execute(f"DELETE FROM {db.TABLE_NAME} WHERE id = ?", (ids[0],))
+    assert found(db, "looker") == []
+    assert found(db, "spark") == [ids[2]]
+    assert found(db, "kubernetes") == [ids[1]]
+
+
+def test_filters_and_punctuation(db, ids):
+    assert set(found(db, "toronto", {"company": "acme"})) == {ids[0], ids[2]}
+    assert found(db, "kubernetes", {"company": "Acme"}) == [ids[0]]
+    assert found(db, 'sql" ) (*') == [ids[2]]            # query syntax is never passed through
+    assert set(found(db, "")) == set(ids)
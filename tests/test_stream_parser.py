@@ -0,0 +1,53 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import parser
+from utils import JsonStreamParser
+
+ANSWER = {"job_title": "Engineer", "company": "Acme {Labs}", "location": "Toronto, ON", "salary": "$100k \"base\""}
+
+
+class StreamingModel:
+    """Yields the text in chunks and records how many the caller pulled"""
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.pulled = 0
+
+    def generate_content(self, prompt, stream=False):
+        for text in self.chunks:
+            self.pulled += 1
+            yield SimpleNamespace(text=text)
+
+
+@pytest.fixture
+def model():
+    text = json.dumps(ANSWER)
+    streaming = StreamingModel(["```json\n"] + [text[i:i + 5] for i in range(0, len(text), 5)]
+                               + ["\n```", " trailing explanation"] * 20)
+    parser.model_pool.set_factory(lambda api_key: streaming)
+    yield streaming
+    parser.model_pool.set_factory(parser._create_gemini_model)
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_braces_and_quotes_inside_strings_do_not_close_the_value(size):
+    text = "noise " + json.dumps(ANSWER) + ' {"second": 1}'
+    stream = JsonStreamParser()
+    results = [stream.feed(text[i:i + size]) for i in range(0, len(text), size)]
+    completed = [result for result in results if result is not None]
+    assert json.loads(completed[0]) == ANSWER
+    assert set(completed) == {completed[0]}            # later chunks keep returning the first value
+
+
+def test_unclosed_value_returns_nothing():
+    stream = JsonStreamParser("[")
+    assert stream.feed('{"ignored": 1} [{"a": "]"}') is None
+    assert stream.feed(', {"b": 2}]') == '[{"a": "]"}, {"b": 2}]'
+
+
+def test_gemini_stream_stops_once_the_json_closes(model):
+    raw = parser._call_gemini("prompt", "key")
+    assert json.loads(raw) == ANSWER
+    assert model.pulled < len(model.chunks) - 30           # the trailing chunks are never read
@@ -0,0 +1,50 @@
+import random
+
+from database_context import RECENT_KEEP
+
+COMPANIES = ["Acme", "Beta", "Gamma"]
+
+
+def insert(conn, db, company, created_at):
+    return conn.execute(f"INSERT INTO {db.TABLE_NAME} (job_title, company, created_at) VALUES ('Engineer', ?, ?)",
+                        (company, created_at)).lastrowid
+
+
+def test_counts_follow_insert_update_and_delete(db):
+    with db.transaction() as conn:
+        first = insert(conn, db, "Acme", "2024-01-01T09:00:00")
+        insert(conn, db, "Acme", "2024-01-02T09:00:00")
+        last = insert(conn, db, "Beta", "2024-01-02T10:00:00")
+    summary = db.get_summary_stats()
+    assert (summary["total_jobs"], summary["companies"]) == (3, 2)
+    assert summary["top_companies"] == [("Acme", 2), ("Beta", 1)]
+    assert summary["per_day"] == [("2024-01-02", 2), ("2024-01-01", 1)]
+
+    with db.transaction() as conn:
+        conn.execute(f"UPDATE {db.TABLE_NAME} SET company = 'Beta', created_at = '2024-01-03' WHERE id = ?", (first,))
+        conn.execute(f"DELETE FROM {db.TABLE_NAME} WHERE id = ?", (last,))
+    summary = db.get_summary_stats()
+    assert (summary["total_jobs"], summary["companies"]) == (2, 2)
+    assert summary["top_companies"] == [("Acme", 1), ("Beta", 1)]
+    assert summary["per_day"] == [("2024-01-03", 1), ("2024-01-02", 1)]
+    assert [row[4] for row in summary["recent"]] == ["2024-01-03", "2024-01-02T09:00:00"]
+    assert "Total Jobs: 2" in db.get_database_stats()
+
+
+def test_summaries_match_a_full_rebuild_after_random_edits(db):
+    shuffle = random.Random(7)
+    with db.transaction() as conn:
+        ids = [insert(conn, db, shuffle.choice(COMPANIES), f"2024-01-{shuffle.randint(1, 28):02d}T09:00:00")
+               for _ in range(RECENT_KEEP + 30)]
+        for _ in range(60):
+            posting_id = shuffle.choice(ids)
+            if shuffle.random() < 0.4:
+                conn.execute(f"DELETE FROM {db.TABLE_NAME} WHERE id = ?", (posting_id,))
+                ids.remove(posting_id)
+            else:
+                conn.execute(f"UPDATE {db.TABLE_NAME} SET company = ?, created_at = ? WHERE id = ?",
+                             (shuffle.choice(COMPANIES), f"2024-02-{shuffle.randint(1, 28):02d}", posting_id))
+    result = db.rebuild_summary_tables()
+    assert result["consistent"]
+    assert result["after"]["total_jobs"] == len(ids)
+    assert len(db.get_summary_stats(recent_limit=RECENT_KEEP)["recent"]) == RECENT_KEEP